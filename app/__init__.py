@@ -1,4 +1,12 @@
-# Este arquivo torna o diretório app um pacote Python
-from .main import app
+# Este arquivo torna o diretório app um pacote Python.
+# ``app`` (a aplicação Flask) é carregado só quando pedido: as ferramentas
+# importam app.config sem pagar o custo do Flask.
 
 __all__ = ['app']
+
+
+def __getattr__(name):
+    if name == 'app':
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
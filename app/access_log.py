@@ -0,0 +1,171 @@
+"""
+Log de acesso estruturado (JSON) sem escrita em disco na thread da requisição
+
+A requisição só coloca o registro numa fila (``QueueHandler``); uma thread do
+``QueueListener`` formata e grava em lotes, com rotação por tamanho. Rotas de
+alto volume como ``/health`` podem ser amostradas; respostas de erro são
+sempre registradas.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+
+from flask import g, request
+
+
+class JsonFormatter(logging.Formatter):
+    FIELDS = ("request_id", "method", "route", "path", "status", "latency_ms", "remote_addr")
+
+    def format(self, record):
+        entry = {"ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}"}
+        entry.update((name, getattr(record, name)) for name in self.FIELDS if hasattr(record, name))
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Mantém só uma fração dos acessos bem-sucedidos das rotas em ``rates``"""
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+
+    def filter(self, record):
+        rate = self.rates.get(getattr(record, "route", None))
+        if rate is None or getattr(record, "status", 0) >= 400:
+            return True
+        return random.random() < rate
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Acumula as linhas formatadas e grava ``batch_size`` de uma vez (ou no ``flush``)"""
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5, batch_size=64):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding="utf-8", delay=True)
+        self.batch_size = batch_size
+        self.buffer = []
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if not self.buffer:
+                return
+            data = "".join(self.buffer)
+            self.buffer = []
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes and self.stream.tell() and self.stream.tell() + len(data) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(data)
+            self.stream.flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """Listener que descarrega os lotes pendentes quando a fila fica ociosa"""
+
+    def __init__(self, q, *handlers, flush_interval=1.0):
+        super().__init__(q, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+
+def parse_sample_rates(spec):
+    """``"/health=0.01,/metrics=0.1"`` -> ``{"/health": 0.01, "/metrics": 0.1}``"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        route, _, rate = item.partition("=")
+        rates[route.strip()] = float(rate)
+    return rates
+
+
+def init_access_log(app):
+    """Liga o log de acesso em ``app`` conforme ``ACCESS_LOG_*`` da configuração"""
+    config = app.config
+    if config.get("ACCESS_LOG_PATH"):
+        handler = BatchingRotatingFileHandler(
+            config["ACCESS_LOG_PATH"],
+            max_bytes=config.get("ACCESS_LOG_MAX_BYTES", 10 * 1024 * 1024),
+            backup_count=config.get("ACCESS_LOG_BACKUPS", 5),
+            batch_size=config.get("ACCESS_LOG_BATCH", 64))
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter())
+
+    q = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(q)
+    # A amostragem roda antes de enfileirar: o acesso descartado não custa nada além do sorteio
+    sampler = SamplingFilter(parse_sample_rates(config.get("ACCESS_LOG_SAMPLE")))
+    queue_handler.addFilter(sampler)
+    # Permite trocar as taxas sem reiniciar (app/main.py, ao recarregar a configuração)
+    app.extensions["access_log_sampler"] = sampler
+    # Um logger por aplicação: apps de teste não trocam os handlers da principal
+    logger = logging.getLogger(f"app.access.{app.name}")
+    logger.handlers[:] = [queue_handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener = FlushingQueueListener(q, handler,
+                                     flush_interval=config.get("ACCESS_LOG_FLUSH_INTERVAL", 1.0))
+    listener.start()
+    atexit.register(stop_listener, listener)
+
+    @app.before_request
+    def _start_timer():
+        g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def _log_access(response):
+        start = g.get("request_start")
+        if start is None:
+            return response
+        response.headers["X-Request-ID"] = g.request_id
+        logger.info("access", extra={
+            "request_id": g.request_id,
+            "method": request.method,
+            "route": request.url_rule.rule if request.url_rule else None,
+            "path": request.path,
+            "status": response.status_code,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "remote_addr": request.remote_addr,
+        })
+        return response
+
+    app.extensions["access_log"] = listener
+    return listener
+
+
+def stop_listener(listener):
+    """Esvazia a fila e grava o que estiver no lote antes de encerrar"""
+    if listener._thread is not None:
+        listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -1,9 +1,236 @@
+"""
+Configuração única da aplicação e das ferramentas (tools/)
+
+Os valores vêm do arquivo ``.env`` da raiz do projeto (ou de ``CONFIG_FILE``)
+e do ambiente, que tem precedência. ``settings()`` devolve um ``Settings``
+imutável, validado de uma vez só e guardado em cache; no máximo a cada
+``RELOAD_CHECK_INTERVAL`` segundos confere se o arquivo mudou e, se mudou,
+recarrega. ``install_reload_signal()`` faz o mesmo no SIGHUP.
+
+Um valor inválido só impede quem o usa: ``setting(nome)`` levanta ``ConfigError``
+para o campo inválido e ``check(*nomes)`` valida de uma vez os campos de um
+consumidor (a aplicação chama na importação). Em ``settings()`` o campo
+inválido fica com o valor padrão.
+
+A troca é atômica: a configuração nova só entra inteira; se o arquivo novo
+trouxer algum valor inválido ela é rejeitada e a anterior continua valendo.
+Quem guarda estado derivado da configuração (pools, filtros) se registra em
+``on_reload``.
+
+``Config`` e ``config`` continuam valendo para ``app.config.from_object``, com
+os valores do momento da importação.
+"""
+import logging
 import os
+import threading
+import time
+from collections import namedtuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILE = os.environ.get("CONFIG_FILE") or os.path.join(ROOT, ".env")
+RELOAD_CHECK_INTERVAL = 1.0
+
+log = logging.getLogger(__name__)
+
+
+class ConfigError(ValueError):
+    """Um ou mais valores de configuração são inválidos"""
+
+
+def _flag(value):
+    """Como o antigo ``== 'true'``: qualquer valor desconhecido (ex.: ``DEBUG='*'``) é falso"""
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _bool(value):
+    value = value.strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("0", "false", "no", "off", ""):
+        return False
+    raise ValueError("esperado true/false")
+
+
+def _number(kind, minimum):
+    def parse(value):
+        number = kind(value)
+        if number < minimum:
+            raise ValueError(f"mínimo {minimum}")
+        return number
+    return parse
+
+
+def _sample_rates(value):
+    """Valida ``"/health=0.01,/metrics=0.1"`` (o parse fica com app/access_log.py)"""
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        route, sep, rate = item.partition("=")
+        if not sep or not route.strip() or not 0 <= float(rate) <= 1:
+            raise ValueError(f"esperado rota=taxa (0 a 1), recebido {item!r}")
+    return value
+
+
+Setting = namedtuple("Setting", ["name", "parse", "default"])
+
+SETTINGS = (
+    # Vazio conta como não definido, como antes
+    Setting("SECRET_KEY", lambda value: value or "dev-secret-key", "dev-secret-key"),
+    Setting("DEBUG", _flag, "false"),
+    # Executor das chamadas bloqueantes (app/executor.py)
+    Setting("BLOCKING_WORKERS", _number(int, 1), "4"),
+    Setting("BLOCKING_QUEUE", _number(int, 0), "16"),
+    Setting("BLOCKING_TIMEOUT", _number(float, 0.001), "5"),
+    # Log de acesso (app/access_log.py); sem caminho, vai para o stderr
+    Setting("ACCESS_LOG_PATH", str, ""),
+    Setting("ACCESS_LOG_MAX_BYTES", _number(int, 0), str(10 * 1024 * 1024)),
+    Setting("ACCESS_LOG_BACKUPS", _number(int, 0), "5"),
+    Setting("ACCESS_LOG_BATCH", _number(int, 1), "64"),
+    Setting("ACCESS_LOG_FLUSH_INTERVAL", _number(float, 0), "1"),
+    Setting("ACCESS_LOG_SAMPLE", _sample_rates, "/health=0.01"),
+    # Servidor com workers (app/server.py)
+    Setting("SERVER_WORKERS", _number(int, 1), "2"),
+    Setting("DRAIN_DELAY", _number(float, 0), "1"),
+    Setting("DRAIN_TIMEOUT", _number(float, 0), "30"),
+    # Dashboard e ferramentas
+    Setting("MAIN_BRANCH", str, "main"),
+    Setting("REPO_URL", str, "https://github.com/mirelabsp/DevOps-Lab-AWS.git"),
+    Setting("DASHBOARD_STARTUP_BUDGET_MS", _number(float, 1), "150"),
+    Setting("INVENTORY_CACHE_TTL", _number(float, 0), "60"),
+    Setting("AWS_MAX_POOL_CONNECTIONS", _number(int, 1), "10"),
+    Setting("RUNNER_HISTORY_SIZE", _number(int, 1), "256"),
+    Setting("METRICS_HISTORY", _bool, "true"),
+)
+
+Settings = namedtuple("Settings", [s.name for s in SETTINGS])
+
+
+def _read_env_file(path):
+    if not path or not os.path.exists(path):
+        return {}
+    from dotenv import dotenv_values
+
+    return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+
+def _parse(path=None, environ=None):
+    """``(Settings, {campo: erro})``; campos inválidos ficam com o valor padrão"""
+    values = _read_env_file(ENV_FILE if path is None else path)
+    values.update(os.environ if environ is None else environ)
+    parsed, errors = {}, {}
+    for setting in SETTINGS:
+        raw = values.get(setting.name, setting.default)
+        try:
+            parsed[setting.name] = setting.parse(raw)
+        except ValueError as e:
+            errors[setting.name] = f"{setting.name}={raw!r}: {e}"
+            parsed[setting.name] = setting.parse(setting.default)
+    return Settings(**parsed), errors
+
+
+def _error(messages):
+    return ConfigError("configuração inválida: " + "; ".join(messages))
+
+
+def load(path=None, environ=None):
+    """Lê arquivo e ambiente e valida tudo; levanta ``ConfigError`` listando cada problema"""
+    settings, errors = _parse(path, environ)
+    if errors:
+        raise _error(errors.values())
+    return settings
+
+
+_lock = threading.Lock()
+_current = None
+_errors = {}
+_file_stamp = None
+_next_check = 0.0
+_listeners = []
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def reload():
+    """Carrega a configuração de novo; se trouxer erro novo mantém a atual e retorna False"""
+    global _current, _errors, _file_stamp
+    with _lock:
+        stamp = _stamp(ENV_FILE)
+        new, errors = _parse()
+        # Erros que já existiam (ex.: no ambiente, que não muda) não bloqueiam a recarga
+        fresh = [message for name, message in errors.items() if _errors.get(name) != message]
+        if _current is not None and fresh:
+            # Só tenta de novo quando o arquivo mudar outra vez
+            _file_stamp = stamp
+            log.error("%s; mantendo a configuração anterior", _error(fresh))
+            return False
+        old, _current, _errors, _file_stamp = _current, new, errors, stamp
+        listeners = list(_listeners)
+    if old is not None and new != old:
+        log.info("configuração recarregada: %s", ", ".join(
+            name for name in Settings._fields if getattr(old, name) != getattr(new, name)))
+        for callback in listeners:
+            try:
+                callback(old, new)
+            except Exception:
+                log.exception("falha ao aplicar a configuração nova")
+    return True
+
+
+def settings():
+    """Configuração em vigor; recarrega antes se o arquivo mudou"""
+    global _next_check
+    if _current is not None and time.monotonic() < _next_check:
+        return _current
+    with _lock:
+        _next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+        unchanged = _current is not None and _stamp(ENV_FILE) == _file_stamp
+    if not unchanged:
+        reload()
+    return _current
+
+
+def setting(name):
+    """Valor em vigor de ``name``; levanta ``ConfigError`` se o valor configurado for inválido"""
+    value = getattr(settings(), name)
+    if name in _errors:
+        raise _error([_errors[name]])
+    return value
+
+
+def check(*names):
+    """Levanta ``ConfigError`` se algum dos campos (todos, sem argumentos) for inválido"""
+    settings()
+    errors = [message for name, message in _errors.items() if not names or name in names]
+    if errors:
+        raise _error(errors)
+
+
+def on_reload(callback):
+    """Registra ``callback(antiga, nova)``, chamado quando a configuração muda"""
+    _listeners.append(callback)
+    return callback
+
+
+def install_reload_signal():
+    """Recarrega a configuração no SIGHUP"""
+    import signal
+
+    # O handler roda na thread principal, que pode estar segurando _lock
+    signal.signal(signal.SIGHUP, lambda *_: threading.Thread(target=reload, daemon=True).start())
+
 
 class Config:
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
-    DEBUG = os.environ.get('DEBUG', 'False').lower() == 'true'
-    
+    """Valores do momento da importação; os atuais vêm de ``settings()``"""
+
+
+for _name, _value in settings()._asdict().items():
+    setattr(Config, _name, _value)
+del _name, _value
+
 class ProductionConfig(Config):
     DEBUG = False
 
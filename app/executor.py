@@ -0,0 +1,87 @@
+"""
+Executor para chamadas bloqueantes (git, disco, AWS) feitas pelas views
+
+O número de chamadas aceitas (em execução + na fila) é limitado: acima disso
+``submit`` falha na hora com ``Saturated`` em vez de enfileirar sem fim, e a
+view responde 503. Uma chamada que estoura o tempo libera a requisição com
+``CallTimeout`` (504), mas continua ocupando sua vaga até terminar de fato,
+para que chamadas presas não escondam a saturação.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+
+class Saturated(Exception):
+    """Todas as vagas do executor estão ocupadas"""
+
+
+class CallTimeout(Exception):
+    """A chamada bloqueante não terminou dentro do prazo"""
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers=4, max_queue=16, timeout=5.0):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="blocking")
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise Saturated(f"{self.capacity} chamadas em andamento")
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._pool.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _timed_out(self, future, timeout):
+        future.cancel()  # só tem efeito se ainda estiver na fila
+        with self._lock:
+            self.timed_out += 1
+        return CallTimeout(f"sem resposta em {timeout:.1f}s")
+
+    def run(self, fn, *args, timeout=None, **kwargs):
+        """Executa ``fn`` no pool e espera o resultado (para views síncronas)"""
+        timeout = timeout or self.timeout
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise self._timed_out(future, timeout) from None
+
+    async def run_async(self, fn, *args, timeout=None, **kwargs):
+        """Versão para views ``async def``: não bloqueia o event loop enquanto espera"""
+        timeout = timeout or self.timeout
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out(future, timeout) from None
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.max_workers, "capacity": self.capacity,
+                    "in_flight": self.in_flight, "rejected": self.rejected,
+                    "timed_out": self.timed_out}
+
+    def shutdown(self, wait=True, cancel_futures=True):
+        self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
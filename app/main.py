@@ -1,7 +1,65 @@
 from flask import Flask, jsonify
 import os
+import subprocess
+
+from .access_log import init_access_log, parse_sample_rates
+from .config import Config, Settings, check, on_reload, settings
+from .executor import BoundedExecutor, CallTimeout, Saturated
+
+# A aplicação não sobe com valor inválido nos campos que ela usa
+check("SECRET_KEY", "DEBUG",
+      *(name for name in Settings._fields if name.startswith(("BLOCKING_", "ACCESS_LOG_"))))
 
 app = Flask(__name__)
+app.config.from_object(Config)
+init_access_log(app)
+
+def make_executor(config):
+    # Chamadas bloqueantes (git, disco, AWS) rodam aqui, e não na thread da requisição
+    return BoundedExecutor(max_workers=config['BLOCKING_WORKERS'],
+                           max_queue=config['BLOCKING_QUEUE'],
+                           timeout=config['BLOCKING_TIMEOUT'])
+
+executor = make_executor(app.config)
+
+@on_reload
+def apply_settings(old, new):
+    """Aplica a configuração recarregada sem reiniciar o processo.
+
+    Executor e amostragem do log são trocados na hora. ``DEBUG`` (lido pelo
+    Flask só na partida) e o destino do log de acesso só mudam na próxima troca
+    de workers (SIGHUP no app/server.py).
+    """
+    global executor
+    changed = {name: value for name, value in new._asdict().items()
+               if getattr(old, name) != value and name != 'DEBUG'}
+    app.config.update(changed)
+    if any(name.startswith('BLOCKING_') for name in changed):
+        # As chamadas em andamento terminam no executor antigo
+        previous, executor = executor, make_executor(app.config)
+        previous.shutdown(wait=False, cancel_futures=False)
+    if 'ACCESS_LOG_SAMPLE' in changed:
+        app.extensions['access_log_sampler'].rates = parse_sample_rates(new.ACCESS_LOG_SAMPLE)
+
+@app.before_request
+def check_settings():
+    # Confere o .env no máximo uma vez por RELOAD_CHECK_INTERVAL
+    settings()
+
+@app.errorhandler(Saturated)
+def busy(error):
+    return jsonify({"status": "busy", "error": str(error)}), 503, {"Retry-After": "1"}
+
+@app.errorhandler(CallTimeout)
+def timeout(error):
+    return jsonify({"status": "timeout", "error": str(error)}), 504
+
+def git_info():
+    """Branch e último commit do repositório onde a aplicação roda"""
+    def git(*args):
+        result = subprocess.run(["git", *args], capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+    return {"branch": git("branch", "--show-current"), "commit": git("log", "-1", "--format=%h %s")}
 
 @app.route('/')
 def hello():
@@ -12,7 +70,14 @@ def hello():
 
 @app.route('/health')
 def health():
+    # Durante a drenagem (app/server.py) o balanceador deve parar de mandar tráfego
+    if app.config.get('DRAINING'):
+        return jsonify({"status": "draining"}), 503
     return jsonify({"status": "healthy"})
 
+@app.route('/info')
+async def info():
+    return jsonify({"git": await executor.run_async(git_info), "executor": executor.stats()})
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
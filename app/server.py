@@ -0,0 +1,264 @@
+"""
+Servidor da API sem indisponibilidade em reinícios: um mestre e N workers
+
+O mestre abre a porta uma única vez e repassa o descritor do socket para os
+workers (processos ``python -m app.server --worker``), então a porta nunca
+fica fechada durante uma troca de workers. O socket usa SO_REUSEPORT, quando
+disponível, para que um mestre novo possa subir ao lado do antigo.
+
+Sinais no mestre:
+- SIGHUP: recarrega a configuração e faz a troca gradual, um worker por vez:
+  sobe o novo, espera ele ficar pronto e só então drena o antigo; no fim
+  ajusta o número de workers a ``SERVER_WORKERS`` (se não veio ``--workers``);
+- SIGTERM/SIGINT: drena todos os workers e encerra.
+
+Os workers recarregam a configuração sozinhos quando o ``.env`` muda (ou num
+SIGHUP enviado diretamente a eles), sem reiniciar; ver app/config.py.
+
+No worker, SIGTERM marca a aplicação como ``DRAINING`` (o /health passa a
+responder 503), espera ``DRAIN_DELAY`` para o balanceador perceber, para de
+aceitar conexões e aguarda as conexões em andamento até ``DRAIN_TIMEOUT``.
+"""
+import argparse
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from app.config import check, install_reload_signal, reload as reload_settings, setting
+
+READY_TIMEOUT = 15
+
+
+def bind_socket(host, port, backlog=128):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+class InFlight:
+    """Middleware WSGI que conta as conexões em andamento e encerra o keep-alive na drenagem"""
+
+    def __init__(self, app):
+        self.app = app
+        self.count = 0
+        self.draining = False
+        self._cond = threading.Condition()
+
+    def __call__(self, environ, start_response):
+        def _start_response(status, headers, exc_info=None):
+            if self.draining:
+                # Não reaproveitar a conexão (keep-alive) com um worker que vai sair
+                headers = [(k, v) for k, v in headers if k.lower() != "connection"]
+                headers.append(("Connection", "close"))
+            return start_response(status, headers, exc_info)
+
+        return self.app(environ, _start_response)
+
+    def watch(self, server):
+        """Conta cada conexão do ``accept`` até o fechamento.
+
+        As threads do servidor do werkzeug são daemon e o ``server_close`` não
+        espera por elas: uma conexão aceita cuja requisição ainda não chegou à
+        aplicação seria derrubada na saída do worker.
+        """
+        process_request, shutdown_request = server.process_request, server.shutdown_request
+
+        def _process_request(request, client_address):
+            with self._cond:
+                self.count += 1
+            process_request(request, client_address)
+
+        def _shutdown_request(request):
+            try:
+                shutdown_request(request)
+            finally:
+                with self._cond:
+                    self.count -= 1
+                    self._cond.notify_all()
+
+        server.process_request = _process_request
+        server.shutdown_request = _shutdown_request
+
+    def wait_idle(self, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: self.count == 0, timeout)
+
+
+def run_worker(fd, host, ready_fd=None):
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from app.main import app
+
+    class QuietHandler(WSGIRequestHandler):
+        # O log de acesso fica com app/access_log.py
+        def log_request(self, *args):
+            pass
+
+    # Ctrl+C chega ao grupo todo; quem decide o encerramento é o mestre
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    tracked = InFlight(app)
+    server = make_server(host, 0, tracked, threaded=True, request_handler=QuietHandler, fd=fd)
+    tracked.watch(server)
+
+    def drain():
+        app.config["DRAINING"] = True
+        tracked.draining = True
+        time.sleep(setting("DRAIN_DELAY"))
+        server.shutdown()
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=drain, daemon=True).start())
+    install_reload_signal()
+    if ready_fd is not None:
+        os.write(ready_fd, b"1")
+        os.close(ready_fd)
+    server.serve_forever()
+    server.server_close()
+    return 0 if tracked.wait_idle(setting("DRAIN_TIMEOUT")) else 1
+
+
+def _drain_deadline():
+    return setting("DRAIN_DELAY") + setting("DRAIN_TIMEOUT") + 5
+
+
+class Master:
+    def __init__(self, host="0.0.0.0", port=5000, workers=None):
+        self.host = host
+        self.port = port
+        self.fixed_workers = workers
+        self.sock = None
+        self.workers = []
+        self.draining = {}  # processo -> instante do SIGTERM
+        self._reload = False
+        self._stop = False
+
+    @property
+    def n_workers(self):
+        return self.fixed_workers or setting("SERVER_WORKERS")
+
+    def log(self, message):
+        print(f"[mestre {os.getpid()}] {message}", flush=True)
+
+    def spawn(self):
+        """Sobe um worker e só retorna quando ele já está aceitando conexões"""
+        ready_r, ready_w = os.pipe()
+        fd = self.sock.fileno()
+        proc = subprocess.Popen([sys.executable, "-m", "app.server", "--worker", "--fd", str(fd),
+                                 "--host", self.host, "--ready-fd", str(ready_w)],
+                                pass_fds=(fd, ready_w))
+        os.close(ready_w)
+        try:
+            ready = select.select([ready_r], [], [], READY_TIMEOUT)[0] and os.read(ready_r, 1)
+        finally:
+            os.close(ready_r)
+        if not ready:
+            proc.kill()
+            proc.wait()
+            raise RuntimeError("worker não ficou pronto")
+        self.log(f"worker {proc.pid} pronto")
+        return proc
+
+    def retire(self, proc):
+        proc.send_signal(signal.SIGTERM)
+        self.draining[proc] = time.monotonic()
+
+    def reload(self):
+        """Troca os workers um a um, mantendo sempre ``n_workers`` aceitando conexões"""
+        self.log("SIGHUP: substituindo workers")
+        if not reload_settings():
+            self.log("❌ configuração inválida; os workers novos usam a anterior")
+        for old in list(self.workers):
+            try:
+                new = self.spawn()
+            except RuntimeError as e:
+                self.log(f"❌ {e}; mantendo os workers atuais")
+                return
+            self.workers[self.workers.index(old)] = new
+            self.retire(old)
+        try:
+            while len(self.workers) < self.n_workers:
+                self.workers.append(self.spawn())
+        except RuntimeError as e:
+            self.log(f"❌ {e}")
+        while len(self.workers) > self.n_workers:
+            self.retire(self.workers.pop())
+        self.log(f"✅ Workers substituídos ({len(self.workers)})")
+
+    def reap(self):
+        deadline = _drain_deadline()
+        for proc, since in list(self.draining.items()):
+            if proc.poll() is not None:
+                del self.draining[proc]
+            elif time.monotonic() - since > deadline:
+                proc.kill()
+        for i, proc in enumerate(self.workers):
+            if proc.poll() is not None and not self._stop:
+                self.log(f"worker {proc.pid} saiu com código {proc.returncode}; subindo outro")
+                try:
+                    self.workers[i] = self.spawn()
+                except RuntimeError as e:
+                    self.log(f"❌ {e}; tentando de novo")
+
+    def shutdown(self):
+        self.log("drenando workers")
+        for proc in self.workers:
+            self.retire(proc)
+        self.workers = []
+        deadline = time.monotonic() + _drain_deadline()
+        for proc in list(self.draining):
+            try:
+                proc.wait(max(0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        self.draining.clear()
+        self.sock.close()
+        self.log("encerrado")
+
+    def run(self):
+        check("SERVER_WORKERS", "DRAIN_DELAY", "DRAIN_TIMEOUT")
+        self.sock = bind_socket(self.host, self.port)
+        self.log(f"ouvindo em {self.host}:{self.sock.getsockname()[1]} com {self.n_workers} worker(s)")
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "_reload", True))
+        signal.signal(signal.SIGTERM, lambda *_: setattr(self, "_stop", True))
+        signal.signal(signal.SIGINT, lambda *_: setattr(self, "_stop", True))
+        self.workers = [self.spawn() for _ in range(self.n_workers)]
+        while not self._stop:
+            if self._reload:
+                self._reload = False
+                self.reload()
+            self.reap()
+            time.sleep(0.1)
+        self.shutdown()
+        return 0
+
+
+def serve(host="0.0.0.0", port=5000, workers=None):
+    return Master(host, port, workers).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor da API com reinício sem queda")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, help="padrão: SERVER_WORKERS da configuração")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--fd", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--ready-fd", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.worker:
+        return run_worker(args.fd, args.host, args.ready_fd)
+    return serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,21 @@
 #!/usr/bin/env python3
 """
 Script para executar a aplicação
+
+Sem argumentos sobe o servidor de desenvolvimento; com ``--serve`` sobe o
+servidor com workers, drenagem no SIGTERM e troca gradual no SIGHUP.
 """
-from app.main import app
+import argparse
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    parser = argparse.ArgumentParser(description="Executa a aplicação")
+    parser.add_argument('--serve', action='store_true', help="usa o servidor de app/server.py")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+    if args.serve:
+        from app import server
+        raise SystemExit(server.serve(args.host, args.port, args.workers))
+    from app.main import app
+    app.run(host=args.host, port=args.port, debug=True)
@@ -23,3 +23,58 @@ def test_404_route(client):
     """Testa rota não existente"""
     response = client.get('/nonexistent')
     assert response.status_code == 404
+
+def test_info_route(client):
+    """Testa a rota assíncrona que consulta o git pelo executor"""
+    response = client.get('/info')
+    assert response.status_code == 200
+    assert 'commit' in response.json['git']
+    assert response.json['executor']['capacity'] == 20
+
+def test_executor_saturado_e_timeout(client, monkeypatch):
+    """Testa o 503 com Retry-After quando o executor lota e o 504 quando a chamada demora"""
+    import threading
+    from app import main
+    from app.executor import BoundedExecutor
+
+    liberar = threading.Event()
+    pequeno = BoundedExecutor(max_workers=1, max_queue=0, timeout=0.1)
+    monkeypatch.setattr(main, 'executor', pequeno)
+    monkeypatch.setattr(main, 'git_info', lambda: liberar.wait(5))
+
+    assert client.get('/info').status_code == 504
+    response = client.get('/info')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert client.get('/health').status_code == 200
+    liberar.set()
+    pequeno.shutdown()
+    assert pequeno.stats()['rejected'] == 1 and pequeno.stats()['timed_out'] == 1
+
+def test_access_log_json_em_lotes(tmp_path):
+    """Testa o log JSON com request id, a gravação em lote e a amostragem do /health"""
+    import json
+    from flask import Flask
+    from app.access_log import init_access_log, stop_listener
+
+    log_path = tmp_path / "access.log"
+    app_log = Flask("teste_log")
+    app_log.config.update(ACCESS_LOG_PATH=str(log_path), ACCESS_LOG_BATCH=3,
+                          ACCESS_LOG_FLUSH_INTERVAL=60, ACCESS_LOG_SAMPLE="/health=0")
+    app_log.add_url_rule("/health", "health", lambda: "ok")
+    app_log.add_url_rule("/x/<int:n>", "x", lambda n: "x")
+    listener = init_access_log(app_log)
+    client_log = app_log.test_client()
+
+    response = client_log.get("/x/1", headers={"X-Request-ID": "abc"})
+    assert response.headers["X-Request-ID"] == "abc"
+    for _ in range(5):
+        client_log.get("/health")
+    client_log.get("/x/2")
+    client_log.get("/nada")
+    stop_listener(listener)
+
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    assert [(e["route"], e["status"]) for e in entries] == [
+        ("/x/<int:n>", 200), ("/x/<int:n>", 200), (None, 404)]
+    assert entries[0]["request_id"] == "abc" and entries[0]["latency_ms"] >= 0
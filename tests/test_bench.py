@@ -0,0 +1,26 @@
+import subprocess
+
+from tools import bench
+
+
+def test_generate_repo(tmp_path):
+    """Testa se o repositório sintético tem os commits, branches e arquivos pedidos"""
+    repo = bench.generate_repo(str(tmp_path / "repo"), commits=30, branches=2, files=15, depth=2)
+    git = lambda *args: subprocess.run(["git", *args], cwd=repo, capture_output=True,
+                                       text=True, check=True).stdout.split()
+    assert len(git("branch", "--format=%(refname:short)")) == 3
+    assert int(git("rev-list", "--count", "--all")[0]) == 30
+    assert len(git("ls-files")) == 15
+    assert git("rev-parse", "origin/main")
+
+
+def test_run_benchmarks_e_compare():
+    """Testa o relatório JSON e a detecção de regressões"""
+    report = bench.run_benchmarks(commits=20, branches=1, files=10, depth=1, repeat=1)
+    assert set(report["results"]) == {"get_status", "plot_commits", "plot_commits_weekday",
+                                      "get_repo_size", "get_repo_structure"}
+    assert report["results"]["get_status"]["commands_per_call"] == 6
+    baseline = {"results": {name: dict(r, min_s=r["min_s"] / 10)
+                            for name, r in report["results"].items()}}
+    assert {name for name, *_ in bench.compare(report, baseline)} == set(report["results"])
+    assert bench.compare(report, report) == []
@@ -0,0 +1,59 @@
+import tarfile
+
+from tools import bundle, hashing
+from tools.hashing import hash_file, hash_files
+
+
+def _objetos(path):
+    with tarfile.open(path) as tar:
+        return sorted(m.name for m in tar if m.name.startswith("objects/"))
+
+
+def test_hash_files_via_mmap(tmp_path, monkeypatch):
+    """Testa o hash via mmap, inclusive de arquivo vazio e no pool de processos"""
+    vazio = tmp_path / "vazio"
+    vazio.write_bytes(b"")
+    assert hash_file(vazio) == "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+    paths = []
+    for i in range(3):
+        (tmp_path / f"f{i}").write_text(str(i))
+        paths.append(str(tmp_path / f"f{i}"))
+    pools = []
+
+    class Pool(hashing.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(hashing, "PARALLEL_MIN_FILES", 2)
+    monkeypatch.setattr(hashing, "ProcessPoolExecutor", Pool)
+    esperado = {p: hash_file(p) for p in paths}
+    esperado[str(tmp_path / "sumiu")] = None
+    assert hash_files(list(esperado), workers=2) == esperado
+    assert len(pools) == 1
+
+
+def test_build_delta_e_verify(tmp_path):
+    """Testa se o segundo build leva só o arquivo alterado e se a cadeia reconstitui a árvore"""
+    root, bundles = tmp_path / "repo", str(tmp_path / "bundles")
+    (root / "app").mkdir(parents=True)
+    (root / "app" / "main.py").write_text("v1")
+    (root / "app" / "config.py").write_text("cfg")
+    (root / "run.py").write_text("run")
+
+    base, base_path, n_base = bundle.build(str(root), bundle_dir=bundles)
+    assert n_base == 3 and base["parent"] is None
+
+    (root / "app" / "main.py").write_text("v2")
+    delta, delta_path, n_delta = bundle.build(str(root), bundle_dir=bundles)
+    assert n_delta == 1 and delta["parent"] == base["id"]
+    assert _objetos(delta_path) == [f"objects/{delta['files']['app/main.py']['sha256']}"]
+
+    dest = tmp_path / "out"
+    assert bundle.reconstitute(delta["id"], str(dest), bundles) == []
+    assert (dest / "app" / "main.py").read_text() == "v2"
+    assert (dest / "app" / "config.py").read_text() == "cfg"
+
+    (root / "app" / "main.py").write_text("v1")
+    rollback, _, n_rollback = bundle.build(str(root), bundle_dir=bundles)
+    assert rollback["id"] == base["id"] and n_rollback == 0
@@ -0,0 +1,26 @@
+from tools.changes import Change, count_by_folder, parse_porcelain_v2
+
+
+SAIDA_V2 = "\0".join([
+    "1 .M N... 100644 100644 100644 aaa bbb app/main.py",
+    "2 R. N... 100644 100644 100644 aaa bbb R100 tools/novo nome.py",
+    "app/velho.py",
+    "u UU N... 100644 100644 100644 100644 a b c infra/modules/net/main.tf",
+    "? docs/notas.md",
+    "? README.md",
+    "",
+])
+
+
+def test_parse_porcelain_v2_com_renomeacao():
+    """Testa a leitura dos registros v2, incluindo caminho de origem e espaços"""
+    changes = parse_porcelain_v2(SAIDA_V2)
+    assert changes[1] == Change("renamed", "R.", "tools/novo nome.py", "app/velho.py")
+    assert [c.kind for c in changes] == ["modified", "renamed", "unmerged", "untracked", "untracked"]
+
+
+def test_count_by_folder_em_profundidade():
+    """Testa a agregação por pasta em diferentes profundidades"""
+    changes = parse_porcelain_v2(SAIDA_V2)
+    assert count_by_folder(changes) == {"app": 2, "tools": 1, "infra": 1, "docs": 1, "README.md": 1}
+    assert count_by_folder(changes, depth=3)["infra/modules/net"] == 1
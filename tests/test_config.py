@@ -0,0 +1,94 @@
+import pytest
+
+from app import config
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """Aponta a configuração para um .env temporário e restaura a original no fim"""
+    path = tmp_path / ".env"
+    for setting in config.SETTINGS:
+        monkeypatch.delenv(setting.name, raising=False)
+    monkeypatch.setattr(config, "ENV_FILE", str(path))
+    monkeypatch.setattr(config, "RELOAD_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(config, "_next_check", 0.0)
+    yield path
+    monkeypatch.undo()
+    config.reload()
+
+
+def test_load_valida_e_ambiente_tem_precedencia(tmp_path):
+    """Testa a leitura do .env, a precedência do ambiente e a validação de todos os campos"""
+    path = tmp_path / ".env"
+    path.write_text("BLOCKING_WORKERS=8\nMAIN_BRANCH=develop\nDEBUG=yes\n")
+    settings = config.load(str(path), environ={"MAIN_BRANCH": "trunk"})
+    assert (settings.BLOCKING_WORKERS, settings.MAIN_BRANCH, settings.DEBUG) == (8, "trunk", True)
+    assert settings.DRAIN_TIMEOUT == 30.0
+    with pytest.raises(AttributeError):
+        settings.DEBUG = False
+
+    with pytest.raises(config.ConfigError) as error:
+        config.load(str(path), environ={"BLOCKING_QUEUE": "-1", "ACCESS_LOG_SAMPLE": "/health"})
+    assert "BLOCKING_QUEUE" in str(error.value) and "ACCESS_LOG_SAMPLE" in str(error.value)
+
+
+def test_recarrega_quando_o_arquivo_muda(env_file):
+    """Testa a recarga pelo arquivo, o aviso aos ouvintes e a rejeição de valores inválidos"""
+    changes = []
+    callback = config.on_reload(lambda old, new: changes.append((old.SERVER_WORKERS, new.SERVER_WORKERS)))
+    try:
+        env_file.write_text("SERVER_WORKERS=3\n")
+        assert config.settings().SERVER_WORKERS == 3
+        env_file.write_text("SERVER_WORKERS=zero\n")
+        assert config.settings().SERVER_WORKERS == 3
+        env_file.write_text("SERVER_WORKERS=5\nDEBUG=1\n")
+        assert config.settings().SERVER_WORKERS == 5
+    finally:
+        config._listeners.remove(callback)
+    assert changes[-2:] == [(2, 3), (3, 5)]
+
+
+def test_app_aplica_configuracao_nova(env_file):
+    """Testa que a aplicação troca o executor quando BLOCKING_* muda, sem reiniciar"""
+    from app import main
+
+    client = main.app.test_client()
+    env_file.write_text("BLOCKING_WORKERS=2\nBLOCKING_QUEUE=1\n")
+    assert client.get("/info").json["executor"]["capacity"] == 3
+    assert main.app.config["BLOCKING_WORKERS"] == 2
+
+
+def test_valor_invalido_so_afeta_quem_usa(env_file, monkeypatch):
+    """Testa que um valor inválido só falha para quem lê o campo e que DEBUG desconhecido é falso"""
+    monkeypatch.setenv("DEBUG", "*")
+    monkeypatch.setenv("BLOCKING_WORKERS", "muitos")
+    env_file.write_text("MAIN_BRANCH=develop\n")
+    # Como na partida do processo: não há configuração anterior para manter
+    monkeypatch.setattr(config, "_current", None)
+    monkeypatch.setattr(config, "_errors", {})
+    assert config.settings().DEBUG is False
+    assert config.setting("MAIN_BRANCH") == "develop"
+    config.check("MAIN_BRANCH", "DEBUG")
+    with pytest.raises(config.ConfigError, match="BLOCKING_WORKERS"):
+        config.setting("BLOCKING_WORKERS")
+    with pytest.raises(config.ConfigError, match="BLOCKING_WORKERS"):
+        config.check()
+
+    # O erro que já existia não impede recarregar o resto
+    env_file.write_text("MAIN_BRANCH=trunk\n")
+    assert config.setting("MAIN_BRANCH") == "trunk"
+
+
+def test_recarga_chega_aos_consumidores(env_file):
+    """Testa que histórico do runner, clientes AWS e executor acompanham a recarga (DEBUG não)"""
+    from app import main
+    from tools import inventory, runner
+
+    inventory._clients["teste"] = object()
+    env_file.write_text("RUNNER_HISTORY_SIZE=3\nAWS_MAX_POOL_CONNECTIONS=20\nDEBUG=true\n")
+    assert config.settings().RUNNER_HISTORY_SIZE == 3
+    for _ in range(5):
+        runner.run(["git", "--version"], capture_output=True)
+    assert len(runner.history()) == runner.HISTORY_SIZE == 3
+    assert inventory._clients == {}
+    assert main.app.config["DEBUG"] is False
@@ -0,0 +1,116 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from tools import dashboard
+
+
+def test_startup_budget():
+    """Testa se a partida a frio do dashboard cabe no orçamento configurado"""
+    total_ms, entries = dashboard.startup_profile()
+    assert entries
+    assert total_ms <= dashboard.setting("DASHBOARD_STARTUP_BUDGET_MS")
+
+
+def test_heavy_imports_are_lazy():
+    """Testa se plotext, o Flask e os módulos pesados do rich não são carregados na importação"""
+    code = ("import sys, tools.dashboard; "
+            "print(','.join(m for m in ('plotext', 'webbrowser', 'rich.prompt', 'rich.tree', "
+            "'rich.progress', 'flask') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_fields_for_paths():
+    """Testa quais campos de status são recalculados para cada tipo de alteração"""
+    assert dashboard.fields_for_paths({"app/main.py"}) == {"changes"}
+    assert "remote_branches" in dashboard.fields_for_paths({".git/refs/remotes/origin/main"})
+    assert "local_branches" in dashboard.fields_for_paths({".git/HEAD"})
+    assert dashboard.fields_for_paths({"."}) == set(dashboard.STATUS_FIELDS)
+
+
+def test_status_record():
+    """Testa o acesso estilo dict e a detecção de campos alterados do StatusRecord"""
+    status = dashboard.StatusRecord(changes=["M a.py"], local_commits=3)
+    assert status["local_commits"] == 3 and "changes" in status
+    assert "remote_commits" not in status
+    with pytest.raises(KeyError):
+        status["remote_commits"]
+    before = status.copy()
+    status.update(dashboard.StatusRecord(local_commits=4))
+    assert status.changed(before) == {"local_commits"}
+    assert status["changes"] == ["M a.py"]
+
+
+def test_menu_redesenha_so_o_que_mudou(tmp_path, monkeypatch):
+    """Testa que, no loop do menu, os quadros depois do primeiro escrevem só a diferença"""
+    import io
+    from rich.console import Console
+    from rich.prompt import Prompt
+    from tools import render
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(dashboard, "console", Console(file=io.StringIO(), force_terminal=True,
+                                                      width=100, height=60))
+    commits = iter([["a1 um"], ["a1 um", "b2 dois"], ["a1 um", "b2 dois"]])
+    monkeypatch.setattr(dashboard, "get_status", lambda: dashboard.StatusRecord(
+        changes="", local_commits=next(commits), remote_commits=[], local_branches=["main"],
+        remote_branches=["origin/main"], last_commits="b2 dois"))
+    monkeypatch.setattr(dashboard, "show_trace", lambda: dashboard.console.print("tempos"))
+    answers = iter(["13", "13", "0"])
+    monkeypatch.setattr(Prompt, "ask", lambda *args, **kwargs: next(answers))
+    monkeypatch.setattr("builtins.input", lambda *args: "")
+    monkeypatch.setattr(render.FrameRenderer, "cursor_row", lambda self: 40)
+
+    sizes, frames = [], []
+    draw = render.FrameRenderer.draw
+
+    def desenha(self, *renderables):
+        sizes.append(draw(self, *renderables))
+        frames.append([re.sub(r"\x1b\[[0-9;]*m", "", line) for line in self.previous])
+        return sizes[-1]
+
+    monkeypatch.setattr(render.FrameRenderer, "draw", desenha)
+    dashboard.mega_dashboard()
+    assert len(sizes) == 3
+    assert any("STATUS DO REPOSITÓRIO" in line for line in frames[0])
+    locais = [next(line for line in frame if "Commits locais não enviados" in line)
+              for frame in frames]
+    assert [line.split("│")[1].strip(" ║") for line in locais] == ["1", "2", "2"]
+    assert not any("Erro ao carregar status" in line for frame in frames for line in frame)
+    # Um commit a mais muda poucas linhas; o quadro igual só limpa a área do prompt
+    assert sizes[1] < sizes[0] / 4
+    assert sizes[2] < 20
+
+
+def test_get_status_nao_grava_historico(tmp_path, monkeypatch):
+    """Testa que só o record_status grava no histórico; os getters não têm efeito colateral"""
+    from tools import metrics_history, repo_info
+
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    (tmp_path / "a.txt").write_text("x")
+    path = metrics_history.history_path()
+    dashboard.get_status(["changes", "local_branches"])
+    repo_info.get_repo_size()
+    assert not os.path.exists(path)
+
+    dashboard.record_status(dashboard.StatusRecord(
+        changes="?? a.txt", local_commits=[], remote_commits=[], local_branches=["main"],
+        remote_branches=[], last_commits=""))
+    with metrics_history.MetricsHistory(path) as history:
+        (snapshot,) = history.range()
+    assert (snapshot.changes, snapshot.local_branches, snapshot.repo_size) == (1, 1, None)
+
+
+def test_dono_com_colchetes_nao_vira_markup():
+    """Testa que o nome do autor vindo do git blame é escapado antes de virar markup do Rich"""
+    from rich.text import Text
+    from tools.ownership import Ownership
+
+    autoria = Ownership({"a.py": {"[bot] deploy": 3}})
+    rotulo = dashboard._com_dono("📄 a.py", "a.py", autoria)
+    assert Text.from_markup(rotulo).plain == "📄 a.py ([bot] deploy 100%)"
@@ -0,0 +1,41 @@
+from tools import duplicates
+
+
+def test_find_duplicates_por_etapas(tmp_path, monkeypatch):
+    """Testa o agrupamento por tamanho, hash parcial e hash completo"""
+    monkeypatch.setattr(duplicates, "PARTIAL_BYTES", 4)
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "a.txt").write_text("mesmo conteúdo")
+    (tmp_path / "tools" / "a_backup.txt").write_text("mesmo conteúdo")
+    (tmp_path / "tools" / "a.txt").write_text("mesmo conteúdo")
+    # Mesmo tamanho e mesmo início: só o hash completo separa
+    (tmp_path / "b.txt").write_text("mesmo conteudo!")
+    (tmp_path / "c.txt").write_text("mesmo conteudo?")
+    (tmp_path / "vazio1.txt").write_text("")
+    (tmp_path / "vazio2.txt").write_text("")
+
+    groups = duplicates.find_duplicates(str(tmp_path))
+    assert groups == [{"size": len("mesmo conteúdo".encode()),
+                       "paths": ["a.txt", "tools/a.txt", "tools/a_backup.txt"]}]
+    assert duplicates.plan_cleanup(groups) == [("a.txt", ["tools/a_backup.txt"], "idêntico")]
+
+
+def test_find_near_duplicates(tmp_path):
+    """Testa a detecção de código quase igual e a remoção só da cópia de backup"""
+    linhas = [f"def f{i}():\n    return {i}\n" for i in range(40)]
+    (tmp_path / "mod.py").write_text("".join(linhas))
+    (tmp_path / "mod_corrupted.py").write_text("# cópia\n" + "".join(linhas[:-1]) + "def nova():\n    pass\n")
+    (tmp_path / "outro.py").write_text("".join(f"x{i} = {i}\n" for i in range(80)))
+
+    near = duplicates.find_near_duplicates(str(tmp_path), threshold=0.8)
+    assert [(a, b) for a, b, _ in near] == [("mod.py", "mod_corrupted.py")]
+    assert duplicates.plan_cleanup([], near)[0][:2] == ("mod.py", ["mod_corrupted.py"])
+
+
+def test_plan_cleanup_mantem_copias_legitimas():
+    """Testa que cópias idênticas de propósito nunca são propostas para remoção"""
+    groups = [{"size": 20, "paths": ["app/__init__.py", "tools/__init__.py"]},
+              {"size": 900, "paths": ["LICENSE", "infra/LICENSE"]},
+              {"size": 50, "paths": ["a.bak", "b.bak"]},
+              {"size": 70, "paths": ["env/dev.env", "env/prod.env", "env/prod.env.orig"]}]
+    assert duplicates.plan_cleanup(groups) == [("env/dev.env", ["env/prod.env.orig"], "idêntico")]
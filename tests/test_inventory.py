@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+
+import pytest
+
+from tools import inventory
+from tools.cache import TTLCache
+
+
+def test_ttl_cache_nao_bloqueia():
+    """Testa se o cache devolve o valor vencido enquanto recarrega em segundo plano"""
+    cache = TTLCache(ttl=0.05)
+    liberar = threading.Event()
+    chamadas = []
+
+    def loader():
+        chamadas.append(1)
+        liberar.wait(2)
+        return len(chamadas)
+
+    assert cache.get("k", loader) is None
+    liberar.set()
+    for _ in range(100):
+        if cache.get("k", loader) == 1:
+            break
+        time.sleep(0.01)
+    liberar.clear()
+    time.sleep(0.06)
+    inicio = time.monotonic()
+    assert cache.get("k", loader) == 1
+    assert time.monotonic() - inicio < 0.5
+    liberar.set()
+
+
+def test_ttl_cache_wait_espera_carga_em_andamento():
+    """Testa que ``wait=True`` espera a carga já disparada em segundo plano"""
+    cache = TTLCache()
+    liberar = threading.Event()
+
+    def loader():
+        liberar.wait(2)
+        return "pronto"
+
+    assert cache.get("k", loader) is None
+    threading.Timer(0.05, liberar.set).start()
+    assert cache.get("k", loader, default="carregando", wait=True) == "pronto"
+
+
+def test_ttl_cache_guarda_falha():
+    """Testa que uma falha do loader vale pelo ``error_ttl`` e que ``invalidate`` força nova carga"""
+    cache = TTLCache(ttl=60, error_ttl=0.05)
+    chamadas = []
+
+    def loader():
+        chamadas.append(1)
+        raise OSError("sem rede")
+
+    assert cache.get("k", loader, default="-", wait=True) == "-"
+    assert cache.get("k", loader, default="-", wait=True) == "-"
+    assert len(chamadas) == 1 and isinstance(cache.errors["k"], OSError)
+    time.sleep(0.06)
+    cache.get("k", loader, wait=True)
+    assert len(chamadas) == 2
+    cache.invalidate()
+    cache.get("k", loader, wait=True)
+    assert len(chamadas) == 3
+
+
+def test_terraform_outputs_do_state_local(tmp_path):
+    """Testa a leitura dos outputs direto do terraform.tfstate"""
+    state = tmp_path / "terraform.tfstate"
+    state.write_text(json.dumps({"outputs": {"instance_id": {"value": "i-123", "type": "string"}}}))
+    assert inventory.terraform_outputs(str(state)) == {"instance_id": "i-123"}
+    assert inventory.terraform_outputs(str(tmp_path / "nada")) == {}
+
+
+def test_inventario_com_moto(monkeypatch):
+    """Testa os paginators de EC2 e security groups contra a AWS simulada do moto"""
+    moto = pytest.importorskip("moto")
+    mock = getattr(moto, "mock_aws", None) or moto.mock_ec2
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    inventory.reset_clients()
+    with mock():
+        ec2 = inventory.get_client("ec2")
+        sg = ec2.create_security_group(GroupName="app-security-group", Description="app")
+        ec2.authorize_security_group_ingress(GroupId=sg["GroupId"], IpProtocol="tcp",
+                                             FromPort=5000, ToPort=5000, CidrIp="0.0.0.0/0")
+        ami = ec2.describe_images(Owners=["amazon"])["Images"][0]["ImageId"]
+        ec2.run_instances(ImageId=ami, InstanceType="t2.micro", MinCount=3, MaxCount=3,
+                          TagSpecifications=[{"ResourceType": "instance",
+                                              "Tags": [{"Key": "Name", "Value": "AppServer"}]}])
+        instances = inventory.list_instances()
+        groups = inventory.list_security_groups()
+    inventory.reset_clients()
+    assert len(instances) == 3 and instances[0]["name"] == "AppServer"
+    assert [g["ingress_ports"] for g in groups if g["name"] == "app-security-group"] == [[5000]]
@@ -0,0 +1,29 @@
+from tools.metrics_history import MetricsHistory, record
+
+
+def test_ring_buffer_e_downsampling(tmp_path):
+    """Testa o buffer circular, a redução por bucket e a leitura por intervalo"""
+    path = str(tmp_path / "metrics.bin")
+    with MetricsHistory(path, raw_capacity=10, coarse_capacity=3, bucket=100) as history:
+        for i in range(25):
+            history.append(ts=1000 + i * 30, changes=i, repo_size=i * 1000 if i % 2 else None)
+
+    with MetricsHistory(path) as history:
+        snapshots = list(history.range())
+        # 15 registros saíram do raw (ts 1000..1420): buckets 1000..1400, só os 3 últimos ficam
+        assert [s.ts for s in snapshots[:3]] == [1200, 1300, 1400]
+        assert snapshots[0].changes == 9 and snapshots[0].repo_size == 9000
+        assert [s.changes for s in snapshots[3:]] == list(range(15, 25))
+        assert [s.changes for s in history.range(1500, 1600)] == [17, 18, 19, 20]
+        assert history.series("repo_size", start=1600) == [(1630.0, 21000), (1690.0, 23000)]
+        assert len(history.series("changes", max_points=4)) == 4
+
+
+def test_record_fora_de_repositorio(tmp_path, monkeypatch):
+    """Testa que o registro é ignorado fora da raiz de um repositório git"""
+    monkeypatch.chdir(tmp_path)
+    assert record(changes=1) is False
+    (tmp_path / ".git").mkdir()
+    assert record(changes=1) is True
+    with MetricsHistory(str(tmp_path / ".git" / "dashboard" / "metrics.bin")) as history:
+        assert [s.changes for s in history.range()] == [1]
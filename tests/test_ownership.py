@@ -0,0 +1,57 @@
+import subprocess
+
+from tools import ownership, runner
+
+
+def _commit(repo, author, files):
+    for name, text in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True)
+    subprocess.run(["git", "-c", f"user.name={author}", "-c", f"user.email={author}@x",
+                    "commit", "-qm", f"commit de {author}"], cwd=repo, check=True)
+
+
+def test_ownership_blame_cache_e_pastas(tmp_path, monkeypatch):
+    """Testa a agregação por pasta e que blobs já vistos não passam de novo pelo blame"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    _commit(repo, "ana", {"app/a.py": "1\n2\n3\n", "README.md": "x\n"})
+    _commit(repo, "bia", {"app/b.py": "1\n", "app/a.py": "1\n2\n3\n4\n"})
+    cache = str(tmp_path / "ownership.db")
+
+    files = ownership.build(str(repo), cache_path=cache)
+    assert files["app/a.py"] == {"ana": 3, "bia": 1}
+    owners = ownership.Ownership(files)
+    assert owners.owners("app") == [("ana", 0.6), ("bia", 0.4)]
+    assert owners.label(".") == "ana 67%"
+
+    calls = []
+    original = ownership.blame_file
+    monkeypatch.setattr(ownership, "blame_file", lambda root, path: calls.append(path) or original(root, path))
+    _commit(repo, "bia", {"app/b.py": "1\n2\n"})
+    assert ownership.build(str(repo), cache_path=cache)["app/b.py"] == {"bia": 2}
+    assert calls == ["app/b.py"]
+
+
+def test_blame_com_falha_nao_vai_para_o_cache(tmp_path, monkeypatch):
+    """Testa se um blame que falhou fica de fora do resultado e é refeito na próxima vez"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+    _commit(repo, "ana", {"a.py": "1\n"})
+    cache = str(tmp_path / "ownership.db")
+
+    original = runner.run
+
+    def falha_no_blame(argv, **kwargs):
+        if "blame" in argv:
+            return subprocess.CompletedProcess(argv, 128, "", "fatal: erro")
+        return original(argv, **kwargs)
+
+    monkeypatch.setattr(runner, "run", falha_no_blame)
+    assert ownership.build(str(repo), cache_path=cache) == {}
+    monkeypatch.setattr(runner, "run", original)
+    assert ownership.build(str(repo), cache_path=cache) == {"a.py": {"ana": 1}}
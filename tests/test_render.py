@@ -0,0 +1,56 @@
+import io
+
+from rich.console import Console
+from rich.table import Table
+
+from tools.render import FrameRenderer
+
+
+def _table(value):
+    table = Table(title="Status")
+    table.add_column("Campo")
+    table.add_column("Valor")
+    for i in range(10):
+        table.add_row(f"campo {i}", value if i == 5 else str(i))
+    return table
+
+
+def test_redesenha_so_linhas_alteradas():
+    """Testa que o segundo quadro reescreve só a linha que mudou"""
+    out = io.StringIO()
+    console = Console(file=out, force_terminal=True, width=60, height=50)
+    with FrameRenderer(console) as renderer:
+        first = renderer.draw(_table("a"))
+        same = renderer.draw(_table("a"))
+        changed = renderer.draw(_table("b"))
+    assert changed < first / 5
+    assert same < changed
+    assert renderer.savings() > 0.5
+    assert out.getvalue().startswith("\x1b[?1049h")
+
+
+def test_sem_terminal_escreve_quadro_inteiro():
+    """Testa que fora de um terminal o quadro é escrito inteiro, sem códigos de cursor"""
+    out = io.StringIO()
+    console = Console(file=out, width=60)
+    with FrameRenderer(console) as renderer:
+        renderer.draw("linha 1", "linha 2")
+        renderer.draw("linha 1", "linha 2")
+    assert out.getvalue() == "linha 1\nlinha 2\n" * 2
+
+
+def test_settle_mantem_quadro_se_a_tela_nao_rolou(monkeypatch):
+    """Testa que a saída abaixo do quadro só força redesenho completo quando rola a tela"""
+    out = io.StringIO()
+    console = Console(file=out, force_terminal=True, width=60, height=50)
+    renderer = FrameRenderer(console, alt_screen=False)
+    first = renderer.draw(_table("a"))
+
+    monkeypatch.setattr(renderer, "cursor_row", lambda: 30)
+    console.print("Escolha a ação: 13\nsaída da ação")
+    assert renderer.settle()
+    assert renderer.draw(_table("a")) < first / 5
+
+    monkeypatch.setattr(renderer, "cursor_row", lambda: 49)
+    assert not renderer.settle()
+    assert renderer.draw(_table("a")) == first
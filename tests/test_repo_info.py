@@ -0,0 +1,31 @@
+import os
+import subprocess
+
+from tools import repo_info
+
+
+def test_largest_blobs_heap_limitado():
+    """Testa se só os N maiores blobs são mantidos e os totais somam todos os objetos"""
+    objects = [(f"{i:040x}", "blob", i * 10, i) for i in range(100)]
+    objects.append(("f" * 40, "commit", 999999, 1))
+    blobs, totals = repo_info.largest_blobs(3, objects)
+    assert [size for size, _, _ in blobs] == [990, 980, 970]
+    assert totals["blob"][0] == 100 and totals["commit"] == (1, 999999, 1)
+
+
+def test_analyze_e_recomendacoes(tmp_path, monkeypatch):
+    """Testa a análise num repositório real: caminho, commit de origem e sugestões"""
+    git = lambda *args: subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    git("init", "-q")
+    (tmp_path / "grande.bin").write_bytes(os.urandom(200_000))
+    (tmp_path / "pequeno.txt").write_text("oi")
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "adiciona binário")
+    monkeypatch.chdir(tmp_path)
+
+    report = repo_info.analyze(top=1)
+    assert report["blobs"][0]["path"] == "grande.bin"
+    assert report["blobs"][0]["commit"].endswith("adiciona binário")
+    assert report["stats"]["count"] == 4
+    assert repo_info.recommendations({"count": 10000, "packs": 60}) == [
+        "10000 objetos soltos: rode 'git gc'", "60 packs: rode 'git repack -ad' para consolidar"]
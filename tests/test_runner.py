@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+import pytest
+
+from tools import runner
+
+
+@pytest.fixture(autouse=True)
+def limpar_historico():
+    runner.clear_history()
+    yield
+    runner.clear_history()
+
+
+def test_run_registra_comando():
+    """Testa se cada execução entra no buffer com código de saída e tamanho da saída"""
+    result = runner.run([sys.executable, "-c", "print('ola')"], capture_output=True)
+    assert result.stdout.strip() == "ola"
+    (record,) = runner.history()
+    assert record.returncode == 0
+    assert record.output_bytes == len("ola\n")
+    assert record.duration > 0
+
+
+def test_run_erro_e_timeout():
+    """Testa erro com check, retorno sem check e registro de timeout"""
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.run([sys.executable, "-c", "raise SystemExit(3)"], capture_output=True)
+    result = runner.run([sys.executable, "-c", "raise SystemExit(3)"], check=False)
+    assert result.returncode == 3
+    assert runner.history()[-1].output_bytes is None
+    with pytest.raises(subprocess.TimeoutExpired):
+        runner.run([sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.2)
+    assert runner.slowest(1)[0].timed_out
+
+
+def test_history_e_circular():
+    """Testa se o buffer descarta os registros mais antigos"""
+    for _ in range(runner.HISTORY_SIZE + 5):
+        runner._history.append(runner.CommandRecord(("x",), 0, 0.0, 0, 0, False))
+    assert len(runner.history()) == runner.HISTORY_SIZE
+
+
+def test_stream_registra_ao_sair():
+    """Testa se o streaming entrega a saída linha a linha e registra o código de saída ao sair"""
+    code = "import sys; [print(line.upper(), end='') for line in sys.stdin]; raise SystemExit(2)"
+    with runner.stream([sys.executable, "-c", code], stdin=True, text=True) as proc:
+        proc.stdin.write("a\nb\n")
+        proc.stdin.close()
+        assert list(proc.stdout) == ["A\n", "B\n"]
+        assert runner.history() == []
+    (record,) = runner.history()
+    assert proc.returncode == record.returncode == 2
+    assert record.output_bytes is None
@@ -0,0 +1,62 @@
+import os
+import socket
+import zipfile
+
+import pytest
+
+from tools import s3_publish
+
+moto_server = pytest.importorskip("moto.server")
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    """Cliente S3 apontando para o moto em modo servidor"""
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    client = s3_publish.make_client(f"http://127.0.0.1:{port}", region="us-east-1")
+    client.create_bucket(Bucket="artefatos")
+    yield client
+    server.stop()
+
+
+def test_build_package_deterministico(tmp_path):
+    """Testa se o pacote não muda entre builds do mesmo conteúdo"""
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "main.py").write_text("print('oi')")
+    (tmp_path / "app" / "__pycache__").mkdir()
+    (tmp_path / "run.py").write_text("")
+    a = s3_publish.build_package(str(tmp_path / "a.zip"), root=str(tmp_path))
+    b = s3_publish.build_package(str(tmp_path / "b.zip"), root=str(tmp_path))
+    assert open(a, "rb").read() == open(b, "rb").read()
+    assert zipfile.ZipFile(a).namelist() == ["app/main.py", "run.py"]
+
+
+def test_part_size_abaixo_do_minimo(capsys):
+    """Testa se o --part-size abaixo do mínimo do S3 é recusado antes de empacotar"""
+    with pytest.raises(SystemExit) as exc:
+        s3_publish.main(["--bucket", "artefatos", "--part-size", "4"])
+    assert exc.value.code == 2
+    assert "mínimo 5 MB" in capsys.readouterr().err
+
+
+def test_publish_multipart_e_pula_inalterado(s3_client, tmp_path):
+    """Testa o upload multipart, o ETag calculado localmente e o pulo de arquivos iguais"""
+    artefato = tmp_path / "build.bin"
+    artefato.write_bytes(os.urandom(11 * s3_publish.MB))
+    kwargs = dict(part_size=5 * s3_publish.MB, concurrency=4, client=s3_client)
+
+    (primeiro,) = s3_publish.publish([str(artefato)], "artefatos", "builds", **kwargs)
+    assert primeiro.status == "uploaded"
+    etag = s3_client.head_object(Bucket="artefatos", Key="builds/build.bin")["ETag"].strip('"')
+    assert etag.endswith("-3")
+    assert etag == s3_publish.local_hashes(str(artefato), s3_publish.transfer_config(5 * s3_publish.MB))[0]
+
+    (segundo,) = s3_publish.publish([str(artefato)], "artefatos", "builds", **kwargs)
+    assert segundo.status == "skipped"
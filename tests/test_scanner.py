@@ -0,0 +1,32 @@
+import os
+
+from tools.scanner import IgnoreMatcher, scan_structure
+
+
+def test_ignore_matcher_regras_gitignore():
+    """Testa padrões ancorados, só-diretório, '**' e negação"""
+    matcher = IgnoreMatcher(["*.log", "/build", "cache/", "docs/**/*.tmp", "!keep.log"])
+    assert matcher.ignored("a/b/erro.log")
+    assert not matcher.ignored("keep.log")
+    assert matcher.ignored("build", is_dir=True)
+    assert not matcher.ignored("src/build", is_dir=True)
+    assert matcher.ignored("x/cache", is_dir=True)
+    assert not matcher.ignored("x/cache")
+    assert matcher.ignored("docs/a/b/c.tmp")
+
+
+def test_scan_structure_poda_ignorados(tmp_path):
+    """Testa se diretórios ocultos, venv e do .gitignore não são percorridos"""
+    (tmp_path / ".gitignore").write_text("dist/\n*.pyc\n")
+    for d in ["app/sub", ".git/objects", "venv/lib", "dist/x", "tools"]:
+        (tmp_path / d).mkdir(parents=True)
+    (tmp_path / "app" / "main.py").write_text("")
+    (tmp_path / "app" / "main.pyc").write_text("")
+    (tmp_path / "app" / "sub" / "mod.py").write_text("")
+    (tmp_path / "venv" / "lib" / "x.py").write_text("")
+
+    entries = list(scan_structure(tmp_path))
+    paths = [rel for rel, _, _ in entries]
+    assert paths == [".", "app", os.path.join("app", "sub"), "tools"]
+    assert entries[0][1] == ["app", "tools"]
+    assert entries[1][2] == ["main.py"]
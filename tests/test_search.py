@@ -0,0 +1,65 @@
+import subprocess
+
+from tools import search
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=repo,
+                   check=True, capture_output=True)
+
+
+def test_search_incremental(tmp_path):
+    """Testa substring, regex, conteúdo e a atualização incremental de commits e caminhos"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    (repo / "deploy.sh").write_text("#!/bin/sh\nterraform apply -auto-approve\n")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "Adiciona script de Deploy")
+
+    index = search.SearchIndex(str(repo), path=str(tmp_path / "search.db"))
+    assert index.update(contents=True) == {"commits": 1, "files": 2}
+    assert [h.kind for h in index.search("deploy")] == ["path", "commit"]
+    assert index.search("auto-approve")[0].snippet == "2: terraform apply -auto-approve"
+    assert [h.kind for h in index.search(r"terraform \w+ -auto", regex=True)] == ["content"]
+
+    (repo / "deploy.sh").rename(repo / "publicar.sh")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "Renomeia script")
+    # Sem contents, a escolha da atualização anterior é mantida
+    assert index.update()["commits"] == 1
+    assert [h.ref for h in index.search("sh", kinds=("path",))] == ["publicar.sh"]
+    assert [h.snippet for h in index.search("renomeia")] == ["Renomeia script"]
+    assert len(index.search("auto-approve")) == 1
+    assert index.update() == {"commits": 0, "files": 0}
+    index.close()
+
+
+def test_historico_reescrito(tmp_path):
+    """Testa que commits reescritos (amend + gc) saem do índice e os novos entram"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    for message in ("Primeiro commit", "Mensagem com erro de digitacao"):
+        (repo / "a.txt").write_text(message)
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-qm", message)
+
+    index = search.SearchIndex(str(repo), path=str(tmp_path / "search.db"))
+    assert index.update()["commits"] == 2
+    _git(repo, "commit", "-q", "--amend", "-m", "Mensagem corrigida")
+    _git(repo, "reflog", "expire", "--expire=now", "--all")
+    _git(repo, "gc", "-q", "--prune=now")
+
+    assert index.update()["commits"] == 2
+    assert index.search("digitacao") == []
+    assert [h.snippet for h in index.search("corrigida")] == ["Mensagem corrigida"]
+    assert len(index.search("commit", kinds=("commit",))) == 1
+    index.close()
+
+
+def test_required_literals():
+    """Testa a extração dos literais obrigatórios de um regex"""
+    assert search.required_literals(r"foo(bar)+baz") == ["foo", "bar", "baz"]
+    assert search.required_literals(r"ab(cde)?fgh") == ["fgh"]
+    assert search.required_literals(r"deploy|build") == []
@@ -0,0 +1,90 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.main import app
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, "SIGHUP"), reason="requer sinais POSIX")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_health_durante_drenagem():
+    """Testa o /health respondendo 503 quando a aplicação está drenando"""
+    client = app.test_client()
+    app.config["DRAINING"] = True
+    try:
+        response = client.get("/health")
+        assert response.status_code == 503
+        assert response.json["status"] == "draining"
+    finally:
+        app.config["DRAINING"] = False
+
+
+def test_reload_sem_queda_e_drenagem(tmp_path):
+    """Testa que nenhuma requisição falha durante o SIGHUP e que o SIGTERM encerra limpo"""
+    port = _free_port()
+    log = open(tmp_path / "server.log", "w+")
+    env = dict(os.environ, DRAIN_DELAY="0.2", DRAIN_TIMEOUT="5", ACCESS_LOG_SAMPLE="/=0")
+    master = subprocess.Popen([sys.executable, "-m", "app.server", "--host", "127.0.0.1",
+                               "--port", str(port), "--workers", "2"],
+                              cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = f"http://127.0.0.1:{port}/"
+    try:
+        deadline = time.monotonic() + 20
+        while (tmp_path / "server.log").read_text().count("pronto") < 2:
+            assert time.monotonic() < deadline and master.poll() is None
+            time.sleep(0.1)
+
+        results, stop = [], threading.Event()
+
+        def load():
+            while not stop.is_set():
+                try:
+                    results.append(_get(url))
+                except OSError as e:
+                    results.append(repr(e))
+
+        threads = [threading.Thread(target=load) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.3)
+        master.send_signal(signal.SIGHUP)
+        while "substituídos" not in (tmp_path / "server.log").read_text():
+            assert time.monotonic() < deadline + 20
+            time.sleep(0.1)
+        time.sleep(0.5)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        assert results and set(results) == {200}, [r for r in results if r != 200][:5]
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(15) == 0
+        assert (tmp_path / "server.log").read_text().count("pronto") == 4
+    finally:
+        if master.poll() is None:
+            master.kill()
+        log.close()
@@ -0,0 +1,43 @@
+from tools.test_impact import ImpactMap, parse_diff
+
+DIFF = """diff --git a/tools/changes.py b/tools/changes.py
+index 1111111..2222222 100644
+--- a/tools/changes.py
++++ b/tools/changes.py
+@@ -10,2 +10,3 @@ def folder_of(path, depth=1):
+--- linha removida que parece cabeçalho
++nova
+@@ -40,0 +42 @@ def count_by_folder(changes, depth=1):
++inserida
+diff --git a/tools/novo.py b/tools/novo.py
+new file mode 100644
+--- /dev/null
++++ b/tools/novo.py
+@@ -0,0 +1 @@
++x = 1
+"""
+
+
+def test_parse_diff():
+    """Testa as linhas alteradas (numeração antiga), inserções e arquivos novos"""
+    assert parse_diff(DIFF) == {"tools/changes.py": {10, 11, 40, 41}, "tools/novo.py": None}
+
+
+def test_select_por_linha_modulo_e_fallback(tmp_path):
+    """Testa a seleção por linha, o código de módulo e a volta para a suíte completa"""
+    impact = ImpactMap(str(tmp_path / "impact.db"))
+    impact.store({"tools/changes.py": {1: {""}, 10: {"tests/test_changes.py::test_a"},
+                                       40: {"tests/test_changes.py::test_b"}},
+                  "app/main.py": {5: {"tests/test_app.py::test_hello_route"}}}, "abc123")
+    assert impact.commit == "abc123"
+
+    selected, _ = impact.select({"tools/changes.py": {10}, "README.md": {1}})
+    assert selected == {"tests/test_changes.py::test_a"}
+    selected, _ = impact.select({"tools/changes.py": {1}})
+    assert selected == {"tests/test_changes.py::test_a", "tests/test_changes.py::test_b"}
+    selected, _ = impact.select({"tests/test_app.py": {3}})
+    assert selected == {"tests/test_app.py::test_hello_route"}
+
+    assert impact.select({"tools/novo.py": None})[0] is None
+    assert impact.select({"requirements.txt": {1}})[0] is None
+    impact.close()
@@ -0,0 +1,96 @@
+import io
+import json
+
+import pytest
+
+from tools import tfstate
+
+STATE = {
+    "version": 4,
+    "serial": 7,
+    "ratio": 1.5,
+    "delta": -2.5,
+    "scale": 2.5e-3,
+    "big": 1e21,
+    "outputs": {"instance_id": {"value": "i-abc", "type": "string"}},
+    "resources": [
+        {"mode": "managed", "type": "aws_instance", "name": "app_server",
+         "instances": [{"attributes": {"id": "i-abc", "instance_type": "t3.small",
+                                       "tags": {"Name": 'x "}" ] \\'}}}]},
+        {"mode": "managed", "type": "aws_s3_bucket", "name": "logs",
+         "instances": [{"index_key": "a", "attributes": {"id": "logs-a"}}]},
+        {"mode": "data", "type": "aws_ami", "name": "ubuntu", "instances": [{"attributes": {}}]},
+    ],
+}
+
+CONFIG = '''
+resource "aws_instance" "app_server" {
+  ami           = "ami-0c02fb55956c7d316"
+  instance_type = "t2.micro"
+
+  tags = {
+    Name = "AppServer"
+  }
+}
+
+resource "aws_security_group" "app_sg" {
+  name = "app-security-group"
+}
+'''
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+def test_json_stream_em_blocos(chunk_size):
+    """Testa a navegação incremental com blocos de qualquer tamanho"""
+    stream = tfstate.JsonStream(io.StringIO(json.dumps(STATE)), chunk_size=chunk_size)
+    visto = {}
+    for key in stream.iter_object():
+        if key == "resources":
+            visto[key] = []
+            for _ in stream.iter_array():
+                visto[key].append(stream.read_value()["name"])
+        elif key == "outputs":
+            stream.skip_value()
+        else:
+            visto[key] = stream.read_value()
+    assert visto == {"version": 4, "serial": 7, "ratio": 1.5, "delta": -2.5, "scale": 2.5e-3,
+                     "big": 1e21, "resources": ["app_server", "logs", "ubuntu"]}
+
+
+@pytest.mark.parametrize("value", ["1.5", "-2.5", "2e-3", "7E+2"])
+def test_numero_cortado_no_fim_do_bloco(value):
+    """Testa números cujo ponto ou expoente cai no último byte do bloco padrão"""
+    for cut in range(1, len(value)):
+        prefix = '{"pad": "'
+        pad = "x" * (tfstate.CHUNK_SIZE - cut - len(prefix) - len('", "n": '))
+        text = f'{prefix}{pad}", "n": {value}}}'
+        assert text.index(value) + cut == tfstate.CHUNK_SIZE
+        stream = tfstate.JsonStream(io.StringIO(text))
+        assert dict((key, stream.read_value()) for key in stream.iter_object())["n"] == json.loads(value)
+
+
+def test_drift_summary(tmp_path):
+    """Testa o índice por endereço e o resumo de drift entre config, state e plano"""
+    (tmp_path / "main.tf").write_text(CONFIG)
+    state = tmp_path / "terraform.tfstate"
+    state.write_text(json.dumps(STATE))
+    plan = tmp_path / "plan.json"
+    plan.write_text(json.dumps({
+        "prior_state": STATE,
+        "resource_drift": [{"address": "aws_instance.app_server",
+                            "change": {"actions": ["update"], "before": {"instance_type": "t2.micro"},
+                                       "after": {"instance_type": "t3.small"}}}],
+        "resource_changes": [{"address": "aws_security_group.app_sg", "change": {"actions": ["create"]}}],
+    }))
+
+    index = tfstate.index_state(str(state))
+    assert list(index) == ['aws_instance.app_server', 'aws_s3_bucket.logs["a"]', "data.aws_ami.ubuntu"]
+    assert tfstate.read_outputs(str(state)) == {"instance_id": "i-abc"}
+
+    summary = tfstate.drift_summary(str(state), str(tmp_path), str(plan))
+    assert summary["missing_in_state"] == ["aws_security_group.app_sg"]
+    assert summary["not_in_config"] == ["aws_s3_bucket.logs"]
+    assert summary["attribute_drift"] == {
+        "aws_instance.app_server": {"instance_type": {"config": "t2.micro", "state": "t3.small"}}}
+    assert summary["plan_drift"] == {"aws_instance.app_server": ["instance_type"]}
+    assert summary["plan_actions"] == {"aws_security_group.app_sg": "create"}
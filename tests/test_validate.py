@@ -0,0 +1,31 @@
+from tools import validate
+
+
+def test_validate_regras(tmp_path):
+    """Testa itens obrigatórios, padrões proibidos, limite de tamanho e o .gitignore"""
+    for d in ["app", "infra", "tests", ".github/workflows", "venv", "build"]:
+        (tmp_path / d).mkdir(parents=True)
+    (tmp_path / "README.md").write_text("# x")
+    (tmp_path / ".gitignore").write_text("build/\n")
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "tools" / "dash_corrupted.py").write_text("")
+    (tmp_path / "infra" / "terraform.tfstate").write_text("{}")
+    (tmp_path / "app" / "grande.bin").write_bytes(b"x" * 3000)
+    (tmp_path / "build" / "x_corrupted.py").write_text("")
+    (tmp_path / "venv" / "x_corrupted.py").write_text("")
+
+    rules = dict(validate.RULES, max_file_size_kb=2)
+    results = {(r["rule"], r["path"]): r["severity"] for r in validate.validate(str(tmp_path), rules)}
+    assert results[("required", ".github/workflows")] == "ok"
+    assert results[("forbidden", "tools/dash_corrupted.py")] == "warning"
+    assert results[("forbidden", "infra/terraform.tfstate")] == "error"
+    assert results[("max_file_size", "app/grande.bin")] == "error"
+    assert not any("build/" in path or "venv/" in path for _, path in results)
+
+
+def test_validate_item_ausente(tmp_path):
+    """Testa a falha quando falta um item obrigatório"""
+    results = validate.validate(str(tmp_path))
+    assert {r["path"] for r in results if r["severity"] == "error"} == {
+        "README.md", ".gitignore", "app", "infra", "tests", ".github/workflows"}
+    assert validate.scaffold_dirs()[-2:] == ["docs", "tools"]
@@ -0,0 +1,64 @@
+import os
+import threading
+
+import pytest
+
+from tools.scanner import StructureCache
+from tools.watcher import InotifyWatcher, PollingWatcher, create_watcher
+
+
+def _observar(cls, root, acao, **kwargs):
+    lotes, recebido = [], threading.Event()
+
+    def callback(paths):
+        lotes.append(paths)
+        recebido.set()
+
+    watcher = cls(str(root), callback, **kwargs).start()
+    try:
+        acao()
+        assert recebido.wait(5)
+    finally:
+        watcher.stop()
+    return set().union(*lotes)
+
+
+@pytest.mark.parametrize("cls,kwargs", [(InotifyWatcher, {}), (PollingWatcher, {"interval": 0.05})])
+def test_watcher_agrupa_eventos(tmp_path, cls, kwargs):
+    """Testa se alterações no working tree chegam agrupadas e filtradas pelo .gitignore"""
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "app").mkdir()
+
+    def acao():
+        (tmp_path / "app" / "main.py").write_text("print('oi')")
+        (tmp_path / "app" / "debug.log").write_text("x")
+
+    if cls is InotifyWatcher:
+        sonda = create_watcher(str(tmp_path), print)
+        sonda.stop()
+        if not isinstance(sonda, InotifyWatcher):
+            pytest.skip("inotify indisponível nesta plataforma")
+    paths = _observar(cls, tmp_path, acao, **kwargs)
+    assert "app/main.py" in paths
+    assert "app/debug.log" not in paths
+
+
+def test_structure_cache_refresh(tmp_path):
+    """Testa se só os diretórios afetados são relistados, incluindo pastas novas e removidas"""
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "a.py").write_text("")
+    cache = StructureCache(tmp_path)
+    assert cache.entries["app"] == ([], ["a.py"])
+
+    os.makedirs(tmp_path / "docs" / "guia")
+    (tmp_path / "docs" / "guia" / "x.md").write_text("")
+    (tmp_path / "app" / "a.py").unlink()
+    cache.refresh(["docs", "app/a.py"])
+    assert cache.entries["docs/guia"] == ([], ["x.md"])
+    assert cache.entries["app"] == ([], [])
+
+    (tmp_path / "docs" / "guia" / "x.md").unlink()
+    os.rmdir(tmp_path / "docs" / "guia")
+    os.rmdir(tmp_path / "docs")
+    cache.refresh(["docs"])
+    assert "docs" not in cache.entries and "docs/guia" not in cache.entries
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmarks das funções de tools/ contra repositórios git sintéticos
+
+Gera um repositório temporário (via ``git fast-import``, sem um processo por
+commit), mede cada função com repetições e pico de memória via tracemalloc,
+e grava os resultados em JSON para comparar com uma execução anterior.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from tools import runner
+
+
+def _fast_import_stream(commits, branches, files, depth, seed):
+    """Monta o stream do fast-import: histórico linear no main e branches a partir dele"""
+    rnd = random.Random(seed)
+    paths = []
+    for i in range(files):
+        dirs = [f"d{rnd.randrange(4)}" for _ in range(rnd.randrange(depth + 1))]
+        paths.append("/".join(dirs + [f"file{i}.txt"]))
+
+    out = []
+    when = 1_700_000_000
+    mark = 0
+    per_branch = max(1, commits // (branches + 1))
+    main_commits = commits - per_branch * branches
+
+    def commit(ref, parent, n_changes):
+        nonlocal mark, when
+        mark += 1
+        when += rnd.randrange(3600, 86400)
+        message = f"commit {mark}".encode()
+        out.append(f"commit {ref}\nmark :{mark}\n"
+                   f"committer Bench <bench@example.com> {when} +0000\n"
+                   f"data {len(message)}\n".encode() + message + b"\n")
+        if parent:
+            out.append(f"from :{parent}\n".encode())
+        targets = paths if parent is None else rnd.sample(paths, min(n_changes, len(paths)))
+        for path in targets:
+            content = f"{path} {mark} {rnd.random()}\n".encode() * rnd.randrange(1, 20)
+            out.append(f"M 100644 inline {path}\ndata {len(content)}\n".encode() + content + b"\n")
+        out.append(b"\n")
+        return mark
+
+    head = None
+    for _ in range(max(main_commits, 1)):
+        head = commit("refs/heads/main", head, 3)
+    # origin/main alguns commits atrás, para o get_status ter commits locais pendentes
+    out.append(f"reset refs/remotes/origin/main\nfrom :{max(1, head - 5)}\n\n".encode())
+    for b in range(branches):
+        tip = rnd.randrange(1, head + 1)
+        for _ in range(per_branch):
+            tip = commit(f"refs/heads/feature-{b}", tip, 2)
+    return b"".join(out)
+
+
+def generate_repo(path, commits=500, branches=5, files=200, depth=3, seed=42):
+    """Cria um repositório sintético em ``path`` com o working tree no main"""
+    subprocess.run(["git", "init", "-q", "-b", "main", path], check=True)
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, check=True,
+                   input=_fast_import_stream(commits, branches, files, depth, seed))
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=path, check=True)
+    return path
+
+
+@contextlib.contextmanager
+def _cwd(path):
+    old = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+def default_targets(repo):
+    """Funções medidas; todas rodam com o diretório atual no repositório sintético"""
+    from tools import dashboard, repo_info, repo_info_backup
+
+    return {
+        "get_status": dashboard.get_status,
+        "plot_commits": dashboard.commits_per_branch,
+        "plot_commits_weekday": dashboard.commits_per_weekday,
+        "get_repo_size": repo_info.get_repo_size,
+        "get_repo_structure": lambda: repo_info_backup.get_repo_structure(repo),
+    }
+
+
+def measure(func, repeat=5, warmup=1):
+    for _ in range(warmup):
+        func()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    # Memória numa execução separada: o tracemalloc distorce o tempo
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.fmean(times),
+        "peak_kb": peak / 1024,
+        "repeat": repeat,
+        "calls": warmup + repeat + 1,
+    }
+
+
+def run_benchmarks(commits=500, branches=5, files=200, depth=3, repeat=5, only=None):
+    params = {"commits": commits, "branches": branches, "files": files, "depth": depth}
+    with tempfile.TemporaryDirectory(prefix="bench-repo-") as tmp:
+        repo = generate_repo(os.path.join(tmp, "repo"), **params)
+        results = {}
+        with _cwd(repo):
+            for name, func in default_targets(repo).items():
+                if only and name not in only:
+                    continue
+                runner.clear_history()
+                results[name] = measure(func, repeat)
+                results[name]["commands_per_call"] = len(runner.history()) / results[name]["calls"]
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    return {
+        "meta": {"params": params, "python": platform.python_version(), "git": git_version,
+                 "platform": platform.platform(), "date": datetime.now().isoformat()},
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.2):
+    """Lista as funções cujo tempo mínimo piorou mais que ``threshold`` (fração)"""
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base and base["min_s"] > 0:
+            ratio = result["min_s"] / base["min_s"] - 1
+            if ratio > threshold:
+                regressions.append((name, base["min_s"], result["min_s"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de tools/ em repositórios sintéticos")
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--branches", type=int, default=5)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="mede só essas funções")
+    parser.add_argument("--output", default="bench_output.json")
+    parser.add_argument("--compare", help="JSON de uma execução anterior")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="piora relativa tolerada no tempo mínimo (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.commits, args.branches, args.files, args.depth,
+                            args.repeat, args.only)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"⏱️  {report['meta']['params']}")
+    for name, r in report["results"].items():
+        print(f"  {name:<22} min {r['min_s'] * 1000:8.1f} ms  mediana {r['median_s'] * 1000:8.1f} ms"
+              f"  pico {r['peak_kb']:8.1f} KB  {r['commands_per_call']:.0f} comando(s) git")
+    print(f"📄 Resultados em {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        for name, before, after, ratio in regressions:
+            print(f"❌ {name}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms (+{ratio:.0%})")
+        if regressions:
+            return 1
+        print("✅ Sem regressões.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Gerador incremental de bundles de deploy endereçados por conteúdo
+
+Cada build grava um manifesto (caminho -> sha256) e um bundle ``.tar.gz`` com
+apenas os objetos que não existiam no build anterior. O modo ``verify``
+reconstitui a árvore completa a partir do bundle base e dos deltas.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import sys
+import tarfile
+import tempfile
+from datetime import datetime, timezone
+
+from tools.hashing import hash_file, hash_files
+from tools.scanner import IgnoreMatcher, walk
+
+BUNDLE_DIR = ".bundles"
+DEFAULT_SOURCES = ["app", "run.py", "requirements.txt"]
+
+
+def _manifest_path(bundle_dir, build_id):
+    return os.path.join(bundle_dir, "manifests", f"{build_id}.json")
+
+
+def _bundle_path(bundle_dir, build_id):
+    return os.path.join(bundle_dir, f"{build_id}.tar.gz")
+
+
+def collect_files(root=".", sources=DEFAULT_SOURCES):
+    """Lista (relativo, com '/') os arquivos de ``sources`` respeitando o .gitignore"""
+    matcher = IgnoreMatcher.from_gitignore(root)
+    files = []
+    for source in sources:
+        path = os.path.join(root, source)
+        if os.path.isdir(path):
+            for rel, _, names in walk(path, source.rstrip("/"), matcher):
+                files.extend(f"{rel}/{name}" for name in names)
+        elif os.path.isfile(path):
+            files.append(source)
+    return sorted(files)
+
+
+def build_manifest(root=".", sources=DEFAULT_SOURCES, workers=None):
+    files = collect_files(root, sources)
+    hashes = hash_files([os.path.join(root, rel) for rel in files], workers=workers)
+    entries = {}
+    for rel in files:
+        st = os.stat(os.path.join(root, rel))
+        entries[rel] = {
+            "sha256": hashes[os.path.join(root, rel)],
+            "size": st.st_size,
+            "mode": 0o755 if st.st_mode & stat.S_IXUSR else 0o644,
+        }
+    # O id do build é o hash da própria lista: mesma árvore, mesmo id
+    digest = hashlib.sha256(json.dumps(entries, sort_keys=True).encode()).hexdigest()
+    return {"id": digest[:16], "files": entries}
+
+
+def load_manifest(bundle_dir, build_id):
+    with open(_manifest_path(bundle_dir, build_id), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def latest_build(bundle_dir=BUNDLE_DIR):
+    try:
+        with open(os.path.join(bundle_dir, "LATEST"), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def build(root=".", sources=DEFAULT_SOURCES, bundle_dir=BUNDLE_DIR, full=False, workers=None):
+    """Gera o bundle do estado atual e retorna ``(manifesto, caminho_do_bundle, n_objetos)``.
+
+    Sem ``full``, o bundle leva só os objetos ausentes do build anterior.
+    """
+    manifest = build_manifest(root, sources, workers)
+    parent_id = None if full else latest_build(bundle_dir)
+    if not full and os.path.exists(_manifest_path(bundle_dir, manifest["id"])):
+        # Árvore já empacotada antes (ex.: rollback): reaproveita o build existente
+        with open(os.path.join(bundle_dir, "LATEST"), "w", encoding="utf-8") as f:
+            f.write(manifest["id"])
+        return load_manifest(bundle_dir, manifest["id"]), _bundle_path(bundle_dir, manifest["id"]), 0
+
+    known = set()
+    if parent_id:
+        known = set(load_manifest(bundle_dir, parent_id)["known_objects"])
+    manifest["parent"] = parent_id
+    manifest["created"] = datetime.now(timezone.utc).isoformat()
+
+    new_objects = {}
+    for rel, entry in manifest["files"].items():
+        if entry["sha256"] not in known:
+            new_objects.setdefault(entry["sha256"], rel)
+    # Objetos disponíveis na cadeia até aqui, para o próximo delta
+    manifest["known_objects"] = sorted(known | set(new_objects))
+
+    os.makedirs(os.path.join(bundle_dir, "manifests"), exist_ok=True)
+    path = _bundle_path(bundle_dir, manifest["id"])
+    manifest_bytes = json.dumps(manifest, indent=2, sort_keys=True).encode()
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo("manifest.json")
+        info.size = len(manifest_bytes)
+        tar.addfile(info, io.BytesIO(manifest_bytes))
+        for sha, rel in sorted(new_objects.items()):
+            tar.add(os.path.join(root, rel), arcname=f"objects/{sha}", recursive=False)
+
+    with open(_manifest_path(bundle_dir, manifest["id"]), "wb") as f:
+        f.write(manifest_bytes)
+    with open(os.path.join(bundle_dir, "LATEST"), "w", encoding="utf-8") as f:
+        f.write(manifest["id"])
+    return manifest, path, len(new_objects)
+
+
+def reconstitute(build_id, dest, bundle_dir=BUNDLE_DIR):
+    """Monta a árvore completa de ``build_id`` em ``dest`` e retorna a lista de problemas"""
+    manifest = load_manifest(bundle_dir, build_id)
+    chain, current = [], manifest
+    while True:
+        chain.append(current["id"])
+        if not current.get("parent"):
+            break
+        current = load_manifest(bundle_dir, current["parent"])
+
+    wanted = {entry["sha256"] for entry in manifest["files"].values()}
+    objects_dir = os.path.join(dest, ".objects")
+    os.makedirs(objects_dir, exist_ok=True)
+    # Do delta mais novo para o base: cada objeto é extraído uma única vez
+    for bid in chain:
+        with tarfile.open(_bundle_path(bundle_dir, bid), "r:gz") as tar:
+            for member in tar:
+                sha = member.name.split("/", 1)[-1]
+                if member.name.startswith("objects/") and sha in wanted:
+                    with tar.extractfile(member) as src, open(os.path.join(objects_dir, sha), "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+                    wanted.discard(sha)
+
+    problems = [f"objeto ausente na cadeia: {sha}" for sha in sorted(wanted)]
+    for rel, entry in sorted(manifest["files"].items()):
+        obj = os.path.join(objects_dir, entry["sha256"])
+        if not os.path.exists(obj):
+            problems.append(f"{rel}: sem objeto")
+            continue
+        target = os.path.join(dest, *rel.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(obj, target)
+        os.chmod(target, entry["mode"])
+        if hash_file(target) != entry["sha256"]:
+            problems.append(f"{rel}: hash divergente")
+    shutil.rmtree(objects_dir)
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bundles de deploy incrementais")
+    parser.add_argument("--bundle-dir", default=BUNDLE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="gera o bundle (delta) do estado atual")
+    p_build.add_argument("--full", action="store_true", help="ignora o build anterior")
+    p_build.add_argument("--workers", type=int)
+    p_verify = sub.add_parser("verify", help="reconstitui e confere a árvore de um build")
+    p_verify.add_argument("build_id", nargs="?")
+    p_verify.add_argument("--dest", help="mantém a árvore reconstituída neste diretório")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest, path, count = build(bundle_dir=args.bundle_dir, full=args.full, workers=args.workers)
+        size = os.path.getsize(path)
+        print(f"📦 Build {manifest['id']} (base: {manifest.get('parent') or 'nenhuma'})")
+        print(f"   {len(manifest['files'])} arquivo(s), {count} objeto(s) novo(s), "
+              f"bundle {path} com {size / 1024:.1f} KB")
+        return 0
+
+    build_id = args.build_id or latest_build(args.bundle_dir)
+    if not build_id:
+        print("❌ Nenhum build encontrado.")
+        return 1
+    dest = args.dest or tempfile.mkdtemp(prefix="bundle-verify-")
+    problems = reconstitute(build_id, dest, args.bundle_dir)
+    if not args.dest:
+        shutil.rmtree(dest)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print(f"✅ Build {build_id} reconstituído e conferido.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Cache em memória com TTL e atualização em segundo plano
+"""
+import os
+import threading
+import time
+
+from tools import runner
+
+
+def cache_dir(root="."):
+    """Diretório para caches persistentes, dentro do .git para não sujar o working tree"""
+    result = runner.run(["git", "rev-parse", "--git-common-dir"], capture_output=True,
+                        check=False, cwd=root)
+    base = result.stdout.strip() if result.returncode == 0 else ".cache"
+    path = os.path.join(root, base, "dashboard")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class TTLCache:
+    """Guarda valores por ``ttl`` segundos; vencidos são servidos enquanto recarregam.
+
+    ``get`` nunca bloqueia por padrão: sem valor ainda, dispara a carga em
+    segundo plano e retorna ``default``. Erros do loader ficam em ``errors``
+    e também valem por ``error_ttl`` segundos (o ``ttl``, se ``None``): até
+    lá a carga não é refeita, a não ser depois de ``invalidate``.
+    """
+
+    def __init__(self, ttl=60.0, error_ttl=None):
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._values = {}
+        self._loading = {}  # chave -> Event sinalizado quando a carga termina
+        self._failed = {}  # chave -> instante da última falha
+        self._lock = threading.Lock()
+        self.errors = {}
+
+    def _load(self, key, loader):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self.errors[key] = e
+                self._failed[key] = time.monotonic()
+                self._loading.pop(key).set()
+            return
+        with self._lock:
+            self._values[key] = (time.monotonic(), value)
+            self.errors.pop(key, None)
+            self._failed.pop(key, None)
+            self._loading.pop(key).set()
+
+    def _failed_recently(self, key):
+        with self._lock:
+            failed = self._failed.get(key)
+        ttl = self.ttl if self.error_ttl is None else self.error_ttl
+        return failed is not None and time.monotonic() - failed <= ttl
+
+    def _refresh(self, key, loader, wait):
+        with self._lock:
+            done = self._loading.get(key)
+            start = done is None
+            if start:
+                done = self._loading[key] = threading.Event()
+        if start and wait:
+            self._load(key, loader)
+        elif start:
+            threading.Thread(target=self._load, args=(key, loader), daemon=True).start()
+        elif wait:
+            # Já há uma carga em andamento: espera por ela em vez de devolver ``default``
+            done.wait()
+
+    def get(self, key, loader, default=None, wait=False):
+        with self._lock:
+            entry = self._values.get(key)
+        if entry is None:
+            # Falha recente: sem isso cada chamada dispararia uma carga nova
+            if not self._failed_recently(key):
+                self._refresh(key, loader, wait)
+            with self._lock:
+                entry = self._values.get(key)
+            return entry[1] if entry else default
+        if time.monotonic() - entry[0] > self.ttl and not self._failed_recently(key):
+            self._refresh(key, loader, wait=False)
+        return entry[1]
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._values.clear()
+                self._failed.clear()
+            else:
+                self._values.pop(key, None)
+                self._failed.pop(key, None)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Detecção de alterações no working tree a partir do índice do git
+"""
+import re
+import sys
+from collections import Counter, namedtuple
+
+from tools import runner
+
+Change = namedtuple("Change", ["kind", "xy", "path", "orig_path"])
+
+_git_version = None
+
+
+def git_version():
+    global _git_version
+    if _git_version is None:
+        out = runner.run(["git", "--version"], capture_output=True, check=False).stdout or ""
+        match = re.search(r"(\d+)\.(\d+)", out)
+        _git_version = (int(match.group(1)), int(match.group(2))) if match else (0, 0)
+    return _git_version
+
+
+def status_argv():
+    """Monta o ``git status`` mais barato disponível.
+
+    O untracked cache evita reler diretórios sem mudança; o fsmonitor embutido
+    (git >= 2.37, macOS/Windows) evita o stat de todos os arquivos rastreados.
+    Um ``core.fsmonitor`` já configurado no repositório é respeitado pelo git.
+    """
+    argv = ["git", "-c", "core.untrackedCache=true"]
+    if sys.platform in ("darwin", "win32") and git_version() >= (2, 37):
+        configured = runner.run(["git", "config", "--get", "core.fsmonitor"],
+                                capture_output=True, check=False).stdout.strip()
+        if not configured:
+            argv += ["-c", "core.fsmonitor=true"]
+    return argv + ["status", "--porcelain=v2", "-z"]
+
+
+def parse_porcelain_v2(data):
+    """Converte a saída de ``git status --porcelain=v2 -z`` em uma lista de Change"""
+    changes = []
+    tokens = iter(data.split("\0"))
+    for token in tokens:
+        if not token or token.startswith("#"):
+            continue
+        kind = token[0]
+        if kind == "1":
+            fields = token.split(" ", 8)
+            changes.append(Change("modified", fields[1], fields[8], None))
+        elif kind == "2":
+            fields = token.split(" ", 9)
+            # Em -z o caminho de origem vem no token seguinte
+            changes.append(Change("renamed", fields[1], fields[9], next(tokens, None)))
+        elif kind == "u":
+            fields = token.split(" ", 10)
+            changes.append(Change("unmerged", fields[1], fields[10], None))
+        elif kind == "?":
+            changes.append(Change("untracked", "??", token[2:], None))
+        elif kind == "!":
+            changes.append(Change("ignored", "!!", token[2:], None))
+    return changes
+
+
+def get_changes():
+    result = runner.run(status_argv(), capture_output=True)
+    return parse_porcelain_v2(result.stdout)
+
+
+def folder_of(path, depth=1):
+    """Pasta de ``path`` truncada em ``depth`` níveis (arquivos na raiz contam como eles mesmos)"""
+    if path.endswith("/"):
+        dirs = path.rstrip("/").split("/")
+    else:
+        dirs = path.split("/")[:-1]
+    if not dirs:
+        return path
+    return "/".join(dirs[:depth])
+
+
+def count_by_folder(changes, depth=1):
+    """Conta alterações por pasta; renomeações entre pastas contam nas duas"""
+    counter = Counter()
+    for change in changes:
+        folders = {folder_of(change.path, depth)}
+        if change.orig_path:
+            folders.add(folder_of(change.orig_path, depth))
+        counter.update(folders)
+    return counter
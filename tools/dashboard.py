@@ -3,62 +3,143 @@
 Dashboard avançado para gerenciamento do repositório DevOps-Lab-AWS
 """
 import os
+import sys
+import shlex
 import subprocess
-import webbrowser
-import shutil
 from datetime import datetime
 from collections import Counter
-import plotext as plt
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.prompt import Prompt
-from rich import box
-from rich.progress import track, Progress
-from rich.tree import Tree
+
+from app.config import setting
+from tools import runner, validate
+
+# Dependências pesadas (plotext, webbrowser, shutil e a maior parte do rich)
+# são importadas dentro das funções que as usam, para que abrir só a tabela
+# de status não pague o custo de carregar os gráficos e o gerenciador.
 
 console = Console()
-MAIN_BRANCH = "main"
-PASTAS = ["app", "infra", "tests", "docs", ".github/workflows"]
-REPO_URL = "https://github.com/mirelabsp/DevOps-Lab-AWS.git"
+PASTAS = validate.scaffold_dirs()
 
-def run_cmd(cmd, capture_output=False, ignore_errors=False):
-    try:
-        result = subprocess.run(cmd, shell=True, check=True, 
-                              capture_output=capture_output, text=True)
-        return result
-    except subprocess.CalledProcessError as e:
-        if ignore_errors:
-            # Retorna objeto com interface similar ao CompletedProcess
-            class ErrorResult:
-                def __init__(self, e):
-                    self.returncode = e.returncode
-                    self.stdout = e.stdout if hasattr(e, 'stdout') else ""
-                    self.stderr = e.stderr if hasattr(e, 'stderr') else ""
-            return ErrorResult(e)
-        else:
-            raise e
+def run_cmd(cmd, capture_output=False, ignore_errors=False, timeout=None):
+    """Executa um comando (lista argv) via tools.runner, que registra o tempo de cada chamada.
 
-def get_status():
-    changes = run_cmd("git status --porcelain", capture_output=True).stdout.strip()
-    local_commits = run_cmd(f"git log origin/{MAIN_BRANCH}..HEAD --oneline", 
-                           capture_output=True, ignore_errors=True).stdout.strip()
-    remote_commits = run_cmd(f"git log HEAD..origin/{MAIN_BRANCH} --oneline", 
-                            capture_output=True, ignore_errors=True).stdout.strip()
-    local_branches = run_cmd("git branch --format='%(refname:short)'", 
-                            capture_output=True).stdout.strip().splitlines()
-    remote_branches = run_cmd("git branch -r", capture_output=True).stdout.strip().splitlines()
-    last_commits = run_cmd("git log -5 --oneline --decorate", capture_output=True).stdout.strip()
-    return {
-        "changes": changes,
-        "local_commits": local_commits.splitlines() if local_commits else [],
-        "remote_commits": remote_commits.splitlines() if remote_commits else [],
-        "local_branches": local_branches,
-        "remote_branches": [b.strip() for b in remote_branches if '->' not in b],
-        "last_commits": last_commits
-    }
+    Com ``ignore_errors`` retorna o ``CompletedProcess`` mesmo com código de saída != 0.
+    """
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd)
+    return runner.run(cmd, capture_output=capture_output, check=not ignore_errors,
+                      timeout=timeout)
+
+def _get_changes():
+    return run_cmd(["git", "status", "--porcelain"], capture_output=True).stdout.strip()
+
+def _get_local_commits():
+    out = run_cmd(["git", "log", f"origin/{setting('MAIN_BRANCH')}..HEAD", "--oneline"],
+                  capture_output=True, ignore_errors=True).stdout.strip()
+    return out.splitlines() if out else []
+
+def _get_remote_commits():
+    out = run_cmd(["git", "log", f"HEAD..origin/{setting('MAIN_BRANCH')}", "--oneline"],
+                  capture_output=True, ignore_errors=True).stdout.strip()
+    return out.splitlines() if out else []
+
+def _get_local_branches():
+    return run_cmd(["git", "branch", "--format=%(refname:short)"],
+                   capture_output=True).stdout.strip().splitlines()
+
+def _get_remote_branches():
+    remote_branches = run_cmd(["git", "branch", "-r"], capture_output=True).stdout.strip().splitlines()
+    return [b.strip() for b in remote_branches if '->' not in b]
+
+def _get_last_commits():
+    return run_cmd(["git", "log", "-5", "--oneline", "--decorate"], capture_output=True).stdout.strip()
+
+STATUS_FIELDS = {
+    "changes": _get_changes,
+    "local_commits": _get_local_commits,
+    "remote_commits": _get_remote_commits,
+    "local_branches": _get_local_branches,
+    "remote_branches": _get_remote_branches,
+    "last_commits": _get_last_commits,
+}
+
+class StatusRecord:
+    """Status do repositório; campos que não foram calculados ficam ausentes.
+
+    Aceita ``status["campo"]`` e ``"campo" in status`` como o dict de antes.
+    """
+    __slots__ = tuple(STATUS_FIELDS)
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __contains__(self, name):
+        return name in self.__slots__ and hasattr(self, name)
+
+    def __eq__(self, other):
+        return isinstance(other, StatusRecord) and not self.changed(other)
+
+    def __repr__(self):
+        return f"StatusRecord({', '.join(f'{n}={getattr(self, n)!r}' for n in self.fields())})"
+
+    def fields(self):
+        return [name for name in self.__slots__ if hasattr(self, name)]
+
+    def update(self, other):
+        for name in other.fields():
+            setattr(self, name, getattr(other, name))
+
+    def copy(self):
+        return StatusRecord(**{name: getattr(self, name) for name in self.fields()})
+
+    def changed(self, other):
+        """Campos cujo valor difere entre os dois registros"""
+        missing = object()
+        return {name for name in self.__slots__
+                if getattr(self, name, missing) != getattr(other, name, missing)}
+
+def get_status(fields=None):
+    """Calcula os campos de status pedidos (todos, por padrão)"""
+    return StatusRecord(**{name: STATUS_FIELDS[name]() for name in (fields or STATUS_FIELDS)})
+
+def record_status(status):
+    """Guarda no histórico de métricas um snapshot do status completo"""
+    from tools import metrics_history
+
+    metrics_history.record(changes=len(status["changes"].splitlines()),
+                           **{name: len(status[name])
+                              for name in ("local_commits", "remote_commits", "local_branches")})
+
+def fields_for_paths(paths):
+    """Campos de status afetados por alterações nos caminhos (relativos à raiz) informados"""
+    fields = set()
+    for path in paths:
+        if path == ".":
+            return set(STATUS_FIELDS)
+        if not path.startswith(".git/"):
+            fields.add("changes")
+        elif path == ".git/index":
+            fields.add("changes")
+        elif path.startswith(".git/refs/remotes/") or path in (".git/packed-refs", ".git/FETCH_HEAD"):
+            fields.update(["local_commits", "remote_commits", "remote_branches", "last_commits"])
+        else:
+            # HEAD, refs/heads, ORIG_HEAD...: checkout, commit, reset
+            fields.update(["changes", "local_commits", "remote_commits", "local_branches",
+                           "last_commits"])
+    return fields
 
 def draw_dashboard(status):
+    from rich import box
+    from rich.panel import Panel
+    from rich.table import Table
+
     table = Table(title="📊 STATUS DO REPOSITÓRIO", box=box.DOUBLE_EDGE)
     table.add_column("Item", style="cyan", no_wrap=True)
     table.add_column("Status", style="magenta")
@@ -73,7 +154,49 @@ def draw_dashboard(status):
                          title="📝 Últimos 5 commits", style="blue")
     return table, panel_commits
 
+def draw_inventory(inventory):
+    from rich.panel import Panel
+    from rich.table import Table
+
+    table = Table(box=None, expand=True)
+    table.add_column("Recurso", style="cyan")
+    table.add_column("Detalhes", style="magenta")
+    for name, value in inventory["outputs"].items():
+        table.add_row(f"output {name}", str(value))
+    for key, titulo in (("instances", "EC2"), ("security_groups", "Security group")):
+        items = inventory[key]
+        if key in inventory["errors"]:
+            table.add_row(titulo, f"[red]indisponível: {inventory['errors'][key]}[/red]")
+        elif items is None:
+            table.add_row(titulo, "[dim]carregando...[/dim]")
+        elif not items:
+            table.add_row(titulo, "[dim]nenhum[/dim]")
+        for item in items or []:
+            if key == "instances":
+                detalhes = f"{item['id']} {item['type']} {item['state']} {item['public_ip']}"
+            else:
+                detalhes = f"{item['id']} portas {', '.join(map(str, item['ingress_ports'])) or '-'}"
+            table.add_row(f"{titulo} {item['name']}", detalhes)
+    return Panel(table, title="☁️ Inventário AWS", style="blue")
+
+def mostrar_drift():
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+
+    from tools import tfstate
+
+    plan = Prompt.ask("Plano JSON (terraform show -json), vazio para só comparar config e state",
+                      default="")
+    try:
+        summary = tfstate.drift_summary(plan_path=plan or None)
+        console.print(Panel(tfstate.format_summary(summary), title="🏗️ Drift do Terraform", style="cyan"))
+    except (OSError, ValueError) as e:
+        console.print(f"❌ Erro ao ler state/plano: {e}", style="red")
+
 def criar_pastas():
+    from rich.panel import Panel
+    from rich.progress import track
+
     for pasta in track(PASTAS, description="Criando/atualizando pastas..."):
         os.makedirs(pasta, exist_ok=True)
         gitkeep = os.path.join(pasta, ".gitkeep")
@@ -82,6 +205,9 @@ def criar_pastas():
     console.print(Panel("📂 Estrutura de pastas criada/atualizada.", style="green"))
 
 def organizar_estrutura():
+    import shutil
+    from rich.panel import Panel
+
     console.print(Panel("🔄 Organizando estrutura do projeto...", style="cyan"))
     
     duplicate_path = "DevOps-Lab-AWS/DevOps-Lab-AWS"
@@ -100,9 +226,11 @@ def organizar_estrutura():
             shutil.move(test_file, "tests/")
         except Exception as e:
             console.print(f"❌ Erro ao mover {test_file}: {e}", style="red")
-    
+
+    limpar_duplicados()
+
     console.print("Criando estrutura de diretórios...")
-    for pasta in [".github/workflows", "docs", "app", "infra", "tests", "tools"]:
+    for pasta in PASTAS:
         gitkeep_path = os.path.join(pasta, ".gitkeep")
         os.makedirs(pasta, exist_ok=True)
         if not os.path.exists(gitkeep_path):
@@ -113,7 +241,40 @@ def organizar_estrutura():
     
     console.print(Panel("✅ Estrutura organizada com sucesso!", style="green"))
 
+def limpar_duplicados(root="."):
+    from rich.prompt import Prompt
+    from rich.table import Table
+    from tools import duplicates
+
+    console.print("Procurando arquivos duplicados...")
+    files = list(duplicates.iter_files(root))
+    acoes = duplicates.plan_cleanup(duplicates.find_duplicates(root, files=files),
+                                    duplicates.find_near_duplicates(root, files=files))
+    if not acoes:
+        console.print("Nenhum duplicado encontrado.")
+        return
+
+    table = Table(title="🧹 Duplicados", show_lines=False)
+    table.add_column("Manter", style="green")
+    table.add_column("Remover", style="red")
+    table.add_column("Motivo")
+    for manter, remover, motivo in acoes:
+        table.add_row(manter, "\n".join(remover), motivo)
+    console.print(table)
+
+    alvos = [path for _, remover, _ in acoes for path in remover]
+    if Prompt.ask(f"Remover {len(alvos)} arquivo(s)?", choices=["s", "n"], default="n") != "s":
+        return
+    for path in alvos:
+        try:
+            os.remove(os.path.join(root, path))
+            console.print(f"🗑️ {path} removido")
+        except Exception as e:
+            console.print(f"❌ Erro ao remover {path}: {e}", style="red")
+
 def atualizar_readme():
+    from rich.panel import Panel
+
     conteudo = f"""# DevOps Lab AWS
 Projeto laboratorial integrando GitHub, Docker, Terraform, Jenkins e Postman.
 
@@ -129,6 +290,8 @@ Projeto laboratorial integrando GitHub, Docker, Terraform, Jenkins e Postman.
         console.print(f"❌ Erro ao atualizar README: {e}", style="red")
 
 def atualizar_gitignore():
+    from rich.panel import Panel
+
     conteudo = """__pycache__/
 *.py[cod]
 *.egg-info/
@@ -152,24 +315,26 @@ Thumbs.db
         console.print(f"❌ Erro ao atualizar .gitignore: {e}", style="red")
 
 def sync_repo():
+    from rich.prompt import Prompt
+
     try:
-        run_cmd(f"git checkout {MAIN_BRANCH}")
+        run_cmd(["git", "checkout", setting("MAIN_BRANCH")])
     except subprocess.CalledProcessError as e:
         console.print(f"❌ Erro ao fazer checkout: {e}", style="red")
         return
     
-    changes = run_cmd("git status --porcelain", capture_output=True).stdout.strip()
+    changes = run_cmd(["git", "status", "--porcelain"], capture_output=True).stdout.strip()
     stash_created = False
     
     if changes:
         if Prompt.ask("Existem alterações não commitadas. Criar stash?", choices=["s","n"], default="s") == "s":
-            stash_result = run_cmd("git stash", capture_output=True, ignore_errors=True)
+            stash_result = run_cmd(["git", "stash"], capture_output=True, ignore_errors=True)
             if "No local changes to save" not in stash_result.stdout:
                 stash_created = True
                 console.print("📦 Alterações guardadas no stash.", style="yellow")
     
     try:
-        run_cmd(f"git pull origin {MAIN_BRANCH} --rebase")
+        run_cmd(["git", "pull", "origin", setting("MAIN_BRANCH"), "--rebase"])
         console.print("✅ Pull concluído.", style="green")
     except subprocess.CalledProcessError as e:
         console.print(f"❌ Conflito detectado! Resolva manualmente: {e}", style="red")
@@ -177,19 +342,21 @@ def sync_repo():
     
     if stash_created:
         if Prompt.ask("Aplicar stash de volta?", choices=["s","n"], default="s") == "s":
-            stash_result = run_cmd("git stash pop", capture_output=True, ignore_errors=True)
+            stash_result = run_cmd(["git", "stash", "pop"], capture_output=True, ignore_errors=True)
             if stash_result.returncode == 0:
                 console.print("📦 Stash aplicado.", style="yellow")
             else:
                 console.print("❌ Erro ao aplicar stash.", style="red")
 
 def commit_changes():
-    changes = run_cmd("git status --porcelain", capture_output=True).stdout.strip()
+    from rich.prompt import Prompt
+
+    changes = run_cmd(["git", "status", "--porcelain"], capture_output=True).stdout.strip()
     if changes:
         msg = Prompt.ask("Digite a mensagem do commit")
         try:
-            run_cmd("git add .")
-            run_cmd(f'git commit -m "{msg}"')
+            run_cmd(["git", "add", "."])
+            run_cmd(["git", "commit", "-m", msg])
             console.print("✅ Commit realizado!", style="green")
         except subprocess.CalledProcessError as e:
             console.print(f"❌ Erro ao fazer commit: {e}", style="red")
@@ -197,8 +364,11 @@ def commit_changes():
         console.print("✅ Nenhuma alteração para commitar.", style="green")
 
 def criar_branch_e_pr():
-    changes = run_cmd("git status --porcelain", capture_output=True).stdout.strip()
-    local_commits = run_cmd(f"git log origin/{MAIN_BRANCH}..HEAD --oneline", 
+    import webbrowser
+    from rich.panel import Panel
+
+    changes = run_cmd(["git", "status", "--porcelain"], capture_output=True).stdout.strip()
+    local_commits = run_cmd(["git", "log", f"origin/{setting('MAIN_BRANCH')}..HEAD", "--oneline"],
                            capture_output=True, ignore_errors=True).stdout.strip()
     if changes or local_commits:
         console.print("❌ Não é seguro criar branch/PR. Commit e push primeiro.", style="red")
@@ -206,13 +376,13 @@ def criar_branch_e_pr():
     
     branch_name = f"feature/auto-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
     try:
-        run_cmd(f"git checkout -b {branch_name}")
-        run_cmd("git add .")
-        run_cmd(f'git commit -m "chore: atualização automática em {branch_name}"')
-        run_cmd(f"git push origin {branch_name}")
+        run_cmd(["git", "checkout", "-b", branch_name])
+        run_cmd(["git", "add", "."])
+        run_cmd(["git", "commit", "-m", f"chore: atualização automática em {branch_name}"])
+        run_cmd(["git", "push", "origin", branch_name])
         
-        user_repo = REPO_URL.replace("https://github.com/", "").replace(".git", "")
-        pr_url = f"https://github.com/{user_repo}/compare/{MAIN_BRANCH}...{branch_name}?expand=1"
+        user_repo = setting("REPO_URL").replace("https://github.com/", "").replace(".git", "")
+        pr_url = f"https://github.com/{user_repo}/compare/{setting('MAIN_BRANCH')}...{branch_name}?expand=1"
         console.print(Panel(f"🔗 PR disponível: {pr_url}", style="cyan"))
         webbrowser.open(pr_url)
     except subprocess.CalledProcessError as e:
@@ -228,7 +398,7 @@ def sync_commits():
             console.print(f"  - {commit}", style="yellow")
         
         try:
-            run_cmd(f"git push origin {MAIN_BRANCH}")
+            run_cmd(["git", "push", "origin", setting("MAIN_BRANCH")])
             console.print("✅ Commits locais enviados com sucesso!", style="green")
         except subprocess.CalledProcessError as e:
             console.print(f"❌ Erro ao enviar commits locais: {e}", style="red")
@@ -240,7 +410,7 @@ def sync_commits():
             console.print(f"  - {commit}", style="yellow")
         
         try:
-            run_cmd(f"git pull origin {MAIN_BRANCH} --rebase")
+            run_cmd(["git", "pull", "origin", setting("MAIN_BRANCH"), "--rebase"])
             console.print("✅ Commits remotos aplicados com sucesso!", style="green")
         except subprocess.CalledProcessError as e:
             console.print(f"❌ Erro ao aplicar commits remotos: {e}", style="red")
@@ -248,17 +418,29 @@ def sync_commits():
     
     return success
 
+def commits_per_branch():
+    branches = run_cmd(["git", "branch", "--format=%(refname:short)"],
+                      capture_output=True).stdout.strip().splitlines()
+    commits_count = []
+    for b in branches:
+        result = run_cmd(["git", "rev-list", "--count", b],
+                       capture_output=True, ignore_errors=True)
+        count = result.stdout.strip()
+        commits_count.append(int(count) if count.isdigit() else 0)
+    return branches, commits_count
+
+def commits_per_weekday():
+    result = run_cmd(["git", "log", "--pretty=%cd", "--date=format:%a"],
+                   capture_output=True, ignore_errors=True)
+    counter = Counter(result.stdout.strip().splitlines())
+    dias = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    return dias, [counter.get(d, 0) for d in dias]
+
 def plot_commits():
+    import plotext as plt
+
     try:
-        branches = run_cmd("git branch --format='%(refname:short)'", 
-                          capture_output=True).stdout.strip().splitlines()
-        commits_count = []
-        for b in branches:
-            result = run_cmd(f"git rev-list --count {b}", 
-                           capture_output=True, ignore_errors=True)
-            count = result.stdout.strip()
-            commits_count.append(int(count) if count.isdigit() else 0)
-        
+        branches, commits_count = commits_per_branch()
         plt.clear_data()
         plt.bar(branches, commits_count, color="cyan")
         plt.title("📊 Commits por Branch")
@@ -268,14 +450,10 @@ def plot_commits():
     input("Pressione Enter para voltar ao menu...")
 
 def plot_commits_weekday():
+    import plotext as plt
+
     try:
-        result = run_cmd("git log --pretty=%cd --date=format:'%a'", 
-                       capture_output=True, ignore_errors=True)
-        logs = result.stdout.strip().splitlines()
-        counter = Counter(logs)
-        dias = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        counts = [counter.get(d, 0) for d in dias]
-        
+        dias, counts = commits_per_weekday()
         plt.clear_data()
         plt.bar(dias, counts, color="magenta")
         plt.title("📈 Commits por Dia da Semana")
@@ -284,23 +462,21 @@ def plot_commits_weekday():
         console.print(f"❌ Erro ao gerar gráfico: {e}", style="red")
     input("Pressione Enter para voltar ao menu...")
 
-def plot_changes_per_folder():
+def plot_changes_per_folder(depth=None):
+    import plotext as plt
+    from rich.prompt import IntPrompt
+
+    from tools import changes
+
     try:
-        result = run_cmd("git status --porcelain", capture_output=True)
-        status_lines = result.stdout.strip().splitlines()
-        folders = []
-        for line in status_lines:
-            if len(line) > 3:
-                path = line[3:]
-                if "/" in path:
-                    folders.append(path.split("/")[0])
-                else:
-                    folders.append(path)
-        
-        counter = Counter(folders)
+        if depth is None:
+            depth = IntPrompt.ask("Profundidade das pastas", default=1)
+        counter = changes.count_by_folder(changes.get_changes(), depth=max(depth, 1))
         if counter:
+            autoria = _carregar_autoria()
+            labels = [_com_dono(pasta, pasta, autoria, markup=False) for pasta in counter]
             plt.clear_data()
-            plt.bar(list(counter.keys()), list(counter.values()), color="yellow")
+            plt.bar(labels, list(counter.values()), color="yellow")
             plt.title("📂 Alterações por Pasta")
             plt.show()
         else:
@@ -309,8 +485,68 @@ def plot_changes_per_folder():
         console.print(f"❌ Erro ao gerar gráfico: {e}", style="red")
     input("Pressione Enter para voltar ao menu...")
 
+def _carregar_autoria():
+    """Mapa de autoria (git blame em cache); ``None`` fora de um repositório git"""
+    from tools import ownership
+
+    try:
+        with console.status("Calculando autoria (git blame)..."):
+            return ownership.get_ownership()
+    except Exception:
+        return None
+
+def _com_dono(nome, path, autoria, markup=True):
+    """Acrescenta ao rótulo o principal autor do arquivo/pasta, se conhecido"""
+    rel = os.path.relpath(path).replace(os.sep, "/")
+    dono = autoria.label(rel) if autoria else ""
+    if not dono:
+        return nome
+    if not markup:
+        return f"{nome} ({dono})"
+    from rich.markup import escape
+
+    # Nomes do git blame podem ter colchetes, que o Rich leria como markup
+    return f"{nome} [dim]({escape(dono)})[/dim]"
+
+def plot_metrics_history(field=None, hours=None):
+    import time
+    import plotext as plt
+    from rich.prompt import FloatPrompt, Prompt
+
+    from tools import metrics_history
+
+    path = metrics_history.history_path()
+    if not path or not os.path.exists(path):
+        console.print("ℹ️  Nenhum histórico gravado ainda.", style="yellow")
+        input("Pressione Enter para voltar ao menu...")
+        return
+    field = field or Prompt.ask("Métrica", choices=list(metrics_history.FIELDS), default="changes")
+    hours = hours or FloatPrompt.ask("Últimas quantas horas", default=24.0 * 7)
+    try:
+        now = time.time()
+        with metrics_history.MetricsHistory(path) as history:
+            points = history.series(field, start=now - hours * 3600, max_points=500)
+        if points:
+            plt.clear_data()
+            plt.plot([(ts - now) / 3600 for ts, _ in points], [value for _, value in points],
+                     color="cyan", marker="braille")
+            plt.title(f"📈 {field} nas últimas {hours:g} h")
+            plt.xlabel("horas atrás")
+            plt.show()
+        else:
+            console.print("ℹ️  Sem dados no período.", style="yellow")
+    except Exception as e:
+        console.print(f"❌ Erro ao gerar gráfico: {e}", style="red")
+    input("Pressione Enter para voltar ao menu...")
+
 def gerenciador_arquivos():
+    import shutil
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from rich.tree import Tree
+
     current_dir = os.getcwd()
+    autoria = _carregar_autoria()
     
     while True:
         console.clear()
@@ -318,30 +554,21 @@ def gerenciador_arquivos():
         
         try:
             tree = Tree("📦 Estrutura de Pastas")
+            nodes = {".": tree}
             for root, dirs, files in os.walk(current_dir):
                 if '.git' in root.split(os.sep):
                     continue
-                    
-                current_node = tree
+
                 rel_path = os.path.relpath(root, current_dir)
-                if rel_path == '.':
-                    current_node = tree
-                else:
-                    parts = rel_path.split(os.sep)
-                    for part in parts:
-                        found = False
-                        for child in current_node.children:
-                            if str(child.label) == part:
-                                current_node = child
-                                found = True
-                                break
-                        if not found:
-                            new_node = current_node.add(part)
-                            current_node = new_node
-                
+                if rel_path not in nodes:
+                    # os.walk visita a pasta mãe antes das filhas
+                    parent = nodes.get(os.path.dirname(rel_path) or ".", tree)
+                    nodes[rel_path] = parent.add(_com_dono(os.path.basename(rel_path), root, autoria))
+                current_node = nodes[rel_path]
+
                 for file in files:
                     if not file.startswith('.'):
-                        current_node.add(f"📄 {file}")
+                        current_node.add(_com_dono(f"📄 {file}", os.path.join(root, file), autoria))
             
             console.print(tree)
         except Exception as e:
@@ -444,73 +671,285 @@ def gerenciador_arquivos():
         elif escolha == "0":
             break
 
-def mega_dashboard():
-    while True:
-        console.clear()
+def build_tree(structure):
+    """Monta a árvore do rich a partir de um tools.scanner.StructureCache"""
+    from rich.tree import Tree
+
+    tree = Tree("📦 Estrutura de Pastas")
+
+    def add(node, rel):
+        dirs, files = structure.entries.get(rel, ([], []))
+        for d in dirs:
+            add(node.add(d), d if rel == "." else f"{rel}/{d}")
+        for f in files:
+            node.add(f"📄 {f}")
+
+    add(tree, ".")
+    return tree
+
+def modo_ao_vivo(alt_screen=True):
+    """Mantém status e árvore atualizados a cada alteração, sem recalcular o resto"""
+    import threading
+    import time
+
+    from tools.render import FrameRenderer
+    from tools.scanner import StructureCache
+    from tools.watcher import create_watcher
+
+    status = get_status()
+    structure = StructureCache(os.getcwd())
+    lock = threading.Lock()
+
+    def draw(renderer):
+        table, panel_commits = draw_dashboard(status)
+        footer = (f"[dim]Observando alterações... Ctrl+C para voltar "
+                  f"(último quadro: {renderer.last_bytes} bytes, "
+                  f"{renderer.savings():.0%} economizado)[/dim]")
+        renderer.draw(table, panel_commits, build_tree(structure), footer)
+
+    with FrameRenderer(console, alt_screen=alt_screen) as renderer:
+        def on_change(paths):
+            with lock:
+                before, tree_before = status.copy(), dict(structure.entries)
+                try:
+                    status.update(get_status(fields_for_paths(paths)))
+                except Exception as e:
+                    console.log(f"❌ Erro ao atualizar status: {e}")
+                    renderer.invalidate()
+                structure.refresh([p for p in paths if p != ".git" and not p.startswith(".git/")])
+                # Eventos que não mudam nada visível (ex.: só o índice do git) não redesenham
+                if status.changed(before) or structure.entries != tree_before:
+                    draw(renderer)
+
+        draw(renderer)
+        watcher = create_watcher(os.getcwd(), on_change).start()
         try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.stop()
+
+MENU = [
+    ("1", "Sincronizar repositório"),
+    ("2", "Criar/Atualizar pastas"),
+    ("3", "Organizar estrutura do projeto"),
+    ("4", "Atualizar README.md"),
+    ("5", "Atualizar .gitignore"),
+    ("6", "Commit alterações"),
+    ("7", "Criar branch + PR"),
+    ("8", "Sincronizar commits (push/pull)"),
+    ("9", "Gráfico: commits por branch"),
+    ("10", "Gráfico: commits por dia da semana"),
+    ("11", "Gráfico: alterações por pasta"),
+    ("12", "Gerenciador de arquivos"),
+    ("13", "Comandos git mais lentos"),
+    ("14", "Modo ao vivo (atualiza a cada alteração)"),
+    ("15", "Inventário AWS"),
+    ("16", "Drift do Terraform"),
+    ("17", "Objetos grandes e packs"),
+    ("18", "Buscar commits e arquivos"),
+    ("19", "Gráfico: histórico de métricas"),
+    ("0", "Sair"),
+]
+
+def mega_dashboard():
+    from rich.markup import escape
+    from rich.prompt import Prompt
+
+    from tools.render import FrameRenderer
+
+    menu = ["", "Menu:"] + [escape(f"[{key}] {label}") for key, label in MENU]
+    with FrameRenderer(console) as renderer:
+        while True:
+            frame = []
+            try:
+                status = get_status()
+                record_status(status)
+                frame.extend(draw_dashboard(status))
+            except Exception as e:
+                frame.append(f"[red]❌ Erro ao carregar status: {escape(str(e))}[/red]")
+            if os.path.exists(os.path.join("infra", "terraform.tfstate")):
+                from tools import inventory
+                # Só lê o cache: a consulta à AWS roda em segundo plano
+                frame.append(draw_inventory(inventory.get_inventory()))
+            # Só as linhas que mudaram desde o quadro anterior vão para o terminal
+            renderer.draw(*frame, *menu)
+
+            try:
+                escolha = Prompt.ask("Escolha a ação", choices=[key for key, _ in MENU], default="0")
+            except KeyboardInterrupt:
+                console.print("\n👋 Saindo...", style="yellow")
+                break
+            if escolha in ("12", "14"):
+                # Gerenciador e modo ao vivo redesenham a tela a partir do topo
+                renderer.invalidate()
+            
+            if escolha == "1":
+                sync_repo()
+            elif escolha == "2":
+                criar_pastas()
+            elif escolha == "3":
+                organizar_estrutura()
+            elif escolha == "4":
+                atualizar_readme()
+            elif escolha == "5":
+                atualizar_gitignore()
+            elif escolha == "6":
+                commit_changes()
+            elif escolha == "7":
+                criar_branch_e_pr()
+            elif escolha == "8":
+                sync_commits()
+            elif escolha == "9":
+                plot_commits()
+            elif escolha == "10":
+                plot_commits_weekday()
+            elif escolha == "11":
+                plot_changes_per_folder()
+            elif escolha == "12":
+                gerenciador_arquivos()
+            elif escolha == "13":
+                show_trace()
+            elif escolha == "14":
+                modo_ao_vivo(alt_screen=False)
+            elif escolha == "15":
+                from tools import inventory
+                with console.status("Consultando AWS..."):
+                    inventory.cache.invalidate()
+                    console.print(draw_inventory(inventory.get_inventory(wait=True)))
+            elif escolha == "16":
+                mostrar_drift()
+            elif escolha == "17":
+                from tools import repo_info
+                with console.status("Analisando objetos..."):
+                    report = repo_info.analyze()
+                repo_info.print_analysis(report)
+            elif escolha == "18":
+                buscar()
+            elif escolha == "19":
+                plot_metrics_history()
+            elif escolha == "0":
+                console.print("👋 Saindo...", style="yellow")
+                break
+        
+            input("\nPressione Enter para continuar...")
+            # Se a saída da ação não rolou a tela, o quadro anterior continua aproveitável
+            renderer.settle()
+
+def buscar():
+    import time
+    from rich.prompt import Prompt
+    from rich.table import Table
+    from tools import search
+
+    query = Prompt.ask("Buscar (prefixe com 're:' para regex)")
+    regex = query.startswith("re:")
+    index = search.SearchIndex()
+    try:
+        with console.status("Atualizando índice..."):
+            index.update()
+        t0 = time.perf_counter()
+        hits = index.search(query[3:] if regex else query, regex=regex)
+    except Exception as e:
+        console.print(f"❌ Erro na busca: {e}", style="red")
+        return
+    finally:
+        index.close()
+
+    table = Table(title=f"🔎 {len(hits)} resultado(s) em {(time.perf_counter() - t0) * 1000:.1f} ms")
+    table.add_column("Tipo", style="cyan")
+    table.add_column("Referência", style="magenta")
+    table.add_column("Trecho")
+    for hit in hits:
+        ref = f"{hit.ref[:10]} {hit.info}" if hit.kind == "commit" else hit.ref
+        table.add_row(hit.kind, ref, hit.snippet)
+    console.print(table)
+
+def show_trace(n=10):
+    from rich.table import Table
+
+    table = Table(title=f"🐢 Comandos mais lentos (últimos {len(runner.history())} registrados)")
+    table.add_column("Tempo (ms)", justify="right", style="magenta")
+    table.add_column("Saída", justify="right")
+    table.add_column("Código", justify="right")
+    table.add_column("Comando", style="cyan")
+    for record in runner.slowest(n):
+        code = "timeout" if record.timed_out else str(record.returncode)
+        size = "-" if record.output_bytes is None else f"{record.output_bytes} B"
+        table.add_row(f"{record.duration * 1000:.1f}", size, code,
+                      " ".join(record.argv))
+    console.print(table)
+
+def startup_profile(module="tools.dashboard", top=15):
+    """Mede o custo de importação (estilo -X importtime) de um módulo.
+
+    Executa um interpretador novo, para medir a partida a frio, e retorna
+    ``(total_ms, [(cumulativo_ms, proprio_ms, modulo), ...])`` ordenado pelo
+    custo cumulativo.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    entries = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entry = (int(cumulative_us) / 1000, int(self_us) / 1000, name.rstrip())
+        if entry[2].strip() == module:
+            total_ms = entry[0]
+        entries.append(entry)
+    entries.sort(reverse=True)
+    return total_ms, entries[:top]
+
+def show_startup_profile():
+    from rich.table import Table
+
+    total_ms, entries = startup_profile()
+    budget_ms = setting("DASHBOARD_STARTUP_BUDGET_MS")
+    table = Table(title=f"⏱️ Importação de tools.dashboard: {total_ms:.1f} ms "
+                        f"(orçamento {budget_ms:.0f} ms)")
+    table.add_column("Cumulativo (ms)", justify="right", style="magenta")
+    table.add_column("Próprio (ms)", justify="right")
+    table.add_column("Módulo", style="cyan")
+    for cumulative_ms, self_ms, name in entries:
+        table.add_row(f"{cumulative_ms:.1f}", f"{self_ms:.1f}", name)
+    console.print(table)
+    return total_ms <= budget_ms
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dashboard do repositório DevOps-Lab-AWS")
+    parser.add_argument("--status", action="store_true",
+                        help="mostra apenas a tabela de status e sai")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="mostra o custo de importação dos módulos na partida")
+    parser.add_argument("--trace", action="store_true",
+                        help="ao sair, lista os comandos git mais lentos executados")
+    args = parser.parse_args(argv)
+
+    if args.startup_profile:
+        return 0 if show_startup_profile() else 1
+    try:
+        if args.status:
             status = get_status()
+            record_status(status)
             table, panel_commits = draw_dashboard(status)
             console.print(table)
             console.print(panel_commits)
-        except Exception as e:
-            console.print(f"❌ Erro ao carregar status: {e}", style="red")
-        
-        console.print("\nMenu:")
-        console.print("[1] Sincronizar repositório")
-        console.print("[2] Criar/Atualizar pastas")
-        console.print("[3] Organizar estrutura do projeto")
-        console.print("[4] Atualizar README.md")
-        console.print("[5] Atualizar .gitignore")
-        console.print("[6] Commit alterações")
-        console.print("[7] Criar branch + PR")
-        console.print("[8] Sincronizar commits (push/pull)")
-        console.print("[9] Gráfico: commits por branch")
-        console.print("[10] Gráfico: commits por dia da semana")
-        console.print("[11] Gráfico: alterações por pasta")
-        console.print("[12] Gerenciador de arquivos")
-        console.print("[0] Sair")
-        
-        try:
-            escolha = Prompt.ask("Escolha a ação", 
-                               choices=["1", "2", "3", "4", "5", "6", "7", "8", "9", "10", "11", "12", "0"], 
-                               default="0")
-        except KeyboardInterrupt:
-            console.print("\n👋 Saindo...", style="yellow")
-            break
-            
-        if escolha == "1": 
-            sync_repo()
-        elif escolha == "2": 
-            criar_pastas()
-        elif escolha == "3": 
-            organizar_estrutura()
-        elif escolha == "4": 
-            atualizar_readme()
-        elif escolha == "5": 
-            atualizar_gitignore()
-        elif escolha == "6": 
-            commit_changes()
-        elif escolha == "7": 
-            criar_branch_e_pr()
-        elif escolha == "8": 
-            sync_commits()
-        elif escolha == "9": 
-            plot_commits()
-        elif escolha == "10": 
-            plot_commits_weekday()
-        elif escolha == "11": 
-            plot_changes_per_folder()
-        elif escolha == "12": 
-            gerenciador_arquivos()
-        elif escolha == "0":
-            console.print("👋 Saindo...", style="yellow")
-            break
-        
-        input("\nPressione Enter para continuar...")
+        else:
+            mega_dashboard()
+    finally:
+        if args.trace:
+            show_trace()
+    return 0
 
 if __name__ == "__main__":
     try:
-        mega_dashboard()
+        sys.exit(main())
     except KeyboardInterrupt:
         console.print("\n👋 Programa interrompido pelo usuário", style="yellow")
     except Exception as e:
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Detecção de arquivos duplicados e quase duplicados no repositório
+
+As duplicatas exatas são filtradas em etapas: primeiro por tamanho (só um
+``lstat``), depois pelo hash dos primeiros bytes e só então pelo hash completo,
+ambos via mmap em um pool de processos. O modo de quase duplicatas compara
+arquivos-fonte por MinHash sobre trechos de linhas normalizadas, com LSH para
+não comparar todos os pares.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from tools.hashing import PARALLEL_MIN_FILES, hash_files
+from tools.scanner import scan_structure
+
+# Bytes lidos na etapa de hash parcial
+PARTIAL_BYTES = 64 * 1024
+SOURCE_EXTENSIONS = {".py", ".sh", ".tf", ".yml", ".yaml", ".json", ".md", ".txt", ".cfg", ".ini", ".js"}
+# Nomes que indicam cópia antiga: na limpeza, são os primeiros a sair
+STALE_RE = re.compile(r"(_backup|_corrupted|_old|_copy|\.bak|\.orig| \(\d+\)|~)(\.\w+)?$", re.IGNORECASE)
+
+SHINGLE_LINES = 3
+NUM_PERM = 64
+BANDS = 16
+_MERSENNE = (1 << 61) - 1
+_rnd = random.Random(1)
+_PERMS = [(_rnd.randrange(1, _MERSENNE), _rnd.randrange(_MERSENNE)) for _ in range(NUM_PERM)]
+
+
+def iter_files(root):
+    """Gera ``(caminho_relativo, tamanho)`` dos arquivos visíveis, respeitando o .gitignore"""
+    for rel, _, files in scan_structure(root):
+        base = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+        for name in files:
+            try:
+                st = os.lstat(os.path.join(root, base, name))
+            except OSError:
+                continue
+            yield base + name, st.st_size
+
+
+def find_duplicates(root=".", min_size=1, workers=None, files=None):
+    """Grupos de arquivos com conteúdo idêntico, do que mais desperdiça espaço ao que menos"""
+    by_size = defaultdict(list)
+    for rel, size in files if files is not None else iter_files(root):
+        if size >= min_size:
+            by_size[size].append(rel)
+    candidates = {rel: size for size, paths in by_size.items() if len(paths) > 1 for rel in paths}
+
+    def split_by_hash(paths, limit):
+        hashes = hash_files([os.path.join(root, p) for p in paths], limit=limit, workers=workers)
+        groups = defaultdict(list)
+        for rel, digest in zip(paths, hashes.values()):
+            if digest is not None:
+                groups[(candidates[rel], digest)].append(rel)
+        return [g for g in groups.values() if len(g) > 1]
+
+    groups = []
+    for group in split_by_hash(sorted(candidates), PARTIAL_BYTES):
+        # Arquivos menores que o trecho parcial já foram lidos por inteiro
+        if candidates[group[0]] <= PARTIAL_BYTES:
+            groups.append(group)
+        else:
+            groups.extend(split_by_hash(group, None))
+    groups.sort(key=lambda g: (-candidates[g[0]] * (len(g) - 1), g[0]))
+    return [{"size": candidates[g[0]], "paths": sorted(g)} for g in groups]
+
+
+def normalized_lines(text):
+    """Linhas sem espaços nas pontas, sem linhas vazias e sem comentários de linha inteira"""
+    lines = []
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if line and not line.startswith(("#", "//")):
+            lines.append(line)
+    return lines
+
+
+def shingles(lines, k=SHINGLE_LINES):
+    """Conjunto de hashes de 64 bits das janelas de ``k`` linhas consecutivas"""
+    if len(lines) < k:
+        windows = ["\n".join(lines)] if lines else []
+    else:
+        windows = ["\n".join(lines[i:i + k]) for i in range(len(lines) - k + 1)]
+    return {int.from_bytes(hashlib.blake2b(w.encode(), digest_size=8).digest(), "big") for w in windows}
+
+
+def minhash(shingle_set):
+    return tuple(min((a * h + b) % _MERSENNE for h in shingle_set) for a, b in _PERMS)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _signature(path):
+    """Shingles e assinatura MinHash de um arquivo; ``None`` se ilegível ou vazio"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            s = shingles(normalized_lines(f.read()))
+    except (OSError, UnicodeDecodeError):
+        return None
+    return (s, minhash(s)) if s else None
+
+
+def _signatures(paths, workers=None):
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        return list(map(_signature, paths))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        return list(pool.map(_signature, paths, chunksize=chunksize))
+
+
+def find_near_duplicates(root=".", threshold=0.8, files=None, workers=None):
+    """Pares de arquivos-fonte parecidos: ``[(a, b, similaridade)]``, mais parecidos primeiro"""
+    paths = [rel for rel, size in (files if files is not None else iter_files(root))
+             if size and os.path.splitext(rel)[1].lower() in SOURCE_EXTENSIONS]
+    sets, signatures = {}, {}
+    for rel, result in zip(paths, _signatures([os.path.join(root, p) for p in paths], workers)):
+        if result:
+            sets[rel], signatures[rel] = result
+
+    # LSH: arquivos que coincidem em todas as linhas de alguma faixa viram candidatos
+    rows = NUM_PERM // BANDS
+    buckets = defaultdict(list)
+    for rel, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(rel)
+    pairs = {tuple(sorted((a, b))) for bucket in buckets.values() if len(bucket) > 1
+             for i, a in enumerate(bucket) for b in bucket[i + 1:]}
+
+    result = []
+    for a, b in pairs:
+        similarity = jaccard(sets[a], sets[b])
+        if similarity >= threshold:
+            result.append((a, b, similarity))
+    result.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return result
+
+
+def is_stale(path):
+    return bool(STALE_RE.search(path.rsplit("/", 1)[-1]))
+
+
+def choose_keeper(paths):
+    """Cópia a manter: a que não parece backup, depois a de caminho mais curto"""
+    return min(paths, key=lambda p: (is_stale(p), p.count("/"), len(p), p))
+
+
+def plan_cleanup(groups, near=()):
+    """Ações de limpeza ``[(manter, remover, motivo)]``.
+
+    Nos dois casos só sai a cópia com nome de backup, e só se alguma cópia
+    sem esse nome fica. Arquivos idênticos de propósito (``__init__.py`` de
+    pacotes diferentes, LICENSE, modelos de configuração) nunca são propostos.
+    """
+    actions, removed = [], set()
+    for group in groups:
+        keep = choose_keeper(group["paths"])
+        if is_stale(keep):
+            continue
+        remove = [p for p in group["paths"] if is_stale(p)]
+        if remove:
+            removed.update(remove)
+            actions.append((keep, remove, "idêntico"))
+    for a, b, similarity in near:
+        if a in removed or b in removed or is_stale(a) == is_stale(b):
+            continue
+        keep, stale = (b, a) if is_stale(a) else (a, b)
+        removed.add(stale)
+        actions.append((keep, [stale], f"{similarity:.0%} parecido"))
+    return actions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encontra arquivos duplicados e quase duplicados")
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--near", action="store_true", help="inclui quase duplicatas de código-fonte")
+    parser.add_argument("--threshold", type=float, default=0.8, help="similaridade mínima (0-1)")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args(argv)
+
+    files = list(iter_files(args.root))
+    groups = find_duplicates(args.root, files=files)
+    near = find_near_duplicates(args.root, args.threshold, files=files) if args.near else []
+    if args.format == "json":
+        print(json.dumps({"duplicates": groups,
+                          "near_duplicates": [{"a": a, "b": b, "similarity": s} for a, b, s in near],
+                          "cleanup": [{"keep": k, "remove": r, "reason": why}
+                                      for k, r, why in plan_cleanup(groups, near)]},
+                         indent=2, ensure_ascii=False))
+        return 0
+
+    print(f"🔎 {len(files)} arquivo(s) analisado(s)")
+    for group in groups:
+        print(f"📄 {group['size']} bytes x {len(group['paths'])}: {', '.join(group['paths'])}")
+    for a, b, similarity in near:
+        print(f"≈ {similarity:.0%} {a} ~ {b}")
+    for keep, remove, why in plan_cleanup(groups, near):
+        print(f"🧹 manter {keep}, remover {', '.join(remove)} ({why})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
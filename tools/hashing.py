@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Hash de arquivos via mmap, distribuído em um pool de processos
+"""
+import hashlib
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Abaixo disso o custo de subir o pool supera o ganho do paralelismo
+PARALLEL_MIN_FILES = 64
+
+
+def hash_file(path, algorithm="sha256", limit=None):
+    """Hash do conteúdo de ``path`` lido via mmap (só os ``limit`` primeiros bytes, se informado)"""
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                h.update(m if limit is None or limit >= size else m[:limit])
+    return h.hexdigest()
+
+
+def _hash_one(args):
+    path, algorithm, limit = args
+    try:
+        return hash_file(path, algorithm, limit)
+    except OSError:
+        return None
+
+
+def hash_files(paths, algorithm="sha256", limit=None, workers=None):
+    """Retorna ``{path: hash}``; arquivos ilegíveis ficam com ``None``"""
+    paths = list(paths)
+    jobs = [(p, algorithm, limit) for p in paths]
+    if len(paths) < PARALLEL_MIN_FILES or workers == 1:
+        return dict(zip(paths, map(_hash_one, jobs)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        return dict(zip(paths, pool.map(_hash_one, jobs, chunksize=chunksize)))
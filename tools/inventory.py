@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Inventário da infraestrutura AWS (EC2 e security groups) com cache
+"""
+import os
+import threading
+
+from app.config import on_reload, setting
+from tools import tfstate
+from tools.cache import TTLCache
+
+TFSTATE_PATH = tfstate.STATE_PATH
+
+# O TTL vem da configuração a cada get_inventory()
+cache = TTLCache()
+
+_session = None
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(service, region=None):
+    """Cliente boto3 compartilhado (uma sessão, pool de conexões reaproveitado)"""
+    global _session
+    region = region or os.environ.get("AWS_DEFAULT_REGION") or os.environ.get("AWS_REGION") or "us-east-1"
+    endpoint_url = os.environ.get("AWS_ENDPOINT_URL")
+    key = (service, region, endpoint_url)
+    with _lock:
+        if key not in _clients:
+            import boto3
+            from botocore.config import Config
+
+            if _session is None:
+                _session = boto3.session.Session()
+            _clients[key] = _session.client(
+                service, region_name=region, endpoint_url=endpoint_url,
+                config=Config(max_pool_connections=setting("AWS_MAX_POOL_CONNECTIONS"),
+                              retries={"max_attempts": 3, "mode": "standard"}))
+        return _clients[key]
+
+
+def reset_clients():
+    global _session
+    with _lock:
+        _clients.clear()
+        _session = None
+
+
+@on_reload
+def _reset_pool(old, new):
+    # O tamanho do pool fica gravado no cliente: os próximos são criados com o novo
+    if new.AWS_MAX_POOL_CONNECTIONS != old.AWS_MAX_POOL_CONNECTIONS:
+        with _lock:
+            _clients.clear()
+
+
+def list_instances(client=None):
+    client = client or get_client("ec2")
+    instances = []
+    for page in client.get_paginator("describe_instances").paginate():
+        for reservation in page["Reservations"]:
+            for inst in reservation["Instances"]:
+                tags = {t["Key"]: t["Value"] for t in inst.get("Tags", [])}
+                instances.append({
+                    "id": inst["InstanceId"],
+                    "name": tags.get("Name", ""),
+                    "type": inst["InstanceType"],
+                    "state": inst["State"]["Name"],
+                    "public_ip": inst.get("PublicIpAddress", ""),
+                })
+    return instances
+
+
+def list_security_groups(client=None):
+    client = client or get_client("ec2")
+    groups = []
+    for page in client.get_paginator("describe_security_groups").paginate():
+        for sg in page["SecurityGroups"]:
+            ports = sorted({p.get("FromPort", -1) for p in sg.get("IpPermissions", [])})
+            groups.append({
+                "id": sg["GroupId"],
+                "name": sg["GroupName"],
+                "ingress_ports": [p for p in ports if p != -1],
+            })
+    return groups
+
+
+def terraform_outputs(state_path=TFSTATE_PATH):
+    """Lê os outputs direto do terraform.tfstate local, sem chamar o CLI do terraform"""
+    try:
+        return tfstate.read_outputs(state_path)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_inventory(wait=False):
+    """Retorna o inventário em cache; ``None`` nos itens que ainda estão carregando"""
+    cache.ttl = setting("INVENTORY_CACHE_TTL")
+    return {
+        "outputs": terraform_outputs(),
+        "instances": cache.get("instances", list_instances, wait=wait),
+        "security_groups": cache.get("security_groups", list_security_groups, wait=wait),
+        "errors": dict(cache.errors),
+    }
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Histórico das métricas do repositório em um arquivo binário de tamanho fixo
+
+O arquivo (``.git/dashboard/metrics.bin``) tem um cabeçalho e dois buffers
+circulares de registros ``struct`` de largura fixa, acessados via mmap:
+
+- ``raw``: cada snapshot gravado, até ``raw_capacity`` registros;
+- ``coarse``: o que sai do ``raw`` é reduzido a um registro por ``bucket``
+  segundos (o último valor de cada campo no intervalo).
+
+Os dois buffers estão em ordem de tempo, então a leitura de um intervalo faz
+busca binária no mmap e lê só os registros pedidos.
+"""
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from app.config import setting
+
+FIELDS = ("changes", "local_commits", "remote_commits", "local_branches", "repo_size")
+Snapshot = namedtuple("Snapshot", ["ts", *FIELDS])
+
+MAGIC = b"DLMHIST1"
+# magic, tamanho do registro, capacidade raw, capacidade coarse, bucket (s), total raw, total coarse
+HEADER = struct.Struct("<8sIIIIQQ")
+HEADER_SIZE = 64
+# timestamp, máscara dos campos presentes, 4 contadores e o tamanho em bytes
+RECORD = struct.Struct("<dIIIIIQ")
+
+RAW_CAPACITY = 8192
+COARSE_CAPACITY = 24 * 366  # um ano de registros por hora
+BUCKET_SECONDS = 3600
+
+
+def history_path(root="."):
+    """Caminho do histórico dentro do .git; ``None`` fora da raiz de um repositório"""
+    if not setting("METRICS_HISTORY"):
+        return None
+    git_dir = os.path.join(root, ".git")
+    if not os.path.isdir(git_dir):
+        return None
+    return os.path.join(git_dir, "dashboard", "metrics.bin")
+
+
+def _pack(ts, values):
+    mask = 0
+    fields = []
+    for i, name in enumerate(FIELDS):
+        value = values.get(name)
+        if value is not None:
+            mask |= 1 << i
+        fields.append(int(value or 0))
+    return RECORD.pack(ts, mask, *fields)
+
+
+def _unpack(buf, offset):
+    ts, mask, *fields = RECORD.unpack_from(buf, offset)
+    return Snapshot(ts, *(value if mask & (1 << i) else None for i, value in enumerate(fields)))
+
+
+class MetricsHistory:
+    def __init__(self, path, raw_capacity=RAW_CAPACITY, coarse_capacity=COARSE_CAPACITY,
+                 bucket=BUCKET_SECONDS):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "wb") as f:
+                f.truncate(HEADER_SIZE + (raw_capacity + coarse_capacity) * RECORD.size)
+                f.write(HEADER.pack(MAGIC, RECORD.size, raw_capacity, coarse_capacity, bucket, 0, 0))
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, record_size, self.raw_capacity, self.coarse_capacity, self.bucket, _, _ = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} não é um histórico de métricas compatível")
+        self._raw_offset = HEADER_SIZE
+        self._coarse_offset = HEADER_SIZE + self.raw_capacity * RECORD.size
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        # Dashboard e CLI podem gravar ao mesmo tempo
+        if fcntl:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _counts(self):
+        return HEADER.unpack_from(self._mm, 0)[5:]
+
+    def _set_counts(self, raw, coarse):
+        struct.pack_into("<QQ", self._mm, HEADER.size - 16, raw, coarse)
+
+    def _ring(self, coarse):
+        raw_count, coarse_count = self._counts()
+        if coarse:
+            return self._coarse_offset, self.coarse_capacity, coarse_count
+        return self._raw_offset, self.raw_capacity, raw_count
+
+    def _offset(self, coarse, i):
+        """Posição do i-ésimo registro mais antigo ainda guardado no buffer"""
+        base, capacity, total = self._ring(coarse)
+        first = max(0, total - capacity)
+        return base + ((first + i) % capacity) * RECORD.size
+
+    def _len(self, coarse):
+        _, capacity, total = self._ring(coarse)
+        return min(total, capacity)
+
+    def _fold(self, snapshot, coarse_count):
+        """Leva um registro que sai do raw para o bucket correspondente do coarse"""
+        bucket_ts = snapshot.ts - snapshot.ts % self.bucket
+        values = {name: getattr(snapshot, name) for name in FIELDS}
+        if coarse_count:
+            last = self._offset(True, min(coarse_count, self.coarse_capacity) - 1)
+            previous = _unpack(self._mm, last)
+            if previous.ts == bucket_ts:
+                merged = {name: values[name] if values[name] is not None else getattr(previous, name)
+                          for name in FIELDS}
+                self._mm[last:last + RECORD.size] = _pack(bucket_ts, merged)
+                return coarse_count
+        slot = self._coarse_offset + (coarse_count % self.coarse_capacity) * RECORD.size
+        self._mm[slot:slot + RECORD.size] = _pack(bucket_ts, values)
+        return coarse_count + 1
+
+    def append(self, ts=None, **values):
+        unknown = set(values) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"campos desconhecidos: {', '.join(sorted(unknown))}")
+        with self._locked():
+            raw_count, coarse_count = self._counts()
+            ts = time.time() if ts is None else ts
+            if raw_count:
+                # A busca binária depende da ordem: um relógio que volta não a quebra
+                ts = max(ts, _unpack(self._mm, self._offset(False, self._len(False) - 1)).ts)
+            slot = self._raw_offset + (raw_count % self.raw_capacity) * RECORD.size
+            if raw_count >= self.raw_capacity:
+                coarse_count = self._fold(_unpack(self._mm, slot), coarse_count)
+            self._mm[slot:slot + RECORD.size] = _pack(ts, values)
+            self._set_counts(raw_count + 1, coarse_count)
+
+    def _bisect(self, coarse, ts):
+        lo, hi = 0, self._len(coarse)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if RECORD.unpack_from(self._mm, self._offset(coarse, mid))[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, start=None, end=None):
+        """Gera os snapshots com ``start <= ts <= end``, do mais antigo ao mais novo"""
+        for coarse in (True, False):
+            i = 0 if start is None else self._bisect(coarse, start)
+            for i in range(i, self._len(coarse)):
+                snapshot = _unpack(self._mm, self._offset(coarse, i))
+                if end is not None and snapshot.ts > end:
+                    break
+                yield snapshot
+
+    def series(self, field, start=None, end=None, max_points=None):
+        """``[(ts, valor)]`` de um campo, reduzido a no máximo ``max_points`` pontos"""
+        points = [(s.ts, getattr(s, field)) for s in self.range(start, end)
+                  if getattr(s, field) is not None]
+        if max_points and len(points) > max_points:
+            step = len(points) / max_points
+            points = [points[int(i * step)] for i in range(max_points - 1)] + [points[-1]]
+        return points
+
+
+def record(root=".", **values):
+    """Grava um snapshot no histórico do repositório; falhas nunca interrompem quem chamou"""
+    if not any(v is not None for v in values.values()):
+        return False
+    try:
+        # ConfigError (METRICS_HISTORY inválido) também é um ValueError
+        path = history_path(root)
+        if not path:
+            return False
+        with MetricsHistory(path) as history:
+            history.append(**values)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mostra o histórico de métricas do repositório")
+    parser.add_argument("--field", choices=FIELDS, default="changes")
+    parser.add_argument("--hours", type=float, default=24 * 7)
+    args = parser.parse_args(argv)
+
+    path = history_path()
+    if not path or not os.path.exists(path):
+        print("Nenhum histórico gravado ainda.")
+        return 1
+    with MetricsHistory(path) as history:
+        for ts, value in history.series(args.field, start=time.time() - args.hours * 3600):
+            print(f"{time.strftime('%d/%m/%Y %H:%M:%S', time.localtime(ts))}  {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
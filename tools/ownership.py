@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Mapa de autoria do código a partir do ``git blame``
+
+O blame de cada arquivo roda em um pool de processos e o resultado (linhas por
+autor) fica em cache no SQLite, indexado pelo hash do blob: arquivo sem
+mudança nunca é reprocessado. Os totais por arquivo são agregados por pasta,
+e o mapa montado fica em memória enquanto a árvore do HEAD não muda.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from tools import runner
+from tools.cache import cache_dir
+from tools.hashing import PARALLEL_MIN_FILES
+
+# Arquivos maiores que isso (em geral gerados ou binários) não passam pelo blame
+MAX_BLAME_BYTES = 512 * 1024
+
+_memo = {}
+
+
+def tracked_blobs(root="."):
+    """``{caminho: (blob, tamanho)}`` dos arquivos do HEAD"""
+    out = runner.run(["git", "ls-tree", "-r", "-l", "-z", "HEAD"], capture_output=True,
+                     check=False, cwd=root).stdout
+    blobs = {}
+    for entry in out.split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, kind, blob, size = meta.split()
+        if kind == "blob" and size != "-":
+            blobs[path] = (blob, int(size))
+    return blobs
+
+
+def blame_file(root, path):
+    """Linhas do HEAD por autor em ``path``; ``None`` se o blame falhar"""
+    result = runner.run(["git", "blame", "--line-porcelain", "HEAD", "--", path],
+                        capture_output=True, check=False, cwd=root)
+    if result.returncode:
+        return None
+    authors = Counter()
+    for line in result.stdout.splitlines():
+        if line.startswith("author "):
+            authors[line[7:]] += 1
+    return dict(authors)
+
+
+def _blame_job(args):
+    return blame_file(*args)
+
+
+class BlameCache:
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS blame (blob TEXT PRIMARY KEY, authors TEXT)")
+
+    def get_many(self, blobs):
+        found = {}
+        blobs = list(blobs)
+        for i in range(0, len(blobs), 500):
+            chunk = blobs[i:i + 500]
+            query = f"SELECT blob, authors FROM blame WHERE blob IN ({', '.join('?' * len(chunk))})"
+            found.update((blob, json.loads(authors)) for blob, authors in self.db.execute(query, chunk))
+        return found
+
+    def put_many(self, results):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO blame VALUES (?, ?)",
+                                [(blob, json.dumps(authors)) for blob, authors in results.items()])
+
+    def close(self):
+        self.db.close()
+
+
+def build(root=".", workers=None, cache_path=None):
+    """``{caminho: {autor: linhas}}`` de todos os arquivos rastreados, usando o cache"""
+    blobs = tracked_blobs(root)
+    cache = BlameCache(cache_path or os.path.join(cache_dir(root), "ownership.db"))
+    try:
+        known = cache.get_many({blob for blob, _ in blobs.values()})
+        # Um caminho por blob pendente: conteúdo repetido é processado uma vez só
+        todo = {}
+        for path, (blob, size) in sorted(blobs.items()):
+            if blob not in known and size <= MAX_BLAME_BYTES:
+                todo.setdefault(blob, path)
+        jobs = [(root, path) for path in todo.values()]
+        if len(jobs) < PARALLEL_MIN_FILES or workers == 1:
+            results = list(map(_blame_job, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_blame_job, jobs, chunksize=8))
+        # Falha não vai para o cache: o blob seria dado como sem autores para sempre
+        fresh = {blob: authors for blob, authors in zip(todo, results) if authors is not None}
+        cache.put_many(fresh)
+        known.update(fresh)
+    finally:
+        cache.close()
+    return {path: known[blob] for path, (blob, _) in blobs.items() if blob in known}
+
+
+def rollup(files):
+    """Soma as linhas por autor de cada pasta (``"."`` é o repositório inteiro)"""
+    dirs = {}
+    for path, authors in files.items():
+        parts = path.split("/")[:-1]
+        for i in range(len(parts) + 1):
+            key = "/".join(parts[:i]) or "."
+            dirs.setdefault(key, Counter()).update(authors)
+    return dirs
+
+
+class Ownership:
+    def __init__(self, files):
+        self.files = files
+        self.dirs = rollup(files)
+
+    def owners(self, path, top=3):
+        """``[(autor, fração)]`` dos maiores autores de um arquivo ou pasta"""
+        authors = self.files.get(path) or self.dirs.get(path.rstrip("/") or ".") or {}
+        total = sum(authors.values())
+        if not total:
+            return []
+        return [(author, lines / total) for author, lines in Counter(authors).most_common(top)]
+
+    def label(self, path):
+        owners = self.owners(path, top=1)
+        return f"{owners[0][0]} {owners[0][1]:.0%}" if owners else ""
+
+
+def get_ownership(root=".", workers=None):
+    """Mapa de autoria do HEAD atual; reaproveitado enquanto o HEAD não muda"""
+    head = runner.run(["git", "rev-parse", "-q", "--verify", "HEAD^{tree}"], capture_output=True,
+                      check=False, cwd=root).stdout.strip()
+    key = (os.path.abspath(root), head)
+    if key not in _memo:
+        _memo.clear()
+        _memo[key] = Ownership(build(root, workers) if head else {})
+    return _memo[key]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Autoria do código por arquivo e pasta (git blame)")
+    parser.add_argument("paths", nargs="*", default=["."])
+    parser.add_argument("--top", type=int, default=3)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    ownership = get_ownership(workers=args.workers)
+    for path in args.paths:
+        owners = ", ".join(f"{author} {share:.0%}" for author, share in ownership.owners(path, args.top))
+        print(f"👥 {path}: {owners or 'sem dados'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
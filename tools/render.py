@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Renderização incremental do dashboard no terminal
+
+Cada quadro é renderizado em memória (linhas com os códigos ANSI do rich) e
+comparado com o anterior; só as linhas que mudaram são reescritas, com
+posicionamento de cursor, na tela alternativa do terminal. Sem ``clear()`` a
+tela não pisca, e por SSH trafega só a diferença.
+"""
+import io
+import os
+import re
+import select
+import sys
+
+from rich.console import Console, Group
+
+ALT_SCREEN_ON = "\x1b[?1049h\x1b[?25l"
+ALT_SCREEN_OFF = "\x1b[?25h\x1b[?1049l"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+CURSOR_QUERY = "\x1b[6n"
+_CURSOR_REPLY = re.compile(r"\x1b\[(\d+);(\d+)R")
+
+
+def _move(row):
+    return f"\x1b[{row + 1};1H"
+
+
+class FrameRenderer:
+    """Desenha quadros sucessivos reescrevendo só as linhas alteradas"""
+
+    def __init__(self, console, alt_screen=True):
+        self.console = console
+        self.alt_screen = alt_screen and console.is_terminal
+        self.previous = None
+        self.frames = 0
+        self.bytes_written = 0
+        self.full_bytes = 0  # o que teria sido escrito redesenhando tudo a cada quadro
+        self.last_bytes = 0
+
+    def __enter__(self):
+        if self.alt_screen:
+            self._write(ALT_SCREEN_ON)
+        self.previous = None
+        return self
+
+    def __exit__(self, *exc):
+        if self.alt_screen:
+            self._write(ALT_SCREEN_OFF)
+
+    def _write(self, data):
+        self.console.file.write(data)
+        self.console.file.flush()
+        return len(data.encode("utf-8", errors="replace"))
+
+    def invalidate(self):
+        """Esquece o quadro anterior (a tela foi alterada por outra saída)"""
+        self.previous = None
+
+    def cursor_row(self, timeout=0.2):
+        """Linha do cursor (0 = topo), perguntada ao terminal; ``None`` se não houver resposta"""
+        try:
+            import termios
+            import tty
+        except ImportError:  # Windows
+            return None
+        try:
+            fd = sys.stdin.fileno()
+        except (AttributeError, ValueError, io.UnsupportedOperation):
+            return None
+        if not self.console.is_terminal or not os.isatty(fd):
+            return None
+        saved = termios.tcgetattr(fd)
+        reply = ""
+        try:
+            # Sem eco e sem esperar Enter, para ler a resposta do terminal
+            tty.setcbreak(fd)
+            self._write(CURSOR_QUERY)
+            while not _CURSOR_REPLY.search(reply):
+                if not select.select([fd], [], [], timeout)[0]:
+                    return None
+                reply += os.read(fd, 32).decode("ascii", errors="replace")
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        return int(_CURSOR_REPLY.search(reply).group(1)) - 1
+
+    def settle(self):
+        """Depois de saída escrita abaixo do quadro (prompts, ações), decide se ele continua na tela.
+
+        Se a saída não chegou à última linha, a tela não rolou e o quadro está
+        intacto: o próximo ``draw`` reescreve só o que mudou e limpa a área
+        abaixo dele. Sem como saber (ex.: não é um terminal), redesenha tudo.
+        """
+        if self.previous is None:
+            return False
+        row = self.cursor_row()
+        if row is None or row >= self.console.height - 1:
+            self.previous = None
+        return self.previous is not None
+
+    def render_lines(self, *renderables):
+        capture = Console(file=io.StringIO(), width=self.console.width, height=self.console.height,
+                          color_system=self.console.color_system, force_terminal=True,
+                          legacy_windows=False, emoji=True)
+        with capture.capture() as captured:
+            capture.print(Group(*renderables))
+        return captured.get().splitlines()
+
+    def draw(self, *renderables):
+        """Desenha o quadro e deixa o cursor logo abaixo dele; retorna os bytes escritos"""
+        lines = self.render_lines(*renderables)
+        full = _move(0) + "".join(f"{line}{CLEAR_LINE}\n" for line in lines) + CLEAR_BELOW
+        previous = self.previous
+        # Quadro maior que a tela: o posicionamento do cursor não alcança todas as linhas
+        fits = self.console.is_terminal and len(lines) < self.console.height
+        if not self.console.is_terminal:
+            data = "".join(f"{line}\n" for line in lines)
+        elif not fits:
+            data = _move(0) + CLEAR_BELOW + "".join(f"{line}\n" for line in lines)
+        else:
+            out = []
+            for row, line in enumerate(lines):
+                if previous is None or row >= len(previous) or previous[row] != line:
+                    out.append(f"{_move(row)}{line}{CLEAR_LINE}")
+            # Limpa o que ficou abaixo do quadro: linhas antigas, prompt e saída das ações
+            out.append(_move(len(lines)) + CLEAR_BELOW)
+            data = "".join(out)
+        self.last_bytes = self._write(data)
+        self.bytes_written += self.last_bytes
+        self.full_bytes += len(full.encode("utf-8", errors="replace"))
+        self.frames += 1
+        self.previous = lines if fits else None
+        return self.last_bytes
+
+    def savings(self):
+        """Fração de bytes economizada em relação a redesenhar todos os quadros"""
+        return 1 - self.bytes_written / self.full_bytes if self.full_bytes else 0.0
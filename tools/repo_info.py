@@ -3,10 +3,20 @@
 Script para mostrar informações básicas do repositório
 """
 
+import argparse
+import heapq
 import os
 import subprocess
 from datetime import datetime
 
+from tools import metrics_history, runner
+
+BATCH_CHECK_FORMAT = "%(objectname) %(objecttype) %(objectsize) %(objectsize:disk)"
+# Limites padrão do git (gc.auto e gc.autoPackLimit) para sugerir manutenção
+LOOSE_OBJECTS_LIMIT = 6700
+PACK_LIMIT = 50
+LARGE_BLOB_BYTES = 5 * 1024 * 1024
+
 def get_git_info():
     """Obtém informações do Git"""
     try:
@@ -26,10 +36,123 @@ def get_repo_size():
                 total_size += os.path.getsize(fp)
     return total_size
 
-def main():
+def iter_objects():
+    """Gera ``(oid, tipo, tamanho, tamanho_em_disco)`` de todos os objetos, em streaming"""
+    with runner.stream(["git", "cat-file", "--batch-all-objects",
+                        f"--batch-check={BATCH_CHECK_FORMAT}"], text=True) as proc:
+        for line in proc.stdout:
+            oid, kind, size, disk = line.split()
+            yield oid, kind, int(size), int(disk)
+
+
+def largest_blobs(top=10, objects=None):
+    """Os ``top`` maiores blobs e os totais por tipo, com memória constante (heap limitado)"""
+    heap = []
+    totals = {}
+    for oid, kind, size, disk in objects if objects is not None else iter_objects():
+        count, total, total_disk = totals.get(kind, (0, 0, 0))
+        totals[kind] = (count + 1, total + size, total_disk + disk)
+        if kind != "blob":
+            continue
+        if len(heap) < top:
+            heapq.heappush(heap, (size, disk, oid))
+        elif size > heap[0][0]:
+            heapq.heappushpop(heap, (size, disk, oid))
+    return sorted(heap, reverse=True), totals
+
+
+def blob_paths(oids):
+    """Primeiro caminho em que cada blob aparece no histórico (``rev-list --objects --all``)"""
+    pending, paths = set(oids), {}
+    if not pending:
+        return paths
+    with runner.stream(["git", "rev-list", "--objects", "--all"], text=True) as proc:
+        try:
+            for line in proc.stdout:
+                oid, _, path = line.rstrip("\n").partition(" ")
+                if oid in pending:
+                    paths[oid] = path
+                    pending.discard(oid)
+                    if not pending:
+                        break
+        finally:
+            # O resto da travessia não interessa
+            proc.kill()
+    return paths
+
+
+def introduced_by(oid):
+    """Commit mais antigo que adicionou o blob (``git log --find-object``)"""
+    out = runner.run(["git", "log", "--all", "--reverse", "--format=%h %ad %s", "--date=short",
+                      f"--find-object={oid}"], capture_output=True, check=False).stdout
+    return out.split("\n", 1)[0].strip() or None
+
+
+def count_objects():
+    """Saída de ``git count-objects -v`` como dict (tamanhos em KB)"""
+    out = runner.run(["git", "count-objects", "-v"], capture_output=True).stdout
+    stats = {}
+    for line in out.splitlines():
+        key, _, value = line.partition(":")
+        stats[key.strip()] = int(value) if value.strip().isdigit() else value.strip()
+    return stats
+
+
+def recommendations(stats, blobs=()):
+    tips = []
+    if stats.get("count", 0) > LOOSE_OBJECTS_LIMIT:
+        tips.append(f"{stats['count']} objetos soltos: rode 'git gc'")
+    if stats.get("packs", 0) > PACK_LIMIT:
+        tips.append(f"{stats['packs']} packs: rode 'git repack -ad' para consolidar")
+    if stats.get("garbage", 0) or stats.get("size-garbage", 0):
+        tips.append("há arquivos inválidos em .git/objects: rode 'git prune' ou 'git gc --prune=now'")
+    if any(size >= LARGE_BLOB_BYTES for size, _, _ in blobs):
+        tips.append("blobs grandes no histórico: considere Git LFS ou 'git filter-repo' para removê-los")
+    return tips
+
+
+def analyze(top=10):
+    blobs, totals = largest_blobs(top)
+    paths = blob_paths(oid for _, _, oid in blobs)
+    stats = count_objects()
+    return {
+        "blobs": [{"oid": oid, "size": size, "disk": disk, "path": paths.get(oid),
+                   "commit": introduced_by(oid)} for size, disk, oid in blobs],
+        "totals": totals,
+        "stats": stats,
+        "recommendations": recommendations(stats, blobs),
+    }
+
+
+def print_analysis(report):
+    print("🔬 Análise de objetos")
+    print("=" * 40)
+    for kind, (count, size, disk) in sorted(report["totals"].items()):
+        print(f"{kind:<7} {count:>9} objeto(s) {size / 1024:>12.1f} KB ({disk / 1024:.1f} KB em disco)")
+    stats = report["stats"]
+    print(f"📦 Packs: {stats.get('packs', 0)} ({stats.get('size-pack', 0)} KB) | "
+          f"soltos: {stats.get('count', 0)} ({stats.get('size', 0)} KB)")
+    print("🐘 Maiores blobs:")
+    for blob in report["blobs"]:
+        print(f"  {blob['size'] / 1024:>10.1f} KB  {blob['oid'][:10]}  {blob['path'] or '?'}"
+              f"  <- {blob['commit'] or 'fora do histórico'}")
+    for tip in report["recommendations"]:
+        print(f"💡 {tip}")
+
+
+def main(argv=None):
     """Função principal"""
+    parser = argparse.ArgumentParser(description="Informações do repositório")
+    parser.add_argument("--analyze", action="store_true", help="analisa objetos grandes e packs")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    if args.analyze:
+        print_analysis(analyze(args.top))
+        return
+
     branch, last_commit = get_git_info()
     repo_size = get_repo_size()
+    metrics_history.record(repo_size=repo_size)
     
     print("📊 Informações do Repositório")
     print("=" * 40)
@@ -7,24 +7,17 @@ import os
 import json
 from pathlib import Path
 
-def get_repo_structure():
+from tools.scanner import scan_structure
+
+def get_repo_structure(repo_path=None):
     """Obtém a estrutura do repositório"""
-    repo_path = Path(__file__).parent.parent
+    repo_path = repo_path or Path(__file__).parent.parent
     structure = {}
     
-    for root, dirs, files in os.walk(repo_path):
-        # Ignorar diretórios ocultos e venv
-        if any(part.startswith('.') for part in Path(root).parts) or 'venv' in Path(root).parts:
-            continue
-            
-        rel_path = os.path.relpath(root, repo_path)
+    for rel_path, dirs, files in scan_structure(repo_path):
         if rel_path == '.':
             rel_path = 'ROOT'
-            
-        structure[rel_path] = {
-            'files': [f for f in files if not f.startswith('.')],
-            'dirs': [d for d in dirs if not d.startswith('.') and d != 'venv']
-        }
+        structure[rel_path] = {'files': files, 'dirs': dirs}
     
     return structure
 
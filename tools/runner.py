@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Camada de execução de comandos externos (git e afins) com rastreamento
+"""
+import subprocess
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+
+from app.config import on_reload, setting
+
+HISTORY_SIZE = setting("RUNNER_HISTORY_SIZE")
+
+CommandRecord = namedtuple(
+    "CommandRecord",
+    ["argv", "started", "duration", "returncode", "output_bytes", "timed_out"],
+)
+
+# Buffer circular: guarda só os últimos HISTORY_SIZE comandos executados
+_history = deque(maxlen=HISTORY_SIZE)
+
+
+@on_reload
+def _resize_history(old, new):
+    global HISTORY_SIZE, _history
+    if new.RUNNER_HISTORY_SIZE != old.RUNNER_HISTORY_SIZE:
+        HISTORY_SIZE = new.RUNNER_HISTORY_SIZE
+        _history = deque(_history, maxlen=HISTORY_SIZE)
+
+
+def run(argv, capture_output=False, check=True, timeout=None, cwd=None, input=None):
+    """Executa ``argv`` sem shell e registra tempo, código de saída e tamanho da saída.
+
+    Retorna um ``subprocess.CompletedProcess`` com ``stdout``/``stderr`` em texto.
+    Levanta ``CalledProcessError`` (se ``check``) ou ``TimeoutExpired``.
+    """
+    argv = [str(a) for a in argv]
+    started = time.time()
+    t0 = time.perf_counter()
+    try:
+        result = subprocess.run(argv, capture_output=capture_output, timeout=timeout, cwd=cwd,
+                                input=input.encode() if isinstance(input, str) else input)
+    except subprocess.TimeoutExpired:
+        _history.append(CommandRecord(tuple(argv), started, time.perf_counter() - t0, None, None, True))
+        raise
+    duration = time.perf_counter() - t0
+
+    stdout = result.stdout or b""
+    stderr = result.stderr or b""
+    # Sem captura a saída vai direto para o terminal e não é contada
+    output_bytes = len(stdout) + len(stderr) if capture_output else None
+    _history.append(CommandRecord(tuple(argv), started, duration, result.returncode,
+                                  output_bytes, False))
+
+    completed = subprocess.CompletedProcess(
+        argv, result.returncode,
+        stdout.decode("utf-8", errors="replace") if capture_output else None,
+        stderr.decode("utf-8", errors="replace") if capture_output else None,
+    )
+    if check and completed.returncode != 0:
+        raise subprocess.CalledProcessError(completed.returncode, argv,
+                                            completed.stdout, completed.stderr)
+    return completed
+
+
+@contextmanager
+def stream(argv, cwd=None, stdin=False, **popen_kwargs):
+    """``Popen`` com a saída em pipe, para ler em streaming; registra no histórico ao sair.
+
+    Ao sair fecha os pipes e espera o processo; o código de saída fica em
+    ``proc.returncode``. O tamanho da saída não é contado (``output_bytes`` é ``None``).
+    """
+    argv = [str(a) for a in argv]
+    started = time.time()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=cwd, stdin=subprocess.PIPE if stdin else None,
+                            stdout=subprocess.PIPE, **popen_kwargs)
+    try:
+        yield proc
+    finally:
+        for pipe in (proc.stdin, proc.stdout):
+            if pipe is not None:
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+        proc.wait()
+        _history.append(CommandRecord(tuple(argv), started, time.perf_counter() - t0,
+                                      proc.returncode, None, False))
+
+
+def history():
+    """Retorna os registros do buffer, do mais antigo para o mais recente"""
+    return list(_history)
+
+
+def slowest(n=10):
+    """Retorna os ``n`` comandos mais lentos do buffer"""
+    return sorted(_history, key=lambda r: r.duration, reverse=True)[:n]
+
+
+def clear_history():
+    _history.clear()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Empacota a aplicação e publica artefatos no S3 com upload multipart paralelo
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+import zipfile
+from collections import namedtuple
+
+from tools.scanner import IgnoreMatcher, walk
+
+MB = 1024 * 1024
+DEFAULT_SOURCES = ["app", "run.py", "requirements.txt"]
+DEFAULT_PART_SIZE = 8 * MB
+# Menor parte aceita pelo S3 no multipart (exceto a última)
+MIN_PART_SIZE = 5 * MB
+DEFAULT_CONCURRENCY = 10
+HASH_METADATA_KEY = "sha256"
+
+UploadResult = namedtuple("UploadResult", ["key", "status", "size", "seconds"])
+
+
+def _iter_sources(root, sources):
+    matcher = IgnoreMatcher.from_gitignore(root)
+    for source in sources:
+        path = os.path.join(root, source)
+        if os.path.isdir(path):
+            for rel, _, files in walk(path, source.rstrip("/"), matcher):
+                for name in files:
+                    yield f"{rel}/{name}"
+        elif os.path.isfile(path):
+            yield source
+
+
+def build_package(dest, sources=DEFAULT_SOURCES, root="."):
+    """Gera um zip determinístico (ordem e datas fixas) para que o hash só mude com o conteúdo"""
+    with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zf:
+        for rel in sorted(_iter_sources(root, sources)):
+            info = zipfile.ZipInfo(rel, date_time=(1980, 1, 1, 0, 0, 0))
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with open(os.path.join(root, rel), "rb") as f:
+                zf.writestr(info, f.read())
+    return dest
+
+
+def transfer_config(part_size=DEFAULT_PART_SIZE, concurrency=DEFAULT_CONCURRENCY):
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(multipart_threshold=part_size, multipart_chunksize=part_size,
+                          max_concurrency=concurrency, use_threads=True)
+
+
+def local_hashes(path, config):
+    """Calcula o ETag que o S3 dará ao arquivo com essa configuração e o sha256 do conteúdo.
+
+    Acima do limiar o ETag é o md5 dos md5 das partes seguido de ``-N``; o
+    tamanho de parte é ajustado do mesmo jeito que o s3transfer faz.
+    """
+    from s3transfer.utils import ChunksizeAdjuster
+
+    size = os.path.getsize(path)
+    sha = hashlib.sha256()
+    whole = hashlib.md5()
+    parts = []
+    chunk = ChunksizeAdjuster().adjust_chunksize(config.multipart_chunksize, size)
+    multipart = size >= config.multipart_threshold
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk)
+            if not block:
+                break
+            sha.update(block)
+            if multipart:
+                parts.append(hashlib.md5(block).digest())
+            else:
+                whole.update(block)
+    if multipart:
+        etag = f"{hashlib.md5(b''.join(parts)).hexdigest()}-{len(parts)}"
+    else:
+        etag = whole.hexdigest()
+    return etag, sha.hexdigest()
+
+
+def _remote_hashes(client, bucket, key):
+    from botocore.exceptions import ClientError
+
+    try:
+        head = client.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None, None
+        raise
+    return head["ETag"].strip('"'), head.get("Metadata", {}).get(HASH_METADATA_KEY)
+
+
+def upload_file(client, path, bucket, key, config, force=False):
+    """Envia ``path`` para ``s3://bucket/key``, pulando se o conteúdo remoto for o mesmo"""
+    etag, sha = local_hashes(path, config)
+    size = os.path.getsize(path)
+    if not force:
+        remote_etag, remote_sha = _remote_hashes(client, bucket, key)
+        # O ETag não é o md5 com SSE-KMS; o sha256 nos metadados cobre esse caso
+        if remote_etag == etag or (remote_sha and remote_sha == sha):
+            return UploadResult(key, "skipped", size, 0.0)
+
+    started = time.perf_counter()
+    client.upload_file(path, bucket, key, Config=config,
+                       ExtraArgs={"Metadata": {HASH_METADATA_KEY: sha}})
+    return UploadResult(key, "uploaded", size, time.perf_counter() - started)
+
+
+def make_client(endpoint_url=None, region=None, concurrency=DEFAULT_CONCURRENCY):
+    import boto3
+    from botocore.config import Config
+
+    # Uma conexão por thread de transferência, senão o pool vira gargalo
+    return boto3.session.Session().client(
+        "s3", endpoint_url=endpoint_url, region_name=region,
+        config=Config(max_pool_connections=max(10, concurrency)))
+
+
+def publish(paths, bucket, prefix="", part_size=DEFAULT_PART_SIZE,
+            concurrency=DEFAULT_CONCURRENCY, client=None, endpoint_url=None, force=False):
+    """Publica os arquivos (diretórios são expandidos) e retorna a lista de UploadResult"""
+    client = client or make_client(endpoint_url, concurrency=concurrency)
+    config = transfer_config(part_size, concurrency)
+    results = []
+    for path in paths:
+        if os.path.isdir(path):
+            parent = os.path.dirname(os.path.normpath(path))
+            base = os.path.basename(os.path.normpath(path))
+            files = [(os.path.join(parent, *rel.split("/"), name), f"{rel}/{name}")
+                     for rel, _, names in walk(path, base, IgnoreMatcher()) for name in names]
+        else:
+            files = [(path, os.path.basename(path))]
+        for local, name in files:
+            key = f"{prefix.strip('/')}/{name}" if prefix.strip("/") else name
+            results.append(upload_file(client, local, bucket, key, config, force))
+    return results
+
+
+def _part_size_mb(value):
+    size = int(value)
+    if size * MB < MIN_PART_SIZE:
+        raise argparse.ArgumentTypeError(f"mínimo {MIN_PART_SIZE // MB} MB, recebido {size}")
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publica o pacote da aplicação no S3")
+    parser.add_argument("--bucket", required=True)
+    parser.add_argument("--prefix", default="builds")
+    parser.add_argument("--part-size", type=_part_size_mb, default=DEFAULT_PART_SIZE // MB,
+                        help=f"tamanho de cada parte do multipart, em MB (mínimo {MIN_PART_SIZE // MB})")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="número de partes enviadas em paralelo")
+    parser.add_argument("--endpoint-url", help="endpoint compatível com S3 (ex.: moto_server)")
+    parser.add_argument("--force", action="store_true", help="envia mesmo sem alterações")
+    parser.add_argument("paths", nargs="*",
+                        help="arquivos extras a publicar; sem argumentos publica só o pacote")
+    args = parser.parse_args(argv)
+
+    os.makedirs("dist", exist_ok=True)
+    package = build_package(os.path.join("dist", "devops-lab-app.zip"))
+    started = time.perf_counter()
+    results = publish([package] + args.paths, args.bucket, args.prefix,
+                      part_size=args.part_size * MB, concurrency=args.concurrency,
+                      endpoint_url=args.endpoint_url, force=args.force)
+    elapsed = time.perf_counter() - started
+
+    sent = 0
+    for r in results:
+        if r.status == "uploaded":
+            sent += r.size
+            rate = r.size / MB / r.seconds if r.seconds else 0.0
+            print(f"⬆️  {r.key}: {r.size / MB:.2f} MB em {r.seconds:.2f}s ({rate:.1f} MB/s)")
+        else:
+            print(f"⏭️  {r.key}: sem alterações")
+    print(f"📦 {len(results)} arquivo(s), {sent / MB:.2f} MB enviados em {elapsed:.2f}s "
+          f"({sent / MB / elapsed if elapsed else 0.0:.1f} MB/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Varredura da árvore do repositório com poda de diretórios ignorados
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Diretórios que nunca interessam, além dos ocultos (.git, .venv, ...)
+DEFAULT_IGNORED_DIRS = {"venv", "__pycache__", "node_modules"}
+
+
+def _glob_to_regex(pattern):
+    """Traduz um padrão do .gitignore para regex sobre o caminho relativo (com '/')"""
+    i, n, out = 0, len(pattern), []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+            continue
+        if c == "*":
+            out.append(".*" if pattern.startswith("**", i) else "[^/]*")
+            i += 2 if pattern.startswith("**", i) else 1
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreMatcher:
+    """Conjunto de regras no formato do .gitignore, compiladas uma única vez"""
+
+    def __init__(self, patterns=()):
+        self.rules = []
+        for raw in patterns:
+            line = raw.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            anchored = "/" in line
+            line = line.lstrip("/")
+            body = _glob_to_regex(line)
+            regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+            self.rules.append((regex, negate, dir_only))
+
+        self._compiled = [(re.compile(r), neg, d) for r, neg, d in self.rules]
+        # Sem negações, uma única alternação resolve cada consulta de uma vez
+        self._has_negation = any(neg for _, neg, _ in self.rules)
+        self._files_re = self._join(r for r, _, d in self.rules if not d)
+        self._dirs_re = self._join(r for r, _, _ in self.rules)
+
+    @staticmethod
+    def _join(regexes):
+        regexes = list(regexes)
+        return re.compile("|".join(f"(?:{r})" for r in regexes)) if regexes else None
+
+    @classmethod
+    def from_gitignore(cls, root):
+        path = os.path.join(root, ".gitignore")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(f.readlines())
+        except OSError:
+            return cls()
+
+    def ignored(self, rel_path, is_dir=False):
+        """Indica se ``rel_path`` (relativo à raiz, separado por '/') é ignorado"""
+        if not self._has_negation:
+            regex = self._dirs_re if is_dir else self._files_re
+            return bool(regex and regex.match(rel_path))
+        for regex, negate, dir_only in reversed(self._compiled):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                return not negate
+        return False
+
+
+def skip_dir(name, rel, matcher):
+    """Diretório que não é percorrido: oculto, da lista padrão ou ignorado pelo ``matcher``"""
+    return name.startswith(".") or name in DEFAULT_IGNORED_DIRS or matcher.ignored(rel, True)
+
+
+def list_dir(path, rel, matcher):
+    """Lista um diretório já separando subdiretórios (podados) e arquivos visíveis"""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                child_rel = f"{rel}/{entry.name}" if rel != "." else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not skip_dir(entry.name, child_rel, matcher):
+                        dirs.append(entry.name)
+                elif not entry.name.startswith(".") and not matcher.ignored(child_rel):
+                    files.append(entry.name)
+    except OSError:
+        pass
+    dirs.sort()
+    files.sort()
+    return dirs, files
+
+
+def walk(path, rel, matcher):
+    """Percorre em pré-ordem, sem descer nos diretórios podados"""
+    dirs, files = list_dir(path, rel, matcher)
+    yield rel, dirs, files
+    for d in dirs:
+        yield from walk(os.path.join(path, d), f"{rel}/{d}" if rel != "." else d, matcher)
+
+
+def scan_structure(root, matcher=None, workers=None):
+    """Gera ``(caminho_relativo, dirs, files)`` em pré-ordem, começando por ``"."``.
+
+    Cada subárvore do primeiro nível é percorrida em paralelo; as entradas são
+    emitidas na ordem da árvore assim que a subárvore correspondente termina,
+    para que quem consome possa imprimir enquanto o resto ainda é varrido.
+    """
+    root = os.fspath(root)
+    if matcher is None:
+        matcher = IgnoreMatcher.from_gitignore(root)
+    dirs, files = list_dir(root, ".", matcher)
+    yield ".", dirs, files
+    if not dirs:
+        return
+
+    with ThreadPoolExecutor(max_workers=workers or min(8, len(dirs))) as pool:
+        futures = [pool.submit(lambda d=d: list(walk(os.path.join(root, d), d, matcher)))
+                   for d in dirs]
+        for future in futures:
+            for rel, sub_dirs, sub_files in future.result():
+                yield rel.replace("/", os.sep), sub_dirs, sub_files
+
+
+class StructureCache:
+    """Estrutura do repositório em memória, atualizada só nos diretórios afetados"""
+
+    def __init__(self, root, matcher=None):
+        self.root = os.fspath(root)
+        self.matcher = matcher or IgnoreMatcher.from_gitignore(self.root)
+        self.entries = {}
+        self.rescan()
+
+    def rescan(self):
+        self.entries = {rel: (dirs, files) for rel, dirs, files in walk(self.root, ".", self.matcher)}
+
+    def _drop(self, rel):
+        prefix = rel + "/"
+        for key in [k for k in self.entries if k == rel or k.startswith(prefix)]:
+            del self.entries[key]
+
+    def _relist(self, rel):
+        path = os.path.join(self.root, rel)
+        if not os.path.isdir(path):
+            self._drop(rel)
+            return
+        old = self.entries.get(rel)
+        dirs, files = list_dir(path, rel, self.matcher)
+        self.entries[rel] = (dirs, files)
+        old_dirs = set(old[0]) if old else set()
+        for name in old_dirs - set(dirs):
+            self._drop(f"{rel}/{name}" if rel != "." else name)
+        for name in set(dirs) - old_dirs:
+            child = f"{rel}/{name}" if rel != "." else name
+            for sub_rel, sub_dirs, sub_files in walk(os.path.join(self.root, child), child, self.matcher):
+                self.entries[sub_rel] = (sub_dirs, sub_files)
+
+    def refresh(self, paths):
+        """Relista só os diretórios que contêm (ou são) os caminhos alterados"""
+        targets = set()
+        for path in paths:
+            if path == ".":
+                self.rescan()
+                return
+            parent = path.rsplit("/", 1)[0] if "/" in path else "."
+            if parent == "." or parent in self.entries:
+                targets.add(parent)
+            if path in self.entries:
+                targets.add(path)
+        # Pais antes dos filhos: um diretório removido some antes de ser relistado
+        for rel in sorted(targets, key=lambda r: (r != ".", r.count("/"), r)):
+            if rel == "." or rel in self.entries or os.path.isdir(os.path.join(self.root, rel)):
+                self._relist(rel)
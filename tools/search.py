@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Busca de commits, caminhos e conteúdo com índice de trigramas persistente
+
+O índice é uma tabela FTS5 do SQLite com o tokenizador ``trigram``, guardada
+em ``.git/dashboard/search.db``. Buscas por substring viram uma consulta
+``MATCH`` no índice; regex usa os trechos literais obrigatórios do padrão para
+filtrar os candidatos e só então aplica o ``re`` do Python. A atualização é
+incremental: só entram os commits que não são alcançáveis pelas pontas já
+indexadas e os arquivos cujo blob mudou.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from tools import runner
+from tools.cache import cache_dir
+
+Hit = namedtuple("Hit", ["kind", "ref", "info", "snippet"])
+
+KINDS = ("commit", "path", "content")
+# Conteúdo maior que isso (ou binário) não é indexado
+MAX_CONTENT_BYTES = 1024 * 1024
+BATCH = 5000
+_RECORD_SEP = "\x1e"
+
+
+def _git(root, *args):
+    return runner.run(["git", *args], capture_output=True, cwd=root).stdout
+
+
+def required_literals(pattern):
+    """Trechos literais que toda ocorrência do regex precisa conter"""
+    runs = []
+
+    def walk(items):
+        current = []
+
+        def close_run():
+            if current:
+                runs.append("".join(current))
+                current.clear()
+
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                current.append(chr(av))
+                continue
+            close_run()
+            if op is sre_parse.SUBPATTERN:
+                walk(av[-1])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                walk(av[2])
+            # Alternativas, classes e âncoras não garantem nenhum literal
+        close_run()
+
+    walk(sre_parse.parse(pattern))
+    return [run for run in runs if len(run) >= 3]
+
+
+def _match_expr(literals):
+    return " AND ".join('"' + lit.replace('"', '""') + '"' for lit in literals)
+
+
+class SearchIndex:
+    def __init__(self, root=".", path=None):
+        self.root = root
+        self.path = path or os.path.join(cache_dir(root), "search.db")
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+                kind UNINDEXED, ref UNINDEXED, info UNINDEXED, text, tokenize='trigram');
+        """)
+
+    def close(self):
+        self.db.close()
+
+    def _meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _insert(self, rows):
+        self.db.executemany("INSERT INTO docs (kind, ref, info, text) VALUES (?, ?, ?, ?)", rows)
+
+    def _delete(self, rowids):
+        self.db.executemany("DELETE FROM docs WHERE rowid = ?", [(r,) for r in rowids])
+
+    def _rewritten(self, known, tips):
+        """Alguma ponta antiga sumiu ou deixou de ser alcançável (rebase, amend, branch apagada)?"""
+        listing = "".join(f"{t}\n" for t in known)
+        objects = runner.run(["git", "cat-file", "--batch-check"], input=listing, capture_output=True,
+                             check=False, cwd=self.root).stdout
+        if " missing" in objects:
+            return True
+        stray = runner.run(["git", "rev-list", "-n", "1", "--stdin"], capture_output=True, cwd=self.root,
+                           input=listing + "".join(f"^{t}\n" for t in tips)).stdout
+        return bool(stray.strip())
+
+    def update_commits(self):
+        """Indexa os commits novos desde as pontas registradas na última atualização"""
+        tips = sorted(set(_git(self.root, "for-each-ref", "--format=%(objectname)").split()))
+        head = runner.run(["git", "rev-parse", "--verify", "-q", "HEAD"], capture_output=True,
+                          check=False, cwd=self.root).stdout.strip()
+        if head:
+            tips = sorted(set(tips) | {head})
+        known = self._meta("tips", [])
+        if tips == known:
+            return 0
+        if known and self._rewritten(known, tips):
+            # Commits reescritos ou descartados continuariam no índice: refaz a parte dos commits
+            self.db.execute("DELETE FROM docs WHERE kind = 'commit'")
+            known = []
+        # Com --stdin, "^sha" exclui tudo o que já era alcançável pelas pontas antigas
+        count, batch, pending = 0, [], ""
+        with runner.stream(["git", "log", "--stdin", "--no-color", "--date=short",
+                            f"--format=%H%x00%ad %an%x00%B{_RECORD_SEP}"],
+                           cwd=self.root, stdin=True,
+                           text=True, encoding="utf-8", errors="replace") as proc:
+            proc.stdin.write("".join(f"{t}\n" for t in tips) + "".join(f"^{t}\n" for t in known))
+            proc.stdin.close()
+            for chunk in iter(lambda: proc.stdout.read(1 << 16), ""):
+                records = (pending + chunk).split(_RECORD_SEP)
+                pending = records.pop()
+                for record in records:
+                    sha, info, message = record.lstrip("\n").split("\0", 2)
+                    batch.append(("commit", sha, info, message.strip()))
+                if len(batch) >= BATCH:
+                    self._insert(batch)
+                    count += len(batch)
+                    batch = []
+        if proc.returncode:
+            # Sem isso as pontas novas seriam gravadas sem os commits delas
+            raise subprocess.CalledProcessError(proc.returncode, proc.args)
+        self._insert(batch)
+        self._set_meta("tips", tips)
+        return count + len(batch)
+
+    def _read_blobs(self, shas):
+        """Conteúdo textual de cada blob via ``git cat-file --batch`` (``None`` se binário/grande)"""
+        with runner.stream(["git", "cat-file", "--batch"], cwd=self.root, stdin=True) as proc:
+            for sha in shas:
+                proc.stdin.write(f"{sha}\n".encode())
+                proc.stdin.flush()
+                header = proc.stdout.readline().split()
+                if len(header) < 3:
+                    yield sha, None
+                    continue
+                data = proc.stdout.read(int(header[2]) + 1)[:-1]
+                if len(data) > MAX_CONTENT_BYTES or b"\0" in data[:8192]:
+                    yield sha, None
+                else:
+                    yield sha, data.decode("utf-8", errors="replace")
+
+    def update_files(self, contents=False):
+        """Sincroniza caminhos (e conteúdo, se pedido) com os arquivos rastreados"""
+        entries = {}
+        for entry in _git(self.root, "ls-files", "-s", "-z").split("\0"):
+            if entry:
+                meta, path = entry.split("\t", 1)
+                entries[path] = meta.split()[1]
+
+        # Colunas UNINDEXED não têm índice: as remoções usam o rowid
+        stored_paths = dict(self.db.execute("SELECT ref, rowid FROM docs WHERE kind = 'path'"))
+        removed = stored_paths.keys() - entries.keys()
+        added = sorted(entries.keys() - stored_paths.keys())
+        self._delete(stored_paths[p] for p in removed)
+        self._insert([("path", p, "", p) for p in added])
+        changed = len(removed) + len(added)
+
+        stored_blobs = {ref: (rowid, sha) for ref, rowid, sha in self.db.execute(
+            "SELECT ref, rowid, info FROM docs WHERE kind = 'content'")}
+        if not contents:
+            self._delete(rowid for rowid, _ in stored_blobs.values())
+            return changed
+        self._delete(rowid for p, (rowid, sha) in stored_blobs.items() if entries.get(p) != sha)
+        todo = {p: sha for p, sha in entries.items() if stored_blobs.get(p, (None, None))[1] != sha}
+        texts = dict(self._read_blobs(sorted(set(todo.values()))))
+        self._insert([("content", p, sha, texts[sha]) for p, sha in sorted(todo.items())
+                      if texts.get(sha) is not None])
+        return changed + len(todo)
+
+    def update(self, contents=None):
+        """Atualiza o índice; ``contents=None`` mantém a escolha da última atualização"""
+        with self.db:
+            if contents is None:
+                contents = self._meta("contents", False)
+            self._set_meta("contents", contents)
+            return {"commits": self.update_commits(), "files": self.update_files(contents)}
+
+    def rebuild(self, contents=None):
+        if contents is None:
+            contents = self._meta("contents", False)
+        with self.db:
+            self.db.execute("DELETE FROM docs")
+            self.db.execute("DELETE FROM meta")
+        return self.update(contents)
+
+    def search(self, query, kinds=KINDS, regex=False, limit=50):
+        """Busca ``query`` (substring sem diferenciar maiúsculas, ou regex) nos tipos pedidos"""
+        if regex:
+            compiled = re.compile(query)
+            literals = required_literals(query)
+        else:
+            compiled = re.compile(re.escape(query), re.IGNORECASE)
+            literals = [query] if len(query) >= 3 else []
+        placeholders = ", ".join("?" * len(kinds))
+        sql = f"SELECT kind, ref, info, text FROM docs WHERE kind IN ({placeholders})"
+        params = list(kinds)
+        if literals:
+            # O trigram do FTS5 não diferencia maiúsculas: o índice devolve um superconjunto
+            sql += " AND docs MATCH ?"
+            params.append(_match_expr(literals))
+        hits = []
+        for kind, ref, info, text in self.db.execute(sql + " ORDER BY rowid DESC", params):
+            match = compiled.search(text)
+            if not match:
+                continue
+            hits.append(Hit(kind, ref, info, _snippet(kind, text, match)))
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+def _snippet(kind, text, match):
+    if kind == "path":
+        return text
+    start = text.rfind("\n", 0, match.start()) + 1
+    end = text.find("\n", match.end())
+    line = text[start:end if end != -1 else len(text)].strip()
+    if kind == "content":
+        return f"{text.count(chr(10), 0, start) + 1}: {line}"
+    subject = text.split("\n", 1)[0]
+    return subject if line == subject else f"{subject} | {line}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca em commits, caminhos e conteúdo do repositório")
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--regex", action="store_true")
+    parser.add_argument("--kind", choices=KINDS, action="append", help="restringe o tipo (repetível)")
+    parser.add_argument("--contents", action=argparse.BooleanOptionalAction,
+                        help="indexa (ou deixa de indexar) o conteúdo dos arquivos")
+    parser.add_argument("--rebuild", action="store_true", help="recria o índice do zero")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex()
+    t0 = time.perf_counter()
+    counts = index.rebuild(args.contents) if args.rebuild else index.update(args.contents)
+    print(f"🗂️  Índice atualizado em {(time.perf_counter() - t0) * 1000:.0f} ms "
+          f"({counts['commits']} commit(s), {counts['files']} arquivo(s) novos/alterados)")
+    if args.query:
+        t0 = time.perf_counter()
+        hits = index.search(args.query, tuple(args.kind or KINDS), args.regex, args.limit)
+        for hit in hits:
+            ref = hit.ref[:10] if hit.kind == "commit" else hit.ref
+            print(f"[{hit.kind}] {ref}  {hit.snippet}")
+        print(f"🔎 {len(hits)} resultado(s) em {(time.perf_counter() - t0) * 1000:.1f} ms")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
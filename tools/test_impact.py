@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Seleção de testes por impacto a partir de mapas de cobertura por teste
+
+``record`` roda a suíte inteira com ``--cov-context=test`` e guarda, para cada
+linha de ``app/`` e ``tools/``, os testes que a executaram. ``run`` compara o
+working tree com o commit do mapa (``git diff -U0``) e roda só os testes que
+tocam as linhas alteradas, caindo para a suíte completa quando o mapa não
+cobre a mudança.
+"""
+import argparse
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+
+from tools import runner
+
+DB_PATH = ".testimpact.db"
+SOURCE_DIRS = ("app/", "tools/")
+TEST_DIR = "tests/"
+# Mudanças nesses arquivos podem afetar qualquer teste
+FULL_RUN_FILES = ("requirements.txt", "setup.py", "setup.cfg", "pyproject.toml",
+                  "pytest.ini", "tox.ini", "conftest.py")
+MODULE_LEVEL = ""  # contexto do coverage para código executado na importação
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+def parse_diff(text):
+    """Converte ``git diff -U0`` em ``{caminho: linhas alteradas (numeração antiga)}``"""
+    changes = {}
+    path, in_header = None, False
+    for line in text.splitlines():
+        if line.startswith("diff --git "):
+            path, in_header = None, True
+        elif in_header and line.startswith("--- "):
+            old = line[4:]
+            path = old[2:] if old.startswith("a/") else None
+        elif in_header and line.startswith("+++ "):
+            in_header = False
+            new = line[4:]
+            if path is None and new.startswith("b/"):
+                path = new[2:]
+                changes[path] = None  # arquivo novo: não existe no mapa
+            elif path is not None:
+                changes.setdefault(path, set())
+        elif path is not None and line.startswith("@@"):
+            match = _HUNK_RE.match(line)
+            if not match or changes.get(path) is None:
+                continue
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            if count:
+                changes[path].update(range(start, start + count))
+            else:
+                # Inserção pura: afeta as linhas vizinhas
+                changes[path].update((start, start + 1))
+    return changes
+
+
+class ImpactMap:
+    """Mapa linha -> testes guardado em SQLite"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS tests (id INTEGER PRIMARY KEY, name TEXT UNIQUE);
+            CREATE TABLE IF NOT EXISTS lines (
+                file TEXT, line INTEGER, test INTEGER,
+                PRIMARY KEY (file, line, test)) WITHOUT ROWID;
+        """)
+
+    def close(self):
+        self.db.close()
+
+    @property
+    def commit(self):
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'commit'").fetchone()
+        return row[0] if row else None
+
+    def store(self, coverage_map, commit):
+        """Substitui o mapa por ``{arquivo: {linha: {testes}}}`` gravado no ``commit``"""
+        with self.db:
+            self.db.execute("DELETE FROM lines")
+            self.db.execute("DELETE FROM tests")
+            ids = {}
+            for file, lines in coverage_map.items():
+                for line, tests in lines.items():
+                    for test in tests:
+                        if test not in ids:
+                            ids[test] = self.db.execute(
+                                "INSERT INTO tests (name) VALUES (?)", (test,)).lastrowid
+                    self.db.executemany("INSERT OR IGNORE INTO lines VALUES (?, ?, ?)",
+                                        [(file, line, ids[t]) for t in tests])
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('commit', ?)", (commit,))
+
+    def all_tests(self):
+        return {row[0] for row in self.db.execute("SELECT name FROM tests WHERE name != ?",
+                                                  (MODULE_LEVEL,))}
+
+    def known_files(self):
+        return {row[0] for row in self.db.execute("SELECT DISTINCT file FROM lines")}
+
+    def tests_for(self, file, lines):
+        """Testes que executaram ``lines`` de ``file``; código de módulo afeta todos do arquivo"""
+        query = """SELECT DISTINCT t.name FROM lines l JOIN tests t ON t.id = l.test
+                   WHERE l.file = ? AND l.line = ?"""
+        selected, module_level = set(), False
+        for line in lines:
+            for (name,) in self.db.execute(query, (file, line)):
+                if name == MODULE_LEVEL:
+                    module_level = True
+                else:
+                    selected.add(name)
+        if module_level:
+            selected |= {row[0] for row in self.db.execute(
+                "SELECT DISTINCT t.name FROM lines l JOIN tests t ON t.id = l.test "
+                "WHERE l.file = ? AND t.name != ?", (file, MODULE_LEVEL))}
+        return selected
+
+    def select(self, changes):
+        """Retorna ``(testes, motivo)``; ``testes`` é ``None`` quando é preciso rodar tudo"""
+        selected = set()
+        known = self.known_files()
+        for path, lines in sorted(changes.items()):
+            name = os.path.basename(path)
+            if name in FULL_RUN_FILES:
+                return None, f"{path} afeta toda a suíte"
+            if path.startswith(TEST_DIR):
+                if path.endswith(".py") and name.startswith("test_"):
+                    selected |= {t for t in self.all_tests() if t.startswith(path + "::")} or {path}
+                continue
+            if not path.startswith(SOURCE_DIRS) or not path.endswith(".py"):
+                continue
+            if lines is None or path not in known:
+                return None, f"{path} não está no mapa de cobertura (mapa desatualizado)"
+            selected |= self.tests_for(path, lines)
+        return selected, f"{len(selected)} teste(s) afetado(s)"
+
+
+def collect_coverage(data_file):
+    """Lê o .coverage gerado com contextos por teste em ``{arquivo: {linha: {testes}}}``"""
+    from coverage import CoverageData
+
+    data = CoverageData(basename=data_file)
+    data.read()
+    root = os.getcwd()
+    result = {}
+    for measured in data.measured_files():
+        rel = os.path.relpath(measured, root).replace(os.sep, "/")
+        if not rel.startswith(SOURCE_DIRS):
+            continue
+        lines = {}
+        for line, contexts in data.contexts_by_lineno(measured).items():
+            # pytest-cov grava "nodeid|run", "nodeid|setup"...
+            lines[line] = {c.rsplit("|", 1)[0] for c in contexts}
+        result[rel] = lines
+    return result
+
+
+def head_commit():
+    return runner.run(["git", "rev-parse", "HEAD"], capture_output=True).stdout.strip()
+
+
+def record(db_path=DB_PATH, pytest_args=()):
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, ".coverage")
+        env = dict(os.environ, COVERAGE_FILE=data_file)
+        argv = [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+                "--cov=app", "--cov=tools", "--cov-context=test", "--cov-report="]
+        code = subprocess.call(argv + list(pytest_args), env=env)
+        coverage_map = collect_coverage(data_file)
+    impact = ImpactMap(db_path)
+    impact.store(coverage_map, head_commit())
+    impact.close()
+    return code
+
+
+def changed_files(base):
+    diff = runner.run(["git", "diff", "-U0", "--no-color", "--no-renames", base, "--"],
+                      capture_output=True).stdout
+    changes = parse_diff(diff)
+    untracked = runner.run(["git", "ls-files", "--others", "--exclude-standard"],
+                           capture_output=True).stdout.splitlines()
+    for path in untracked:
+        changes.setdefault(path, None)
+    return changes
+
+
+def run_impacted(db_path=DB_PATH, base=None, dry_run=False, pytest_args=()):
+    selected, reason = None, "mapa de cobertura inexistente (rode 'record')"
+    if os.path.exists(db_path):
+        impact = ImpactMap(db_path)
+        base = base or impact.commit
+        known_commit = base and runner.run(["git", "cat-file", "-e", f"{base}^{{commit}}"],
+                                           check=False).returncode == 0
+        if known_commit:
+            selected, reason = impact.select(changed_files(base))
+        else:
+            reason = f"commit do mapa ({base}) não encontrado"
+        impact.close()
+
+    print(f"🎯 {reason}")
+    argv = [sys.executable, "-m", "pytest", "-q"] + list(pytest_args)
+    if selected is None:
+        print("🔁 Rodando a suíte completa.")
+    elif not selected:
+        print("✅ Nenhum teste afetado pelas alterações.")
+        return 0
+    else:
+        argv += sorted(selected)
+        for test in sorted(selected):
+            print(f"  - {test}")
+    if dry_run:
+        return 0
+    return subprocess.call(argv)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roda só os testes afetados pelas alterações")
+    parser.add_argument("--db", default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("record", help="roda a suíte e grava o mapa de cobertura por teste")
+    p_run = sub.add_parser("run", help="roda os testes afetados desde o commit do mapa")
+    p_run.add_argument("--base", help="compara com outra referência em vez do commit do mapa")
+    p_run.add_argument("--dry-run", action="store_true", help="só lista a seleção")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    if args.command == "record":
+        return record(args.db, pytest_args)
+    return run_impacted(args.db, args.base, args.dry_run, pytest_args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Leitor do terraform.tfstate e de planos (``terraform show -json``) sem o CLI do terraform
+
+O arquivo é lido em streaming: só o recurso corrente fica em memória, então
+states de centenas de MB são percorridos com memória constante.
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+STATE_PATH = os.path.join("infra", "terraform.tfstate")
+CONFIG_DIR = "infra"
+CHUNK_SIZE = 64 * 1024
+
+_WS = re.compile(r"[ \t\n\r]*")
+# String completa, colchete/chave, ou aspas sem fechamento (string cortada no fim do bloco)
+_SKIP_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]|"', re.S)
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR = re.compile(r"[^,\]}\s]+")
+
+
+class JsonStream:
+    """Parser JSON incremental: navega objetos/arrays e decodifica um valor por vez"""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, keep_from=None, size=None):
+        """Lê mais dados, descartando o que já foi consumido (antes de ``keep_from``)"""
+        if self.eof:
+            return False
+        start = self.pos if keep_from is None else keep_from
+        self.buf = self.buf[start:]
+        self.pos -= start
+        data = self.fp.read(size or self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: esperado {char!r} na posição {self.pos}")
+        self.pos += 1
+
+    def read_value(self):
+        """Decodifica o próximo valor; o buffer cresce até caber o valor inteiro"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill(keep_from=self.pos, size=max(self.chunk_size, len(self.buf))):
+                    raise
+                continue
+            # Um número cortado no fim do bloco ("1." + "5", "2e" + "-3") decodifica só o começo
+            cut = end == len(self.buf) or (isinstance(value, (int, float))
+                                           and self.buf[end] in ".eE+-")
+            if cut and not self.eof and self._fill(keep_from=self.pos):
+                continue
+            self.pos = end
+            return value
+
+    def _skip_string(self):
+        start = self.pos
+        while True:
+            match = _STRING_BODY.match(self.buf, start + 1)
+            if match:
+                self.pos = match.end()
+                return
+            self.pos = start
+            if not self._fill(keep_from=start):
+                raise ValueError("JSON inválido: string não terminada")
+            start = self.pos
+
+    def skip_value(self):
+        """Pula o próximo valor sem construí-lo (memória constante)"""
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in "[{":
+            while True:
+                match = _SCALAR.match(self.buf, self.pos)
+                if match and (match.end() < len(self.buf) or self.eof):
+                    self.pos = match.end()
+                    return
+                if not self._fill() and not match:
+                    raise ValueError("JSON inválido: fim inesperado")
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN.search(self.buf, self.pos)
+            if not match or match.group() == '"':
+                self.pos = match.start() if match else len(self.buf)
+                if not self._fill():
+                    raise ValueError("JSON inválido: fim inesperado")
+                continue
+            self.pos = match.end()
+            char = match.group()
+            if char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self):
+        """Gera as chaves do objeto; quem consome deve ler ou pular cada valor"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"JSON inválido: esperado ',' ou '}}' na posição {self.pos}")
+
+    def iter_array(self):
+        """Posiciona em cada elemento do array; quem consome deve ler ou pular o elemento"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"JSON inválido: esperado ',' ou ']' na posição {self.pos}")
+
+
+def resource_address(resource, index_key=None):
+    prefix = f"{resource['module']}." if resource.get("module") else ""
+    if resource.get("mode") == "data":
+        prefix += "data."
+    address = f"{prefix}{resource['type']}.{resource['name']}"
+    if index_key is not None:
+        address += f"[{json.dumps(index_key)}]"
+    return address
+
+
+def iter_state(path=STATE_PATH, metadata=None):
+    """Gera ``(endereço, recurso, instância)`` de cada instância no state.
+
+    Se ``metadata`` for um dict, recebe version, serial, lineage e outputs.
+    """
+    with open(path, encoding="utf-8") as fp:
+        stream = JsonStream(fp)
+        for key in stream.iter_object():
+            if key == "resources":
+                for _ in stream.iter_array():
+                    resource = stream.read_value()
+                    for instance in resource.pop("instances", []):
+                        yield resource_address(resource, instance.get("index_key")), resource, instance
+            elif metadata is not None and key in ("version", "terraform_version", "serial",
+                                                   "lineage", "outputs"):
+                metadata[key] = stream.read_value()
+            else:
+                stream.skip_value()
+
+
+def read_outputs(path=STATE_PATH):
+    """Lê só os outputs do state, pulando a lista de recursos"""
+    outputs = {}
+    with open(path, encoding="utf-8") as fp:
+        stream = JsonStream(fp)
+        for key in stream.iter_object():
+            if key == "outputs":
+                outputs = {name: out.get("value") for name, out in stream.read_value().items()}
+            else:
+                stream.skip_value()
+    return outputs
+
+
+def index_state(path=STATE_PATH, keep_attributes=None):
+    """Indexa o state por endereço: ``{endereço: {"type", "attributes"}}``.
+
+    ``keep_attributes`` ({endereço: conjunto de chaves}) limita os atributos
+    guardados por recurso; sem ele, todos são mantidos.
+    """
+    index = {}
+    for address, resource, instance in iter_state(path):
+        attributes = instance.get("attributes") or {}
+        if keep_attributes is not None:
+            wanted = keep_attributes.get(address.split("[")[0], ())
+            attributes = {k: attributes[k] for k in wanted if k in attributes}
+        index[address] = {"type": resource["type"], "attributes": attributes}
+    return index
+
+
+def iter_plan_changes(path):
+    """Gera ``(tipo, mudança)`` para ``resource_changes`` e ``resource_drift`` de um plano JSON"""
+    with open(path, encoding="utf-8") as fp:
+        stream = JsonStream(fp)
+        for key in stream.iter_object():
+            if key in ("resource_changes", "resource_drift"):
+                for _ in stream.iter_array():
+                    yield key, stream.read_value()
+            else:
+                stream.skip_value()
+
+
+_RESOURCE_RE = re.compile(r'^\s*resource\s+"([^"]+)"\s+"([^"]+)"\s*\{')
+_LITERAL_RE = re.compile(r'^\s*([A-Za-z0-9_]+)\s*=\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|true|false)\s*$')
+
+
+def read_config(config_dir=CONFIG_DIR):
+    """Extrai dos .tf os recursos declarados e seus atributos literais de primeiro nível"""
+    resources = {}
+    for tf in sorted(glob.glob(os.path.join(config_dir, "*.tf"))):
+        current, depth = None, 0
+        with open(tf, encoding="utf-8") as f:
+            for line in f:
+                if current is None:
+                    match = _RESOURCE_RE.match(line)
+                    if match:
+                        current = f"{match.group(1)}.{match.group(2)}"
+                        resources[current] = {}
+                        depth = line.count("{") - line.count("}")
+                    continue
+                if depth == 1:
+                    literal = _LITERAL_RE.match(line)
+                    if literal:
+                        resources[current][literal.group(1)] = json.loads(literal.group(2))
+                depth += line.count("{") - line.count("}")
+                if depth <= 0:
+                    current = None
+    return resources
+
+
+def drift_summary(state_path=STATE_PATH, config_dir=CONFIG_DIR, plan_path=None):
+    config = read_config(config_dir)
+    summary = {"missing_in_state": [], "not_in_config": [], "attribute_drift": {},
+               "plan_actions": {}, "plan_drift": {}, "state_resources": 0}
+
+    if os.path.exists(state_path):
+        keep = {address: set(attrs) for address, attrs in config.items()}
+        index = index_state(state_path, keep_attributes=keep)
+        summary["state_resources"] = len(index)
+        managed = {a.split("[")[0] for a in index if not a.startswith("data.") and ".data." not in a}
+        summary["missing_in_state"] = sorted(set(config) - managed)
+        summary["not_in_config"] = sorted(a for a in managed - set(config) if not a.startswith("module."))
+        for address, entry in index.items():
+            declared = config.get(address.split("[")[0], {})
+            diffs = {k: {"config": v, "state": entry["attributes"][k]}
+                     for k, v in declared.items()
+                     if k in entry["attributes"] and entry["attributes"][k] != v}
+            if diffs:
+                summary["attribute_drift"][address] = diffs
+    else:
+        summary["missing_in_state"] = sorted(config)
+
+    if plan_path:
+        for kind, change in iter_plan_changes(plan_path):
+            actions = "-".join(change.get("change", {}).get("actions", []))
+            if kind == "resource_changes":
+                if actions != "no-op":
+                    summary["plan_actions"][change["address"]] = actions
+            else:
+                before = change["change"].get("before") or {}
+                after = change["change"].get("after") or {}
+                summary["plan_drift"][change["address"]] = sorted(
+                    k for k in before.keys() | after.keys() if before.get(k) != after.get(k))
+    summary["action_counts"] = dict(Counter(summary["plan_actions"].values()))
+    return summary
+
+
+def format_summary(summary):
+    lines = [f"📄 Recursos no state: {summary['state_resources']}"]
+    for address in summary["missing_in_state"]:
+        lines.append(f"➕ {address}: declarado mas ausente do state")
+    for address in summary["not_in_config"]:
+        lines.append(f"➖ {address}: no state mas não declarado")
+    for address, diffs in summary["attribute_drift"].items():
+        for key, values in diffs.items():
+            lines.append(f"⚠️  {address}.{key}: config={values['config']!r} state={values['state']!r}")
+    for address, keys in summary["plan_drift"].items():
+        lines.append(f"🔀 {address}: alterado fora do terraform ({', '.join(keys) or 'sem detalhes'})")
+    for address, actions in summary["plan_actions"].items():
+        lines.append(f"📝 {address}: {actions}")
+    if len(lines) == 1:
+        lines.append("✅ Nenhum drift encontrado.")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumo de drift do Terraform sem o CLI")
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--config", default=CONFIG_DIR)
+    parser.add_argument("--plan", help="plano em JSON (terraform show -json plan.out)")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    summary = drift_summary(args.state, args.config, args.plan)
+    print(json.dumps(summary, indent=2) if args.json else format_summary(summary))
+    return 1 if (summary["missing_in_state"] or summary["not_in_config"]
+                 or summary["attribute_drift"] or summary["plan_drift"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
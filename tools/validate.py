@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Validação da estrutura do repositório a partir de um conjunto declarativo de regras
+
+As mesmas regras alimentam o CI (``python -m tools.validate``) e o dashboard
+(pastas criadas por ``criar_pastas``/``organizar_estrutura``).
+"""
+import fnmatch
+import json
+import os
+import sys
+
+RULES = {
+    # Itens que precisam existir
+    "required_files": ["README.md", ".gitignore"],
+    "required_dirs": ["app", "infra", "tests", ".github/workflows"],
+    # Pastas que o dashboard cria (com .gitkeep) além das obrigatórias
+    "scaffold_dirs": ["docs", "tools"],
+    # Padrões (caminho relativo ou nome do arquivo) que não deveriam estar no repositório
+    "forbidden": [
+        {"pattern": "*_corrupted.py", "severity": "warning"},
+        {"pattern": "*.tfstate", "severity": "error"},
+        {"pattern": "*.tfstate.backup", "severity": "error"},
+        {"pattern": ".env", "severity": "error"},
+    ],
+    # Tamanho máximo de um arquivo versionável
+    "max_file_size_kb": 5 * 1024,
+}
+
+
+def load_rules(path=None):
+    if not path:
+        return RULES
+    with open(path, encoding="utf-8") as f:
+        return {**RULES, **json.load(f)}
+
+
+def scaffold_dirs(rules=RULES):
+    """Pastas obrigatórias seguidas das de scaffold, na ordem em que o dashboard as cria"""
+    dirs = list(rules["required_dirs"])
+    return dirs + [d for d in rules.get("scaffold_dirs", []) if d not in dirs]
+
+
+def _iter_files(root):
+    """Uma única varredura podada: gera ``(caminho_relativo, tamanho)`` dos arquivos"""
+    from tools.scanner import DEFAULT_IGNORED_DIRS, IgnoreMatcher
+
+    matcher = IgnoreMatcher.from_gitignore(root)
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            child = f"{rel}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                # Ocultos não são podados aqui: .github e arquivos como .env também são validados
+                if entry.name == ".git" or entry.name in DEFAULT_IGNORED_DIRS \
+                        or matcher.ignored(child, True):
+                    continue
+                stack.append((entry.path, child + "/"))
+            elif entry.is_file(follow_symlinks=False) and not matcher.ignored(child):
+                yield child, entry.stat(follow_symlinks=False).st_size
+
+
+def validate(root=".", rules=RULES):
+    """Aplica as regras e retorna a lista de resultados ``{rule, path, severity, message}``"""
+    results = []
+    required = [(item, os.path.isfile) for item in rules.get("required_files", [])]
+    required += [(item, os.path.isdir) for item in rules.get("required_dirs", [])]
+    for item, check in required:
+        ok = check(os.path.join(root, item))
+        results.append({"rule": "required", "path": item, "severity": "ok" if ok else "error",
+                        "message": "encontrado" if ok else "NÃO encontrado"})
+
+    forbidden = rules.get("forbidden", [])
+    max_bytes = rules.get("max_file_size_kb", 0) * 1024
+    for rel, size in _iter_files(root):
+        name = rel.rsplit("/", 1)[-1]
+        for rule in forbidden:
+            if fnmatch.fnmatch(name, rule["pattern"]) or fnmatch.fnmatch(rel, rule["pattern"]):
+                results.append({"rule": "forbidden", "path": rel, "severity": rule["severity"],
+                                "message": f"corresponde a {rule['pattern']}"})
+        if max_bytes and size > max_bytes:
+            results.append({"rule": "max_file_size", "path": rel, "severity": "error",
+                            "message": f"{size / 1024:.0f} KB > {max_bytes // 1024} KB"})
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Valida a estrutura mínima do repositório")
+    parser.add_argument("--root", default=".")
+    parser.add_argument("--rules", help="JSON que sobrescreve as regras padrão")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args(argv)
+
+    results = validate(args.root, load_rules(args.rules))
+    errors = [r for r in results if r["severity"] == "error"]
+    if args.format == "json":
+        print(json.dumps({"ok": not errors, "errors": len(errors),
+                          "warnings": sum(r["severity"] == "warning" for r in results),
+                          "results": results}, indent=2, ensure_ascii=False))
+    else:
+        labels = {"ok": "OK  ", "warning": "AVISO", "error": "ERRO"}
+        for r in results:
+            print(f"{labels[r['severity']]} -> {r['path']}: {r['message']}")
+        print("Falha na validação." if errors else "Validação concluída com sucesso.")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Observador do working tree e do .git que agrupa eventos e avisa o dashboard
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+from tools.scanner import IgnoreMatcher, skip_dir, walk
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+
+_EVENT = struct.Struct("iIII")
+
+# Arquivos do .git que mudam o status; objects/ e logs/ não interessam
+GIT_FILES = ("HEAD", "index", "packed-refs", "FETCH_HEAD", "ORIG_HEAD")
+
+
+class _BaseWatcher:
+    """Laço comum: junta os caminhos alterados e chama ``callback`` uma vez por janela"""
+
+    def __init__(self, root, callback, debounce=0.05, matcher=None):
+        self.root = os.path.abspath(root)
+        self.callback = callback
+        self.debounce = debounce
+        self.matcher = matcher or IgnoreMatcher.from_gitignore(self.root)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._close()
+
+    def _wake(self):
+        pass
+
+    def _close(self):
+        pass
+
+    def _poll(self, timeout):
+        """Bloqueia até ``timeout`` (None = até haver evento) e retorna os caminhos alterados"""
+        raise NotImplementedError
+
+    def _wanted(self, rel, is_dir=False):
+        if rel.startswith(".git/"):
+            name = rel[len(".git/"):]
+            return (name in GIT_FILES or name.startswith("refs/")) and not name.endswith(".lock")
+        parts = rel.split("/")
+        if any(skip_dir(p, "/".join(parts[:i + 1]), self.matcher) for i, p in enumerate(parts[:-1])):
+            return False
+        if is_dir:
+            return not skip_dir(parts[-1], rel, self.matcher)
+        return not parts[-1].startswith(".") and not self.matcher.ignored(rel)
+
+    def _run(self):
+        pending, deadline = set(), None
+        while not self._stop.is_set():
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            paths = self._poll(timeout)
+            if paths:
+                if deadline is None:
+                    # Janela fixa a partir do primeiro evento: rajadas não adiam a atualização
+                    deadline = time.monotonic() + self.debounce
+                pending |= paths
+            if deadline is not None and time.monotonic() >= deadline:
+                batch, pending, deadline = pending, set(), None
+                if not self._stop.is_set():
+                    self.callback(batch)
+
+
+class InotifyWatcher(_BaseWatcher):
+    """Observador via inotify (Linux), chamado direto pela libc com ctypes"""
+
+    def __init__(self, root, callback, debounce=0.05, matcher=None):
+        super().__init__(root, callback, debounce, matcher)
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc não encontrada")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify indisponível")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._wake_r, self._wake_w = os.pipe()
+        self._watches = {}
+        for rel, _, _ in walk(self.root, ".", self.matcher):
+            self._add_watch(rel)
+        git_dir = os.path.join(self.root, ".git")
+        if os.path.isdir(git_dir):
+            self._add_watch(".git")
+            for dirpath, _, _ in os.walk(os.path.join(git_dir, "refs")):
+                self._add_watch(os.path.relpath(dirpath, self.root).replace(os.sep, "/"))
+
+    def _add_watch(self, rel):
+        path = os.path.join(self.root, rel).encode()
+        wd = self._libc.inotify_add_watch(self._fd, path, WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = rel
+
+    def _wake(self):
+        os.write(self._wake_w, b"x")
+
+    def _close(self):
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _poll(self, timeout):
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._fd not in ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        paths = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                paths.add(".")
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            base = self._watches.get(wd)
+            if base is None:
+                continue
+            rel = name if base == "." else (f"{base}/{name}" if name else base)
+            is_dir = bool(mask & IN_ISDIR)
+            if not self._wanted(rel, is_dir):
+                continue
+            if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                if rel.startswith(".git/"):
+                    self._add_watch(rel)
+                else:
+                    for sub_rel, _, _ in walk(os.path.join(self.root, rel), rel, self.matcher):
+                        self._add_watch(sub_rel)
+            paths.add(rel)
+        return paths
+
+
+class PollingWatcher(_BaseWatcher):
+    """Alternativa só com stdlib: compara snapshots de mtime/tamanho a cada ``interval``"""
+
+    def __init__(self, root, callback, debounce=0.05, matcher=None, interval=1.0):
+        super().__init__(root, callback, debounce, matcher)
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for rel, _, files in walk(self.root, ".", self.matcher):
+            for name in files:
+                file_rel = name if rel == "." else f"{rel}/{name}"
+                try:
+                    st = os.stat(os.path.join(self.root, file_rel))
+                except OSError:
+                    continue
+                snapshot[file_rel] = (st.st_mtime_ns, st.st_size)
+        git_dir = os.path.join(self.root, ".git")
+        candidates = [os.path.join(git_dir, name) for name in GIT_FILES]
+        for dirpath, _, files in os.walk(os.path.join(git_dir, "refs")):
+            candidates.extend(os.path.join(dirpath, f) for f in files)
+        for path in candidates:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[os.path.relpath(path, self.root).replace(os.sep, "/")] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def _poll(self, timeout):
+        wait = self.interval if timeout is None else min(timeout, self.interval)
+        if self._stop.wait(wait):
+            return set()
+        current = self._take_snapshot()
+        previous, self._snapshot = self._snapshot, current
+        return {path for path in previous.keys() | current.keys()
+                if previous.get(path) != current.get(path)}
+
+
+def create_watcher(root, callback, debounce=0.05, matcher=None):
+    """Usa inotify quando disponível e cai para polling nos demais sistemas"""
+    try:
+        return InotifyWatcher(root, callback, debounce, matcher)
+    except (OSError, AttributeError):
+        return PollingWatcher(root, callback, debounce, matcher)